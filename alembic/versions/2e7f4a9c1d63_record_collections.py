@@ -0,0 +1,49 @@
+"""record_collections.
+
+Revision ID: 2e7f4a9c1d63
+Revises: 9b3d6e2f8a41
+Create Date: 2026-10-16 17:08:44.902615
+
+"""
+
+from __future__ import annotations
+
+from collections.abc import Sequence
+
+import sqlalchemy as sa
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "2e7f4a9c1d63"
+down_revision: str | Sequence[str] | None = "9b3d6e2f8a41"
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+
+def upgrade() -> None:
+    """Create the hashed collection-to-record index and backfill it from applicable collections."""
+    op.create_table(
+        "record_collections",
+        sa.Column("collection_key", sa.Text(), nullable=False),
+        sa.Column("record_id", sa.Text(), nullable=False),
+        sa.ForeignKeyConstraint(["record_id"], ["records.id"], ondelete="CASCADE"),
+        sa.PrimaryKeyConstraint("collection_key", "record_id"),
+    )
+    op.create_index("idx_record_collections_record", "record_collections", ["record_id"], unique=False)
+
+    # Same normalization as `collection_key`: trim whitespace, then trailing slashes
+    op.execute(
+        r"""
+        INSERT INTO record_collections (collection_key, record_id)
+        SELECT DISTINCT md5(rtrim(btrim(collection, E' \t\r\n'), '/')), id
+        FROM records, unnest(applicable_collections) AS collection
+        WHERE rtrim(btrim(collection, E' \t\r\n'), '/') <> ''
+        """
+    )
+
+
+def downgrade() -> None:
+    """Drop the collection-to-record index."""
+    op.drop_index("idx_record_collections_record", table_name="record_collections")
+    op.drop_table("record_collections")
@@ -0,0 +1,33 @@
+"""keyset_pagination_indexes.
+
+Revision ID: 3f9a1c7e2b54
+Revises: def5cf9aedc9
+Create Date: 2026-10-16 09:12:44.318205
+
+"""
+
+from __future__ import annotations
+
+from collections.abc import Sequence
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "3f9a1c7e2b54"
+down_revision: str | Sequence[str] | None = "def5cf9aedc9"
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+
+def upgrade() -> None:
+    """Add (catalogue_id, sort key, id) indexes backing keyset pagination."""
+    op.create_index("idx_records_catalogue_created", "records", ["catalogue_id", "created", "id"], unique=False)
+    op.create_index("idx_records_catalogue_updated", "records", ["catalogue_id", "updated", "id"], unique=False)
+    op.create_index("idx_records_catalogue_title", "records", ["catalogue_id", "title", "id"], unique=False)
+
+
+def downgrade() -> None:
+    """Drop keyset pagination indexes."""
+    op.drop_index("idx_records_catalogue_title", table_name="records")
+    op.drop_index("idx_records_catalogue_updated", table_name="records")
+    op.drop_index("idx_records_catalogue_created", table_name="records")
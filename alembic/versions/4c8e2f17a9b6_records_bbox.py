@@ -0,0 +1,79 @@
+"""records_bbox.
+
+Revision ID: 4c8e2f17a9b6
+Revises: b71c0f93d5e8
+Create Date: 2026-10-16 14:12:37.519204
+
+"""
+
+from __future__ import annotations
+
+from collections.abc import Sequence
+
+import sqlalchemy as sa
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "4c8e2f17a9b6"
+down_revision: str | Sequence[str] | None = "b71c0f93d5e8"
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+_BBOX_COLUMNS = ("bbox_minx", "bbox_miny", "bbox_maxx", "bbox_maxy")
+
+
+def upgrade() -> None:
+    """Add record bounding box columns, backfill them from geometry and extent, and index them with GiST."""
+    for column in _BBOX_COLUMNS:
+        op.add_column("records", sa.Column(column, sa.Float(), nullable=True))
+
+    # Union of all geometry positions and all 2D/3D extent boxes; boxes crossing the antimeridian span all longitudes
+    op.execute(
+        """
+        WITH boxes AS (
+            SELECT id, (p->>0)::float8 AS minx, (p->>1)::float8 AS miny, (p->>0)::float8 AS maxx,
+                   (p->>1)::float8 AS maxy
+            FROM records,
+                 jsonb_path_query(
+                     geometry, 'strict $.** ? (@.type() == "array" && @[0].type() == "number")', '{}', true
+                 ) AS p
+            UNION ALL
+            SELECT id,
+                   CASE WHEN minx > maxx THEN -180 ELSE minx END,
+                   miny,
+                   CASE WHEN minx > maxx THEN 180 ELSE maxx END,
+                   maxy
+            FROM (
+                SELECT id,
+                       (b->>0)::float8 AS minx,
+                       (b->>1)::float8 AS miny,
+                       (b->>(CASE jsonb_array_length(b) WHEN 6 THEN 3 ELSE 2 END))::float8 AS maxx,
+                       (b->>(CASE jsonb_array_length(b) WHEN 6 THEN 4 ELSE 3 END))::float8 AS maxy
+                FROM records,
+                     jsonb_path_query(
+                         extent, 'strict $.spatial.bbox[*] ? (@.size() == 4 || @.size() == 6)', '{}', true
+                     ) AS b
+            ) AS extent_boxes
+        )
+        UPDATE records
+        SET bbox_minx = b.minx, bbox_miny = b.miny, bbox_maxx = b.maxx, bbox_maxy = b.maxy
+        FROM (
+            SELECT id, min(minx) AS minx, min(miny) AS miny, max(maxx) AS maxx, max(maxy) AS maxy
+            FROM boxes
+            GROUP BY id
+        ) AS b
+        WHERE records.id = b.id
+        """
+    )
+    op.execute(
+        "CREATE INDEX idx_records_bbox ON records "
+        "USING gist ((box(point(bbox_minx, bbox_miny), point(bbox_maxx, bbox_maxy))))"
+    )
+
+
+def downgrade() -> None:
+    """Drop record bounding box index and columns."""
+    op.drop_index("idx_records_bbox", table_name="records")
+    for column in reversed(_BBOX_COLUMNS):
+        op.drop_column("records", column)
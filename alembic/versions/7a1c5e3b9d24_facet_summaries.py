@@ -0,0 +1,57 @@
+"""facet_summaries.
+
+Revision ID: 7a1c5e3b9d24
+Revises: 2e7f4a9c1d63
+Create Date: 2026-10-16 18:21:05.317462
+
+"""
+
+from __future__ import annotations
+
+from collections.abc import Sequence
+
+import sqlalchemy as sa
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "7a1c5e3b9d24"
+down_revision: str | Sequence[str] | None = "2e7f4a9c1d63"
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+
+def upgrade() -> None:
+    """Create the per-catalogue facet summary and backfill it from existing records."""
+    op.create_table(
+        "facet_summaries",
+        sa.Column("catalogue_id", sa.Text(), nullable=False),
+        sa.Column("facet", sa.Text(), nullable=False),
+        sa.Column("value", sa.Text(), nullable=False),
+        sa.Column("count", sa.Integer(), nullable=False),
+        sa.ForeignKeyConstraint(["catalogue_id"], ["catalogues.id"], ondelete="CASCADE"),
+        sa.PrimaryKeyConstraint("catalogue_id", "facet", "value"),
+    )
+
+    # Same pairs as `record_facet_values`: scalar properties, plus each distinct element of array properties
+    op.execute(
+        """
+        INSERT INTO facet_summaries (catalogue_id, facet, value, count)
+        SELECT catalogue_id, facet, value, count(DISTINCT id)
+        FROM records,
+             LATERAL (
+                 SELECT 'type', type::text
+                 UNION ALL SELECT 'application:type', application_type
+                 UNION ALL SELECT 'application:language', application_language
+                 UNION ALL SELECT 'keywords', unnest(keywords)
+                 UNION ALL SELECT 'applicableCollections', unnest(applicable_collections)
+             ) AS facet_values (facet, value)
+        WHERE catalogue_id IS NOT NULL AND value IS NOT NULL
+        GROUP BY catalogue_id, facet, value
+        """
+    )
+
+
+def downgrade() -> None:
+    """Drop the facet summary."""
+    op.drop_table("facet_summaries")
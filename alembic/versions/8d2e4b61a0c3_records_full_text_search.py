@@ -0,0 +1,53 @@
+"""records_full_text_search.
+
+Revision ID: 8d2e4b61a0c3
+Revises: 3f9a1c7e2b54
+Create Date: 2026-10-16 10:03:17.540912
+
+"""
+
+from __future__ import annotations
+
+from collections.abc import Sequence
+
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "8d2e4b61a0c3"
+down_revision: str | Sequence[str] | None = "3f9a1c7e2b54"
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+SEARCH_VECTOR_EXPRESSION = (
+    "setweight(to_tsvector('english', title), 'A') || "
+    "setweight(to_tsvector('english', immutable_array_to_string(keywords, ' ')), 'B') || "
+    "setweight(to_tsvector('english', description), 'C')"
+)
+
+
+def upgrade() -> None:
+    """Add a generated tsvector over title, keywords and description with a GIN index."""
+    op.execute("""
+        CREATE OR REPLACE FUNCTION immutable_array_to_string(text[], text) RETURNS text
+        LANGUAGE sql IMMUTABLE PARALLEL SAFE AS $$ SELECT array_to_string($1, $2) $$
+    """)
+    op.add_column(
+        "records",
+        sa.Column(
+            "search_vector",
+            postgresql.TSVECTOR(),
+            sa.Computed(SEARCH_VECTOR_EXPRESSION, persisted=True),
+            nullable=True,
+        ),
+    )
+    op.create_index("idx_records_search_vector", "records", ["search_vector"], unique=False, postgresql_using="gin")
+
+
+def downgrade() -> None:
+    """Drop the full-text search column and index."""
+    op.drop_index("idx_records_search_vector", table_name="records", postgresql_using="gin")
+    op.drop_column("records", "search_vector")
+    op.execute("DROP FUNCTION IF EXISTS immutable_array_to_string(text[], text)")
@@ -0,0 +1,35 @@
+"""records_applicable_collections_index.
+
+Revision ID: 9b3d6e2f8a41
+Revises: e5a93b0d7c21
+Create Date: 2026-10-16 16:27:05.381942
+
+"""
+
+from __future__ import annotations
+
+from collections.abc import Sequence
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "9b3d6e2f8a41"
+down_revision: str | Sequence[str] | None = "e5a93b0d7c21"
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+
+def upgrade() -> None:
+    """Add GIN index on record applicable collections."""
+    op.create_index(
+        "idx_records_applicable_collections",
+        "records",
+        ["applicable_collections"],
+        unique=False,
+        postgresql_using="gin",
+    )
+
+
+def downgrade() -> None:
+    """Drop GIN index on record applicable collections."""
+    op.drop_index("idx_records_applicable_collections", table_name="records", postgresql_using="gin")
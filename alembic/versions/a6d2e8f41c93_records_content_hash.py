@@ -0,0 +1,31 @@
+"""records_content_hash.
+
+Revision ID: a6d2e8f41c93
+Revises: f3a7c9e1b205
+Create Date: 2026-10-17 15:42:08.316254
+
+"""
+
+from __future__ import annotations
+
+from collections.abc import Sequence
+
+import sqlalchemy as sa
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "a6d2e8f41c93"
+down_revision: str | Sequence[str] | None = "f3a7c9e1b205"
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+
+def upgrade() -> None:
+    """Add the hash of the registered payload, left unset until records are next written."""
+    op.add_column("records", sa.Column("content_hash", sa.Text(), nullable=True))
+
+
+def downgrade() -> None:
+    """Drop the hash of the registered payload."""
+    op.drop_column("records", "content_hash")
@@ -0,0 +1,42 @@
+"""records_trigram_indexes.
+
+Revision ID: b71c0f93d5e8
+Revises: 8d2e4b61a0c3
+Create Date: 2026-10-16 10:41:52.087311
+
+"""
+
+from __future__ import annotations
+
+from collections.abc import Sequence
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "b71c0f93d5e8"
+down_revision: str | Sequence[str] | None = "8d2e4b61a0c3"
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+
+def upgrade() -> None:
+    """Enable pg_trgm and add trigram GIN indexes on record titles and keywords."""
+    op.execute("CREATE EXTENSION IF NOT EXISTS pg_trgm")
+    op.create_index(
+        "idx_records_title_trgm",
+        "records",
+        ["title"],
+        unique=False,
+        postgresql_using="gin",
+        postgresql_ops={"title": "gin_trgm_ops"},
+    )
+    op.execute(
+        "CREATE INDEX idx_records_keywords_trgm ON records "
+        "USING gin ((immutable_array_to_string(keywords, ' ')) gin_trgm_ops)"
+    )
+
+
+def downgrade() -> None:
+    """Drop trigram indexes."""
+    op.drop_index("idx_records_keywords_trgm", table_name="records")
+    op.drop_index("idx_records_title_trgm", table_name="records", postgresql_using="gin")
@@ -0,0 +1,41 @@
+"""catalogues_records_revision.
+
+Revision ID: d84f2b6c0e57
+Revises: 7a1c5e3b9d24
+Create Date: 2026-10-16 19:42:51.086213
+
+"""
+
+from __future__ import annotations
+
+from collections.abc import Sequence
+
+import sqlalchemy as sa
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "d84f2b6c0e57"
+down_revision: str | Sequence[str] | None = "7a1c5e3b9d24"
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+
+def upgrade() -> None:
+    """Add the per-catalogue record change counter and time, starting from the latest record update."""
+    op.add_column(
+        "catalogues", sa.Column("records_revision", sa.Integer(), server_default=sa.text("0"), nullable=False)
+    )
+    op.add_column("catalogues", sa.Column("records_modified", sa.DateTime(timezone=True), nullable=True))
+    op.execute(
+        """
+        UPDATE catalogues
+        SET records_modified = (SELECT max(updated) FROM records WHERE records.catalogue_id = catalogues.id)
+        """
+    )
+
+
+def downgrade() -> None:
+    """Drop the per-catalogue record change counter and time."""
+    op.drop_column("catalogues", "records_modified")
+    op.drop_column("catalogues", "records_revision")
@@ -0,0 +1,61 @@
+"""records_temporal_extent.
+
+Revision ID: e5a93b0d7c21
+Revises: 4c8e2f17a9b6
+Create Date: 2026-10-16 15:03:18.644729
+
+"""
+
+from __future__ import annotations
+
+from collections.abc import Sequence
+
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "e5a93b0d7c21"
+down_revision: str | Sequence[str] | None = "4c8e2f17a9b6"
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+
+def upgrade() -> None:
+    """Add the record temporal extent range, backfill it from extent intervals, and index it with GiST."""
+    op.add_column("records", sa.Column("temporal_extent", postgresql.TSTZRANGE(), nullable=True))
+
+    # Range covering all extent intervals; a null (or "..") end on any interval leaves that side unbounded
+    op.execute(
+        """
+        WITH intervals AS (
+            SELECT id,
+                   NULLIF(NULLIF(i->>0, '..'), '')::timestamptz AS lower,
+                   NULLIF(NULLIF(i->>1, '..'), '')::timestamptz AS upper
+            FROM records,
+                 jsonb_path_query(extent, 'strict $.temporal.interval[*] ? (@.size() == 2)', '{}', true) AS i
+        )
+        UPDATE records
+        SET temporal_extent = r.temporal_extent
+        FROM (
+            SELECT id,
+                   tstzrange(
+                       CASE WHEN bool_or(lower IS NULL) THEN NULL ELSE min(lower) END,
+                       CASE WHEN bool_or(upper IS NULL) THEN NULL ELSE max(upper) END,
+                       '[]'
+                   ) AS temporal_extent
+            FROM intervals
+            WHERE lower IS NULL OR upper IS NULL OR lower <= upper
+            GROUP BY id
+        ) AS r
+        WHERE records.id = r.id
+        """
+    )
+    op.create_index("idx_records_temporal_extent", "records", ["temporal_extent"], postgresql_using="gist")
+
+
+def downgrade() -> None:
+    """Drop record temporal extent index and column."""
+    op.drop_index("idx_records_temporal_extent", table_name="records", postgresql_using="gist")
+    op.drop_column("records", "temporal_extent")
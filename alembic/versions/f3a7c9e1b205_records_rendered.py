@@ -0,0 +1,126 @@
+"""records_rendered.
+
+Revision ID: f3a7c9e1b205
+Revises: d84f2b6c0e57
+Create Date: 2026-10-17 09:14:27.530968
+
+"""
+
+from __future__ import annotations
+
+import json
+from collections.abc import Sequence
+from datetime import UTC, datetime
+from typing import Any
+
+import sqlalchemy as sa
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = "f3a7c9e1b205"
+down_revision: str | Sequence[str] | None = "d84f2b6c0e57"
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+_BATCH_SIZE = 500
+
+# Record properties by column, in the order and with the names of the response schema at this revision
+_PROPERTIES = {
+    "type": "type",
+    "title": "title",
+    "description": "description",
+    "keywords": "keywords",
+    "language": "language",
+    "license": "license",
+    "created": "created",
+    "updated": "updated",
+    "applicable_collections": "applicableCollections",
+    "contacts": "contacts",
+    "input_parameters": "inputParameters",
+    "application_type": "application:type",
+    "application_container": "application:container",
+    "application_language": "application:language",
+    "extent": "extent",
+    "jupyter_kernel_info": "jupyter_kernel_info",
+    "formats": "formats",
+}
+_PROPERTY_COLUMNS = tuple(column for column in _PROPERTIES if column != "contacts")
+
+
+def _timestamp(value: datetime) -> str:
+    """Timestamp as rendered on registration: UTC, microseconds only when non-zero, `Z` suffix."""
+    return value.astimezone(UTC).isoformat().replace("+00:00", "Z")
+
+
+def _render(row: Any) -> bytes:
+    """Renders a record as registration does at this revision: compact JSON, in schema order."""
+    values = {
+        **row,
+        "created": _timestamp(row["created"]),
+        "updated": _timestamp(row["updated"]),
+        "contacts": [
+            {"name": c["name"], "organization": c["organization"], "roles": c["roles"], "links": []}
+            for c in row["contacts"]
+        ],
+    }
+    document = {
+        "id": row["id"],
+        "type": "Feature",
+        "geometry": row["geometry"],
+        "conformsTo": row["conforms_to"] or [],
+        "properties": {name: values[column] for column, name in _PROPERTIES.items()},
+        "links": [
+            {
+                "href": link["href"],
+                "rel": link["rel"],
+                "type": link["type"],
+                "title": link["title"],
+                "jupyter:kernel": link["jupyter_kernel"],
+            }
+            for link in row["links"]
+        ],
+    }
+    return json.dumps(document, ensure_ascii=False, separators=(",", ":")).encode()
+
+
+def upgrade() -> None:
+    """Add the pre-rendered record document and render it for existing records.
+
+    Records are rendered by a frozen copy of the application's serializer at this revision, so that backfilled
+    documents match those rendered on registration without depending on later changes to the application.
+
+    """
+    op.add_column("records", sa.Column("rendered", sa.LargeBinary(), nullable=True))
+
+    connection = op.get_bind()
+    query = sa.text(
+        f"""
+        SELECT id, geometry, conforms_to, {", ".join(_PROPERTY_COLUMNS)},
+               (SELECT coalesce(jsonb_agg(jsonb_build_object(
+                           'name', name, 'organization', organization, 'roles', roles, 'links', '[]'::jsonb
+                       )), '[]'::jsonb)
+                FROM contacts
+                WHERE entity_id = records.id AND entity_type = 'record') AS contacts,
+               (SELECT coalesce(jsonb_agg(jsonb_build_object(
+                           'href', href, 'rel', rel, 'type', type, 'title', title, 'jupyter_kernel', jupyter_kernel
+                       ) ORDER BY links.id), '[]'::jsonb)
+                FROM links
+                WHERE entity_id = records.id AND entity_type = 'record') AS links
+        FROM records
+        WHERE id > :after
+        ORDER BY id
+        LIMIT :limit
+        """
+    )
+    update = sa.text("UPDATE records SET rendered = :rendered WHERE id = :id")
+    after = ""
+    while rows := connection.execute(query, {"after": after, "limit": _BATCH_SIZE}).mappings().all():
+        documents = [{"id": row["id"], "rendered": _render(row)} for row in rows]
+        connection.execute(update, documents)
+        after = rows[-1]["id"]
+
+
+def downgrade() -> None:
+    """Drop the pre-rendered record document."""
+    op.drop_column("records", "rendered")
@@ -2,6 +2,6 @@
 
 from __future__ import annotations
 
-from wf_catalogue_service.api.common.schemas import PagedResponse
+from wf_catalogue_service.api.common.schemas import CountMode, MatchMode, PagedResponse, PageLink
 
-__all__ = ["PagedResponse"]
+__all__ = ["CountMode", "MatchMode", "PageLink", "PagedResponse"]
@@ -0,0 +1,102 @@
+"""Bounded in-process cache for read routes.
+
+Entries expire after a time-to-live, and the least recently used entries are evicted once the cache is full. Each
+entry is tagged (e.g. with its catalogue ID) so that writes can drop exactly the entries they may have changed.
+
+"""
+
+from __future__ import annotations
+
+import time
+from collections import OrderedDict
+from typing import TYPE_CHECKING, NamedTuple
+
+if TYPE_CHECKING:
+    from collections.abc import Hashable, Iterable
+
+
+class _Entry[V](NamedTuple):
+    expires: float
+    tags: frozenset[str]
+    value: V
+
+
+class ResponseCache[V]:
+    """LRU cache with a time-to-live, invalidated by tag.
+
+    Values computed concurrently with an invalidation are not stored: callers take a `generation` before reading
+    the database and pass it to `set`, which ignores the value if an invalidation happened in between.
+
+    """
+
+    def __init__(self, max_entries: int, ttl: float) -> None:
+        """Creates an empty cache.
+
+        Args:
+            max_entries: Maximum number of entries; `0` disables the cache.
+            ttl: Seconds before an entry expires; `0` disables the cache.
+
+        """
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self.generation = 0
+        self._entries: OrderedDict[Hashable, _Entry[V]] = OrderedDict()
+        self._tagged: dict[str, set[Hashable]] = {}
+
+    def __len__(self) -> int:
+        """Number of entries, including expired ones not evicted yet."""
+        return len(self._entries)
+
+    def get(self, key: Hashable) -> V | None:
+        """The cached value of `key`, or `None` if missing or expired."""
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        if entry.expires <= time.monotonic():
+            self._remove(key)
+            return None
+        self._entries.move_to_end(key)
+        return entry.value
+
+    def set(self, key: Hashable, value: V, generation: int, tags: Iterable[str] = ()) -> None:
+        """Caches `value` under `key`, evicting the least recently used entries beyond the size limit.
+
+        Args:
+            key: The normalized request parameters.
+            value: The value to cache.
+            generation: The cache `generation` taken before the value was computed.
+            tags: Tags to invalidate the entry by.
+
+        """
+        if self.max_entries <= 0 or self.ttl <= 0 or generation != self.generation:
+            return
+        self._remove(key)
+        entry = _Entry(time.monotonic() + self.ttl, frozenset(tags), value)
+        self._entries[key] = entry
+        for tag in entry.tags:
+            self._tagged.setdefault(tag, set()).add(key)
+        while len(self._entries) > self.max_entries:
+            self._remove(next(iter(self._entries)))
+
+    def invalidate(self, tag: str) -> None:
+        """Drops the entries tagged with `tag`."""
+        self.generation += 1
+        for key in self._tagged.pop(tag, set()):
+            self._remove(key)
+
+    def clear(self) -> None:
+        """Drops all entries."""
+        self.generation += 1
+        self._entries.clear()
+        self._tagged.clear()
+
+    def _remove(self, key: Hashable) -> None:
+        entry = self._entries.pop(key, None)
+        if entry is None:
+            return
+        for tag in entry.tags:
+            keys = self._tagged.get(tag)
+            if keys is not None:
+                keys.discard(key)
+                if not keys:
+                    del self._tagged[tag]
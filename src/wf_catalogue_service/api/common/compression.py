@@ -0,0 +1,248 @@
+"""Negotiated response compression (`Content-Encoding`).
+
+Responses are compressed with the encoding the client prefers among those available: zstd and brotli when their
+libraries are installed, and gzip. Bodies below a minimum size are sent as they are. Routes serving bodies that
+are cached or stored pre-rendered compress them once and cache the result, setting `Content-Encoding` themselves;
+`CompressionMiddleware` compresses every other response, including streamed ones, on the fly.
+
+"""
+
+from __future__ import annotations
+
+import gzip
+import zlib
+from typing import TYPE_CHECKING, Protocol
+
+from starlette.datastructures import Headers, MutableHeaders
+
+from wf_catalogue_service.api.common.conditional import encoded_etag
+from wf_catalogue_service.core.settings import current_settings
+
+if TYPE_CHECKING:
+    from collections.abc import Callable
+
+    from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+try:
+    import brotli
+except ImportError:  # pragma: no cover - optional dependency
+    brotli = None
+
+try:
+    from compression import zstd
+except ImportError:  # pragma: no cover - Python < 3.14
+    try:
+        from backports import zstd
+    except ImportError:
+        zstd = None
+
+settings = current_settings()
+
+
+class _StreamCompressor(Protocol):
+    def compress(self, data: bytes) -> bytes:
+        """Compresses a chunk, flushing it so that it can be decoded as soon as it is received."""
+
+    def finish(self) -> bytes:
+        """Ends the stream."""
+
+
+class _GzipStream:
+    def __init__(self, level: int) -> None:
+        self._compressor = zlib.compressobj(level, zlib.DEFLATED, 16 + zlib.MAX_WBITS)
+
+    def compress(self, data: bytes) -> bytes:
+        return self._compressor.compress(data) + self._compressor.flush(zlib.Z_SYNC_FLUSH)
+
+    def finish(self) -> bytes:
+        return self._compressor.flush()
+
+
+class _BrotliStream:
+    def __init__(self, level: int) -> None:
+        self._compressor = brotli.Compressor(quality=level)
+
+    def compress(self, data: bytes) -> bytes:
+        compressed: bytes = self._compressor.process(data) + self._compressor.flush()
+        return compressed
+
+    def finish(self) -> bytes:
+        compressed: bytes = self._compressor.finish()
+        return compressed
+
+
+class _ZstdStream:
+    def __init__(self, level: int) -> None:
+        self._compressor = zstd.ZstdCompressor(level=level)
+
+    def compress(self, data: bytes) -> bytes:
+        compressed: bytes = self._compressor.compress(data, zstd.ZstdCompressor.FLUSH_BLOCK)
+        return compressed
+
+    def finish(self) -> bytes:
+        compressed: bytes = self._compressor.flush(zstd.ZstdCompressor.FLUSH_FRAME)
+        return compressed
+
+
+# One-shot and streaming compressors by encoding, most preferred first
+_ENCODERS: dict[str, tuple[Callable[[bytes, int], bytes], Callable[[int], _StreamCompressor]]] = {}
+if zstd is not None:
+    _ENCODERS["zstd"] = (lambda data, level: zstd.compress(data, level=level), _ZstdStream)
+if brotli is not None:
+    _ENCODERS["br"] = (lambda data, level: brotli.compress(data, quality=level), _BrotliStream)
+_ENCODERS["gzip"] = (lambda data, level: gzip.compress(data, compresslevel=level, mtime=0), _GzipStream)
+
+AVAILABLE_ENCODINGS = tuple(_ENCODERS)
+
+
+def _level(encoding: str) -> int:
+    return {
+        "zstd": settings.compression.zstd_level,
+        "br": settings.compression.brotli_level,
+        "gzip": settings.compression.gzip_level,
+    }[encoding]
+
+
+def negotiate_encoding(accept_encoding: str | None) -> str | None:
+    """Picks the response encoding from an `Accept-Encoding` header, as specified by RFC 9110.
+
+    Args:
+        accept_encoding: The header value.
+
+    Returns:
+        The available encoding with the highest quality value, preferring zstd, then brotli, on ties, or `None` to
+        send the body as it is.
+
+    """
+    if not accept_encoding or not settings.compression.enabled:
+        return None
+    weights: dict[str, float] = {}
+    for item in accept_encoding.split(","):
+        coding, _, params = item.partition(";")
+        weight = 1.0
+        name, _, value = params.partition("=")
+        if name.strip().lower() == "q":
+            try:
+                weight = float(value)
+            except ValueError:
+                weight = 0.0
+        weights[coding.strip().lower()] = weight
+    best = max(AVAILABLE_ENCODINGS, key=lambda encoding: weights.get(encoding, weights.get("*", 0.0)))
+    return best if weights.get(best, weights.get("*", 0.0)) > 0 else None
+
+
+def compress(body: bytes, encoding: str) -> bytes:
+    """Compresses a body with an available encoding, at its configured level."""
+    return _ENCODERS[encoding][0](body, _level(encoding))
+
+
+def is_compressible(content_type: str | None) -> bool:
+    """Whether responses of the media type are worth compressing: text and JSON."""
+    media_type = (content_type or "").partition(";")[0].strip().lower()
+    return media_type.startswith("text/") or media_type.endswith(("/json", "+json", "/x-ndjson"))
+
+
+class CompressionMetrics:
+    """Running totals of the response bytes compressed by the worker, before and after compression."""
+
+    def __init__(self) -> None:
+        """Starts from zero."""
+        self.bytes_in = 0
+        self.bytes_out = 0
+
+    def record(self, original_size: int, compressed_size: int) -> None:
+        """Counts a compressed body, or a chunk of a streamed one."""
+        self.bytes_in += original_size
+        self.bytes_out += compressed_size
+
+    @property
+    def saved_ratio(self) -> float:
+        """Fraction of the bytes that compression saved."""
+        return 1 - self.bytes_out / self.bytes_in if self.bytes_in else 0.0
+
+
+compression_metrics = CompressionMetrics()
+
+
+class CompressionMiddleware:
+    """ASGI middleware compressing text and JSON responses with the negotiated encoding.
+
+    Responses that already have a `Content-Encoding` are passed through, which lets routes serve precompressed
+    bodies. Single-message responses are compressed if they reach the minimum size; streamed responses are always
+    compressed, chunk by chunk. The `ETag` of compressed responses is replaced by the tag of the encoding.
+
+    """
+
+    def __init__(self, app: ASGIApp) -> None:
+        """Wraps an application."""
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        """Handles a request."""
+        if scope["type"] != "http" or not settings.compression.enabled:
+            await self.app(scope, receive, send)
+            return
+        encoding = negotiate_encoding(Headers(scope=scope).get("accept-encoding"))
+        await self.app(scope, receive, _CompressingSend(send, encoding))
+
+
+class _CompressingSend:
+    """The `send` callable of one response, compressing its body if applicable."""
+
+    def __init__(self, send: Send, encoding: str | None) -> None:
+        self.send = send
+        self.encoding = encoding
+        self.start: Message = {}
+        self.stream: _StreamCompressor | None = None
+        self.passthrough = False
+
+    async def __call__(self, message: Message) -> None:
+        if message["type"] == "http.response.start":
+            self.start = message
+            return
+        if message["type"] != "http.response.body" or self.passthrough:
+            await self.send(message)
+            return
+        if self.stream is not None:
+            await self._send_chunk(self.stream, message)
+            return
+
+        start = self.start
+        headers = MutableHeaders(raw=start["headers"])
+        body: bytes = message.get("body", b"")
+        more_body = message.get("more_body", False)
+        if "content-encoding" in headers or not is_compressible(headers.get("content-type")):
+            self.passthrough = True
+            await self.send(start)
+            await self.send(message)
+            return
+        headers.add_vary_header("Accept-Encoding")
+        if self.encoding is None or (not more_body and len(body) < settings.compression.min_size):
+            self.passthrough = True
+            await self.send(start)
+            await self.send(message)
+            return
+
+        headers["Content-Encoding"] = self.encoding
+        if "etag" in headers:
+            headers["ETag"] = encoded_etag(headers["etag"], self.encoding)
+        if not more_body:
+            compressed = compress(body, self.encoding)
+            compression_metrics.record(len(body), len(compressed))
+            headers["Content-Length"] = str(len(compressed))
+            await self.send(start)
+            await self.send({"type": "http.response.body", "body": compressed})
+            return
+        del headers["Content-Length"]
+        self.stream = _ENCODERS[self.encoding][1](_level(self.encoding))
+        await self.send(start)
+        await self._send_chunk(self.stream, message)
+
+    async def _send_chunk(self, stream: _StreamCompressor, message: Message) -> None:
+        body: bytes = message.get("body", b"")
+        more_body = message.get("more_body", False)
+        compressed = stream.compress(body) if body else b""
+        if not more_body:
+            compressed += stream.finish()
+        compression_metrics.record(len(body), len(compressed))
+        await self.send({"type": "http.response.body", "body": compressed, "more_body": more_body})
@@ -0,0 +1,107 @@
+"""Conditional GET support: entity tags, `Last-Modified` and `304 Not Modified` responses.
+
+Validators are derived from the values that determine a response body (IDs, `updated` timestamps, revision
+counters, request parameters) rather than from the serialized body, so that they can be checked before the body
+is loaded or built. Compressed representations have entity tags of their own, derived from the uncompressed one with
+`encoded_etag`, and a client's copy of any of them is current while the uncompressed one is.
+
+"""
+
+from __future__ import annotations
+
+import hashlib
+from datetime import UTC, datetime
+from email.utils import format_datetime, parsedate_to_datetime
+from http import HTTPStatus
+from typing import TYPE_CHECKING
+
+from fastapi import HTTPException
+
+if TYPE_CHECKING:
+    from fastapi import Request, Response
+
+
+def strong_etag(*parts: object) -> str:
+    """Strong entity tag identifying a response body by the values that determine it."""
+    digest = hashlib.blake2b(repr(parts).encode(), digest_size=16).hexdigest()
+    return f'"{digest}"'
+
+
+def encoded_etag(etag: str, encoding: str) -> str:
+    """Entity tag of the representation compressed with a content coding, e.g. `"<digest>-gzip"`.
+
+    Strong entity tags must change with the representation's bytes, so compressed representations cannot share the
+    tag of the uncompressed one.
+
+    """
+    return f'{etag.removesuffix('"')}-{encoding}"'
+
+
+def _current_etag(if_none_match: str, etag: str) -> str | None:
+    """The entity tag in `If-None-Match` matching the current one, or one of its encoded variants, if any."""
+    for tag in (tag.strip().removeprefix("W/") for tag in if_none_match.split(",")):
+        if tag in {"*", etag} or tag.startswith(etag.removesuffix('"') + "-"):
+            return etag if tag == "*" else tag
+    return None
+
+
+def has_preconditions(request: Request) -> bool:
+    """Whether the request is conditional, in which case validators are worth checking before loading the body."""
+    return "if-none-match" in request.headers or "if-modified-since" in request.headers
+
+
+def is_not_modified(request: Request, etag: str, last_modified: datetime | None) -> bool:
+    """Evaluates `If-None-Match`, or `If-Modified-Since` when absent, as specified by RFC 9110.
+
+    Args:
+        request: The request.
+        etag: The current entity tag, of the uncompressed representation.
+        last_modified: The current modification time, if known.
+
+    Returns:
+        Whether the client's copy is current.
+
+    """
+    if_none_match = request.headers.get("if-none-match")
+    if if_none_match is not None:
+        return _current_etag(if_none_match, etag) is not None
+    if_modified_since = request.headers.get("if-modified-since")
+    if not if_modified_since or last_modified is None:
+        return False
+    try:
+        since = parsedate_to_datetime(if_modified_since)
+    except (TypeError, ValueError):
+        return False
+    if since.tzinfo is None:
+        since = since.replace(tzinfo=UTC)
+    # HTTP dates have a one-second resolution
+    return last_modified.replace(microsecond=0) <= since
+
+
+def validator_headers(etag: str, last_modified: datetime | None) -> dict[str, str]:
+    """`ETag` and `Last-Modified` response headers."""
+    headers = {"ETag": etag}
+    if last_modified is not None:
+        headers["Last-Modified"] = format_datetime(last_modified.astimezone(UTC), usegmt=True)
+    return headers
+
+
+def check_not_modified(request: Request, etag: str, last_modified: datetime | None) -> None:
+    """Ends the request with `304 Not Modified` if the client's copy is current.
+
+    Raises:
+        HTTPException: 304 with the validators of the client's copy, compressed or not, if it is current.
+
+    """
+    if_none_match = request.headers.get("if-none-match")
+    if if_none_match is not None:
+        current = _current_etag(if_none_match, etag)
+    else:
+        current = etag if is_not_modified(request, etag, last_modified) else None
+    if current is not None:
+        raise HTTPException(status_code=HTTPStatus.NOT_MODIFIED, headers=validator_headers(current, last_modified))
+
+
+def set_validators(response: Response, etag: str, last_modified: datetime | None) -> None:
+    """Adds the `ETag` and `Last-Modified` headers to a response."""
+    response.headers.update(validator_headers(etag, last_modified))
@@ -0,0 +1,112 @@
+"""Row counting strategies for paged listings.
+
+An exact `count(*)` over a broad filter can cost more than fetching the page itself. `estimated` counts use the
+Postgres planner's row estimate, falling back to a capped exact count when the estimate is small enough for the
+count to be cheap.
+
+"""
+
+from __future__ import annotations
+
+import json
+from typing import TYPE_CHECKING, Any
+
+from sqlalchemy import func, select
+from sqlalchemy.ext.compiler import compiles
+from sqlalchemy.sql.expression import ClauseElement, Executable
+
+from wf_catalogue_service.api.common.schemas import CountMode
+
+if TYPE_CHECKING:
+    from sqlalchemy import Select
+    from sqlalchemy.ext.asyncio import AsyncSession
+    from sqlalchemy.sql.compiler import SQLCompiler
+
+
+class _Explain(Executable, ClauseElement):
+    """`EXPLAIN (FORMAT JSON)` wrapper for a select statement."""
+
+    inherit_cache = False
+
+    def __init__(self, statement: Select[Any]) -> None:
+        self.statement = statement
+
+
+@compiles(_Explain, "postgresql")
+def _compile_explain(element: _Explain, compiler: SQLCompiler, **kw: Any) -> str:
+    return "EXPLAIN (FORMAT JSON) " + compiler.process(element.statement, **kw)
+
+
+async def exact_count(session: AsyncSession, query: Select[Any], limit: int | None = None) -> int:
+    """Counts the rows matched by the query, reading at most `limit` rows when given.
+
+    Args:
+        session: The database session.
+        query: The filtered select statement.
+        limit: Optional cap on the number of rows read.
+
+    Returns:
+        The number of matching rows (at most `limit`).
+
+    """
+    if limit is not None:
+        query = query.limit(limit)
+    return await session.scalar(select(func.count()).select_from(query.subquery())) or 0
+
+
+async def query_plan(session: AsyncSession, query: Select[Any]) -> dict[str, Any]:
+    """Returns the Postgres planner's plan for the query without executing it.
+
+    Args:
+        session: The database session.
+        query: The select statement.
+
+    Returns:
+        The root plan node, as produced by `EXPLAIN (FORMAT JSON)`.
+
+    """
+    plan = await session.scalar(_Explain(query))
+    if isinstance(plan, str | bytes):
+        plan = json.loads(plan)
+    return plan[0]["Plan"]
+
+
+async def planner_estimate(session: AsyncSession, query: Select[Any]) -> int:
+    """Returns the Postgres planner's row estimate for the query without executing it.
+
+    Args:
+        session: The database session.
+        query: The filtered select statement.
+
+    Returns:
+        The estimated number of matching rows.
+
+    """
+    return int((await query_plan(session, query))["Plan Rows"])
+
+
+async def count_rows(session: AsyncSession, query: Select[Any], mode: CountMode, threshold: int) -> int | None:
+    """Counts rows using the requested strategy.
+
+    Args:
+        session: The database session.
+        query: The filtered select statement.
+        mode: The count strategy.
+        threshold: Estimates at or below this value are replaced by a capped exact count.
+
+    Returns:
+        The row count, or `None` when counting is disabled.
+
+    """
+    if mode == CountMode.none:
+        return None
+    if mode == CountMode.exact:
+        return await exact_count(session, query)
+
+    estimated = await planner_estimate(session, query)
+    if estimated <= threshold:
+        capped = await exact_count(session, query, limit=threshold + 1)
+        if capped <= threshold:
+            return capped
+        return max(estimated, capped)
+    return estimated
@@ -0,0 +1,139 @@
+"""Keyset (cursor) pagination helpers.
+
+Cursors are opaque, URL-safe tokens encoding the sort key and ID of the row at the edge of a page. Filtering on
+`(sort key, id)` instead of using `OFFSET` lets Postgres seek straight to the next page through an index, so page N
+costs the same as page 1.
+
+"""
+
+from __future__ import annotations
+
+import base64
+import binascii
+import enum
+from datetime import datetime
+from http import HTTPStatus
+from typing import TYPE_CHECKING, Any
+
+from fastapi import HTTPException
+from pydantic import BaseModel
+from sqlalchemy import and_, literal, or_, tuple_
+
+if TYPE_CHECKING:
+    from sqlalchemy import ColumnElement
+
+
+class Cursor(BaseModel):
+    """Decoded keyset cursor."""
+
+    order_by: str
+    key: Any
+    id: str
+    backward: bool = False
+
+
+def encode_cursor(order_by: str, key: Any, row_id: str, *, backward: bool = False) -> str:
+    """Encodes an opaque cursor pointing at the given row.
+
+    Args:
+        order_by: The name of the sort column.
+        key: The row's value of the sort column.
+        row_id: The row's ID (tie-breaker).
+        backward: Whether the cursor pages backwards (towards the previous page).
+
+    Returns:
+        URL-safe cursor token.
+
+    """
+    if isinstance(key, enum.Enum):
+        key = key.value
+    if isinstance(key, datetime):
+        key = key.isoformat()
+    payload = Cursor(order_by=order_by, key=key, id=row_id, backward=backward).model_dump_json()
+    return base64.urlsafe_b64encode(payload.encode()).decode().rstrip("=")
+
+
+def decode_cursor(token: str) -> Cursor:
+    """Decodes a cursor token produced by `encode_cursor`.
+
+    Args:
+        token: The cursor token.
+
+    Returns:
+        The decoded cursor.
+
+    Raises:
+        HTTPException: If the token is malformed.
+
+    """
+    try:
+        return Cursor.model_validate_json(base64.urlsafe_b64decode(token + "=" * (-len(token) % 4)))
+    except (binascii.Error, ValueError) as err:
+        raise HTTPException(status_code=HTTPStatus.BAD_REQUEST, detail="Invalid cursor") from err
+
+
+def coerce_cursor_key(column: ColumnElement[Any], key: Any) -> Any:
+    """Converts a JSON-decoded cursor key back to the Python type of the sort column.
+
+    Args:
+        column: The sort column.
+        key: The decoded key value.
+
+    Returns:
+        The key converted to the column's Python type.
+
+    Raises:
+        HTTPException: If the key cannot be converted.
+
+    """
+    if key is None:
+        return None
+    try:
+        python_type = column.type.python_type
+        if python_type is datetime:
+            return datetime.fromisoformat(key)
+        return python_type(key)
+    except (NotImplementedError, TypeError, ValueError) as err:
+        raise HTTPException(status_code=HTTPStatus.BAD_REQUEST, detail="Invalid cursor") from err
+
+
+def keyset_predicate(
+    column: ColumnElement[Any],
+    id_column: ColumnElement[Any],
+    key: Any,
+    last_id: str,
+    *,
+    descending: bool,
+) -> ColumnElement[bool]:
+    """Builds a predicate selecting rows strictly after `(key, last_id)` in the given ordering.
+
+    The ordering is `column, id_column` in the same direction, with Postgres' default NULL placement
+    (`NULLS LAST` for ascending, `NULLS FIRST` for descending). Non-nullable columns use a row comparison,
+    which Postgres answers with a single index seek. Expressions without a `nullable` attribute are treated as
+    nullable.
+
+    Args:
+        column: The sort column or expression.
+        id_column: The unique tie-breaker column.
+        key: The sort key of the last row seen.
+        last_id: The ID of the last row seen.
+        descending: Whether the scan is descending.
+
+    Returns:
+        The predicate.
+
+    """
+    if not getattr(column, "nullable", True):
+        edge = tuple_(literal(key, type_=column.type), literal(last_id, type_=id_column.type))
+        if descending:
+            return tuple_(column, id_column) < edge
+        return tuple_(column, id_column) > edge
+
+    if descending:
+        if key is None:
+            return or_(and_(column.is_(None), id_column < last_id), column.is_not(None))
+        return or_(column < key, and_(column == key, id_column < last_id))
+
+    if key is None:
+        return and_(column.is_(None), id_column > last_id)
+    return or_(column > key, and_(column == key, id_column > last_id), column.is_(None))
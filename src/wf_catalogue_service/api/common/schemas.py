@@ -4,7 +4,7 @@ from __future__ import annotations
 
 from enum import StrEnum
 
-from pydantic import BaseModel
+from pydantic import BaseModel, Field
 
 
 class PaginationParams(BaseModel):
@@ -12,6 +12,10 @@ class PaginationParams(BaseModel):
 
     page: int = 1
     page_size: int = 10
+    cursor: str | None = Field(
+        default=None,
+        description="Opaque keyset cursor taken from a `next`/`prev` link. When set, `page` is ignored.",
+    )
 
 
 class OrderDirection(StrEnum):
@@ -21,6 +25,21 @@ class OrderDirection(StrEnum):
     desc = "desc"
 
 
+class CountMode(StrEnum):
+    """Enum representing how paged listings count the total number of items."""
+
+    exact = "exact"
+    estimated = "estimated"
+    none = "none"
+
+
+class MatchMode(StrEnum):
+    """Enum representing whether a multi-value filter matches any or all of the values."""
+
+    any = "any"
+    all = "all"
+
+
 class FilterParams(BaseModel):
     """Filter params."""
 
@@ -28,11 +47,22 @@ class FilterParams(BaseModel):
     order_direction: OrderDirection = OrderDirection.asc
 
 
+class PageLink(BaseModel):
+    """OGC navigation link for paged responses."""
+
+    href: str
+    rel: str
+    type: str = "application/json"
+
+
 class PagedResponse[T](BaseModel):
     """Response with pagination."""
 
     items: list[T]
-    total_items: int
+    total_items: int | None
     page: int
-    total_pages: int
+    total_pages: int | None
     page_size: int = 10
+    has_more: bool = False
+    count: CountMode = CountMode.exact
+    links: list[PageLink] = Field(default_factory=list)
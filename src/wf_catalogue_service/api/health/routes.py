@@ -8,7 +8,8 @@ from fastapi import APIRouter, Depends, HTTPException, status
 from sqlalchemy import text
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from wf_catalogue_service.api.health.schemas import HealthResponse
+from wf_catalogue_service.api.common.compression import compression_metrics
+from wf_catalogue_service.api.health.schemas import CompressionMetrics, HealthResponse, MetricsResponse
 from wf_catalogue_service.db.session import get_session
 
 health_router = APIRouter(tags=["Health"])
@@ -26,3 +27,19 @@ async def health(session: Annotated[AsyncSession, Depends(get_session)]) -> Heal
         return HealthResponse(status="ok")
     except Exception as err:
         raise HTTPException(status_code=status.HTTP_503_SERVICE_UNAVAILABLE, detail="Database unavailable") from err
+
+
+@health_router.get("/metrics", response_model=MetricsResponse)
+async def metrics() -> MetricsResponse:
+    """Worker metrics endpoint.
+
+    Totals cover the worker answering the request since it started.
+
+    """
+    return MetricsResponse(
+        compression=CompressionMetrics(
+            bytes_in=compression_metrics.bytes_in,
+            bytes_out=compression_metrics.bytes_out,
+            saved_ratio=compression_metrics.saved_ratio,
+        )
+    )
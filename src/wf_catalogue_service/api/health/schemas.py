@@ -9,3 +9,17 @@ class HealthResponse(BaseModel):
     """Health check response."""
 
     status: str
+
+
+class CompressionMetrics(BaseModel):
+    """Response bytes compressed by the worker, before and after compression."""
+
+    bytes_in: int
+    bytes_out: int
+    saved_ratio: float
+
+
+class MetricsResponse(BaseModel):
+    """Worker metrics response."""
+
+    compression: CompressionMetrics
@@ -0,0 +1,45 @@
+"""Normalized index of the STAC collections records apply to.
+
+`applicableCollections` holds long collection URLs in an array column, so finding the records for one collection
+means an array containment test. The `record_collections` table maps a short, hashed key of each normalized
+collection to the records applying to it, which turns the lookup into a primary key range scan.
+
+"""
+
+from __future__ import annotations
+
+import hashlib
+from typing import TYPE_CHECKING
+
+from wf_catalogue_service.db.models import RecordCollection
+
+if TYPE_CHECKING:
+    from collections.abc import Iterable
+
+# Characters stripped around collections before hashing; must match the `record_collections` migration backfill
+_WHITESPACE = " \t\r\n"
+
+
+def collection_key(collection: str) -> str | None:
+    """Hashes a STAC collection ID or URL into its `record_collections` key.
+
+    Surrounding whitespace and trailing slashes are ignored, so `.../collections/x/` and `.../collections/x` share
+    a key.
+
+    Args:
+        collection: The collection ID or URL.
+
+    Returns:
+        The key, or `None` for a blank collection.
+
+    """
+    normalized = collection.strip(_WHITESPACE).rstrip("/")
+    if not normalized:
+        return None
+    return hashlib.md5(normalized.encode(), usedforsecurity=False).hexdigest()
+
+
+def record_collection_rows(record_id: str, collections: Iterable[str]) -> list[RecordCollection]:
+    """Builds the `record_collections` rows for a record, one per distinct collection key."""
+    keys = dict.fromkeys(key for collection in collections if (key := collection_key(collection)))
+    return [RecordCollection(collection_key=key, record_id=record_id) for key in keys]
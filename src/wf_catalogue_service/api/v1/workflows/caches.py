@@ -0,0 +1,138 @@
+"""In-process response caches and their invalidation across workers.
+
+Writes invalidate the caches of the worker that handles them directly, and emit a Postgres `NOTIFY` in the same
+transaction. Every worker runs an `InvalidationListener` that applies these notifications to its own caches once
+the write commits. Notifications sent while a listener is disconnected are lost, so caches are flushed entirely
+whenever the listener (re)connects.
+
+"""
+
+from __future__ import annotations
+
+import asyncio
+import contextlib
+import json
+from typing import TYPE_CHECKING, Any
+
+import asyncpg
+from sqlalchemy import func, select, update
+
+from wf_catalogue_service.api.common.caching import ResponseCache
+from wf_catalogue_service.core.settings import current_settings
+from wf_catalogue_service.db.models import Catalogue
+from wf_catalogue_service.utils.logging import get_logger
+
+if TYPE_CHECKING:
+    from sqlalchemy.ext.asyncio import AsyncSession
+
+settings = current_settings()
+_logger = get_logger(__name__)
+
+# Postgres channel carrying `{"catalogue_id": ..., "record_id": ...}` payloads for each record write, with a null
+# record ID for writes to many records
+INVALIDATION_CHANNEL = "wf_catalogue_invalidation"
+
+# Catalogue metadata and record listing pages, tagged by catalogue ID
+catalogue_cache: ResponseCache[Any] = ResponseCache(settings.cache.max_catalogue_entries, settings.cache.ttl)
+listing_cache: ResponseCache[Any] = ResponseCache(settings.cache.max_listing_entries, settings.cache.ttl)
+# Compressed response bodies, keyed by request URL, entity tag and encoding. Entity tags change with the body, so
+# entries never need invalidating.
+encoded_cache: ResponseCache[bytes] = ResponseCache(settings.cache.max_encoded_entries, settings.cache.ttl)
+
+
+def invalidate_record(catalogue_id: str | None) -> None:
+    """Drops the cached responses that a write to a record of the catalogue may have changed."""
+    if catalogue_id:
+        listing_cache.invalidate(catalogue_id)
+
+
+def clear_caches() -> None:
+    """Drops all cached responses."""
+    catalogue_cache.clear()
+    listing_cache.clear()
+    encoded_cache.clear()
+
+
+async def track_record_change(session: AsyncSession, catalogue_id: str | None, record_id: str | None) -> None:
+    """Records a write to a record, or to many records when `record_id` is `None`, in the session's transaction.
+
+    Bumps the catalogue's record revision, which listing validators derive from, and queues an invalidation
+    notification delivered to all workers on commit.
+
+    """
+    if catalogue_id:
+        await session.execute(
+            update(Catalogue)
+            .where(Catalogue.id == catalogue_id)
+            .values(records_revision=Catalogue.records_revision + 1, records_modified=func.now())
+        )
+    payload = json.dumps({"catalogue_id": catalogue_id, "record_id": record_id})
+    await session.execute(select(func.pg_notify(INVALIDATION_CHANNEL, payload)))
+
+
+class InvalidationListener:
+    """Background task applying invalidation notifications to this worker's caches.
+
+    The listener holds a dedicated connection, checked every `keepalive` seconds, and reconnects after
+    `reconnect_delay` seconds when it is lost.
+
+    """
+
+    def __init__(self, dsn: str, reconnect_delay: float, keepalive: float) -> None:
+        """Creates a stopped listener.
+
+        Args:
+            dsn: The `postgresql://` connection URL.
+            reconnect_delay: Seconds to wait before reconnecting.
+            keepalive: Seconds between connection checks.
+
+        """
+        self.dsn = dsn
+        self.reconnect_delay = reconnect_delay
+        self.keepalive = keepalive
+        self._task: asyncio.Task[None] | None = None
+
+    def start(self) -> None:
+        """Starts listening in the background."""
+        self._task = asyncio.create_task(self._run(), name="cache-invalidation-listener")
+
+    async def stop(self) -> None:
+        """Stops listening and closes the connection."""
+        if self._task is None:
+            return
+        self._task.cancel()
+        with contextlib.suppress(asyncio.CancelledError):
+            await self._task
+        self._task = None
+
+    async def _run(self) -> None:
+        while True:
+            try:
+                await self._listen()
+            # `TimeoutError` (keepalive) is an `OSError`
+            except (OSError, asyncpg.PostgresError, asyncpg.InterfaceError) as e:
+                _logger.warning("Cache invalidation listener disconnected: %s", e)
+            await asyncio.sleep(self.reconnect_delay)
+
+    async def _listen(self) -> None:
+        connection = await asyncpg.connect(self.dsn)
+        try:
+            await connection.add_listener(INVALIDATION_CHANNEL, handle_notification)
+            # Writes committed while disconnected were not notified
+            clear_caches()
+            _logger.info("Cache invalidation listener connected")
+            while not connection.is_closed():
+                await asyncio.sleep(self.keepalive)
+                await connection.execute("SELECT 1", timeout=self.keepalive)
+        finally:
+            connection.terminate()
+
+
+def handle_notification(_connection: Any, _pid: int, _channel: str, payload: str) -> None:
+    """Applies an invalidation notification (an `asyncpg` listener callback), flushing all caches if malformed."""
+    try:
+        change = json.loads(payload)
+        invalidate_record(change["catalogue_id"])
+    except (ValueError, KeyError, TypeError):
+        _logger.warning("Malformed cache invalidation payload: %s", payload)
+        clear_caches()
@@ -0,0 +1,552 @@
+"""OGC CQL2 record filters (`filter=`), compiled to index-aware SQL.
+
+Both encodings are supported: CQL2 text is parsed into the CQL2 JSON structure, which is compiled into a SQLAlchemy
+expression over the queryables below. Each queryable declares the operators its indexes can answer, so filters that
+would force a sequential scan of the records table are rejected before they reach the database.
+
+Supported operators are `and`, `or`, `not`, comparisons (`=`, `<>`, `<`, `<=`, `>`, `>=`), `like`, `between`, `in`,
+`isNull`, the array functions `a_contains`, `a_containedBy`, `a_overlaps` and `a_equals`, and `s_intersects` /
+`t_intersects` on `geometry` / `datetime`. Spatial literals are a `BBOX` or a GeoJSON geometry, which is matched by
+its bounding box.
+
+"""
+
+from __future__ import annotations
+
+import enum
+import json
+import operator
+import re
+from datetime import datetime
+from http import HTTPStatus
+from typing import TYPE_CHECKING, Any, NamedTuple
+
+from fastapi import HTTPException
+from sqlalchemy import and_, false, not_, or_, true
+
+from wf_catalogue_service.api.v1.workflows.extents import (
+    bbox_intersects,
+    datetime_intersects,
+    normalize_bbox,
+    normalize_interval,
+    parse_instant,
+    record_bbox,
+)
+from wf_catalogue_service.db.models import Record
+
+if TYPE_CHECKING:
+    from collections.abc import Callable
+
+    from sqlalchemy import ColumnElement
+
+    from wf_catalogue_service.api.v1.workflows.extents import BBox, Interval
+
+CQL2_TEXT = "cql2-text"
+CQL2_JSON = "cql2-json"
+
+# Maximum nesting of logical operators, so that hostile filters cannot exhaust the stack
+_MAX_DEPTH = 32
+
+# Operators answered by btree indexes, and by GIN indexes on arrays
+_BTREE_OPERATORS = frozenset({"=", "<", "<=", ">", ">=", "between", "in", "isnull"})
+_ARRAY_OPERATORS = frozenset({"a_contains", "a_containedby", "a_overlaps", "a_equals"})
+
+_COMPARISONS: dict[str, Callable[[Any, Any], ColumnElement[bool]]] = {
+    "=": operator.eq,
+    "<>": operator.ne,
+    "<": operator.lt,
+    "<=": operator.le,
+    ">": operator.gt,
+    ">=": operator.ge,
+}
+# Comparison with the operands swapped, for literals on the left-hand side
+_MIRRORED = {"=": "=", "<>": "<>", "<": ">", "<=": ">=", ">": "<", ">=": "<="}
+
+
+class Queryable(NamedTuple):
+    """A record property that can be used in filters."""
+
+    column: Any
+    schema: dict[str, Any]
+    indexed: frozenset[str] = frozenset()
+
+
+_STRING = {"type": "string"}
+_STRINGS = {"type": "array", "items": {"type": "string"}}
+_DATE_TIME = {"type": "string", "format": "date-time"}
+
+QUERYABLES: dict[str, Queryable] = {
+    "id": Queryable(Record.id, {**_STRING, "description": "Record identifier"}, _BTREE_OPERATORS),
+    "type": Queryable(
+        Record.type,
+        {"type": "string", "enum": ["workflow", "notebook"], "description": "Record type"},
+        _BTREE_OPERATORS,
+    ),
+    # Btree lookups through the (catalogue, title) index, `like` through the trigram index
+    "title": Queryable(Record.title, {**_STRING, "description": "Title"}, _BTREE_OPERATORS | {"like"}),
+    "description": Queryable(Record.description, {**_STRING, "description": "Description"}),
+    "keywords": Queryable(Record.keywords, {**_STRINGS, "description": "Keywords"}, _ARRAY_OPERATORS),
+    "applicableCollections": Queryable(
+        Record.applicable_collections,
+        {**_STRINGS, "description": "STAC collections the record applies to"},
+        _ARRAY_OPERATORS,
+    ),
+    "language": Queryable(Record.language, {**_STRING, "description": "Language"}),
+    "license": Queryable(Record.license, {**_STRING, "description": "License"}),
+    "created": Queryable(Record.created, {**_DATE_TIME, "description": "Creation time"}, _BTREE_OPERATORS),
+    "updated": Queryable(Record.updated, {**_DATE_TIME, "description": "Last update time"}, _BTREE_OPERATORS),
+    "application:type": Queryable(Record.application_type, {**_STRING, "description": "Application type"}),
+    "application:container": Queryable(
+        Record.application_container, {"type": "boolean", "description": "Whether the application is containerised"}
+    ),
+    "application:language": Queryable(Record.application_language, {**_STRING, "description": "Application language"}),
+    "geometry": Queryable(
+        None,
+        {"$ref": "https://geojson.org/schema/Geometry.json", "description": "Geometry and spatial extent"},
+        frozenset({"s_intersects"}),
+    ),
+    "datetime": Queryable(None, {**_DATE_TIME, "description": "Temporal extent"}, frozenset({"t_intersects"})),
+}
+
+
+def queryables_schema(schema_id: str) -> dict[str, Any]:
+    """Builds the OGC queryables JSON Schema document.
+
+    Each property lists the operators answered by an index under `x-indexed-operators`. Filters must include at
+    least one such predicate in every branch unless full scans are allowed.
+
+    Args:
+        schema_id: The URL of the document.
+
+    Returns:
+        The JSON Schema.
+
+    """
+    return {
+        "$schema": "https://json-schema.org/draft/2020-12/schema",
+        "$id": schema_id,
+        "type": "object",
+        "title": "Record queryables",
+        "properties": {
+            name: {**queryable.schema, "x-indexed-operators": sorted(queryable.indexed)}
+            for name, queryable in QUERYABLES.items()
+        },
+        "additionalProperties": False,
+    }
+
+
+def _invalid(*, detail: str) -> HTTPException:
+    return HTTPException(status_code=HTTPStatus.BAD_REQUEST, detail=f"Invalid filter: {detail}")
+
+
+# CQL2 text
+
+
+_TOKEN = re.compile(
+    r"""
+    \s*(?:
+        (?P<string>'(?:[^']|'')*')
+      | (?P<number>-?\d+(?:\.\d+)?(?:[eE][+-]?\d+)?)
+      | (?P<quoted>"[^"]+")
+      | (?P<name>[A-Za-z_][\w:.]*)
+      | (?P<symbol><>|<=|>=|[=<>(),])
+    )
+    """,
+    re.VERBOSE,
+)
+
+# Functions producing literals rather than predicates
+_LITERAL_FUNCTIONS = frozenset({"TIMESTAMP", "DATE", "INTERVAL", "BBOX"})
+_KEYWORDS = frozenset({"AND", "OR", "NOT", "LIKE", "BETWEEN", "IN", "IS", "NULL"})
+
+_Token = tuple[str, str]
+
+
+def _tokenize(text: str) -> list[_Token]:
+    tokens = []
+    position = 0
+    while text[position:].strip():
+        match = _TOKEN.match(text, position)
+        if not match:
+            raise _invalid(detail=f"unexpected character at position {len(text) - len(text[position:].lstrip())}")
+        kind = match.lastgroup or ""
+        tokens.append((kind, match.group(kind)))
+        position = match.end()
+    return tokens
+
+
+class _TextParser:
+    """Recursive descent parser from CQL2 text to CQL2 JSON."""
+
+    def __init__(self, text: str) -> None:
+        self.tokens = _tokenize(text)
+        self.position = 0
+        self.depth = 0
+
+    def parse(self) -> Any:
+        node = self._or()
+        if self.position < len(self.tokens):
+            raise _invalid(detail=f"unexpected {self.tokens[self.position][1]!r}")
+        return node
+
+    def _peek(self, offset: int = 0) -> _Token | None:
+        index = self.position + offset
+        return self.tokens[index] if index < len(self.tokens) else None
+
+    def _next(self) -> _Token:
+        token = self._peek()
+        if token is None:
+            raise _invalid(detail="unexpected end of filter")
+        self.position += 1
+        return token
+
+    def _accept(self, value: str) -> bool:
+        """Consumes the next token if it is the given symbol or (case-insensitive) keyword."""
+        token = self._peek()
+        if token and token[0] in {"symbol", "name"} and token[1].upper() == value:
+            self.position += 1
+            return True
+        return False
+
+    def _expect(self, value: str) -> None:
+        if not self._accept(value):
+            token = self._peek()
+            raise _invalid(detail=f"expected {value!r}, got {token[1] if token else 'end of filter'!r}")
+
+    def _nest(self) -> None:
+        self.depth += 1
+        if self.depth > _MAX_DEPTH:
+            raise _invalid(detail="too deeply nested")
+
+    def _or(self) -> Any:
+        args = [self._and()]
+        while self._accept("OR"):
+            args.append(self._and())
+        return args[0] if len(args) == 1 else {"op": "or", "args": args}
+
+    def _and(self) -> Any:
+        args = [self._not()]
+        while self._accept("AND"):
+            args.append(self._not())
+        return args[0] if len(args) == 1 else {"op": "and", "args": args}
+
+    def _not(self) -> Any:
+        if self._accept("NOT"):
+            self._nest()
+            node = {"op": "not", "args": [self._not()]}
+            self.depth -= 1
+            return node
+        if self._accept("("):
+            self._nest()
+            node = self._or()
+            self._expect(")")
+            self.depth -= 1
+            return node
+        return self._predicate()
+
+    def _predicate(self) -> Any:
+        token, following = self._peek(), self._peek(1)
+        if token and token[0] == "name" and following == ("symbol", "(") and token[1].upper() not in _LITERAL_FUNCTIONS:
+            self.position += 1
+            return {"op": token[1].lower(), "args": self._arguments()}
+
+        left = self._scalar()
+        negated = self._accept("NOT")
+        if self._accept("LIKE"):
+            node = {"op": "like", "args": [left, self._scalar()]}
+        elif self._accept("BETWEEN"):
+            lower = self._scalar()
+            self._expect("AND")
+            node = {"op": "between", "args": [left, lower, self._scalar()]}
+        elif self._accept("IN"):
+            node = {"op": "in", "args": [left, self._array()]}
+        elif not negated and self._accept("IS"):
+            negated = self._accept("NOT")
+            self._expect("NULL")
+            node = {"op": "isNull", "args": [left]}
+        elif not negated and (token := self._peek()) and token[1] in _COMPARISONS:
+            self.position += 1
+            node = {"op": token[1], "args": [left, self._scalar()]}
+        elif not negated and isinstance(left, bool):
+            return left
+        else:
+            raise _invalid(detail="expected a comparison operator")
+        return {"op": "not", "args": [node]} if negated else node
+
+    def _arguments(self) -> list[Any]:
+        self._expect("(")
+        args: list[Any] = []
+        if self._accept(")"):
+            return args
+        while True:
+            token = self._peek()
+            args.append(self._array() if token == ("symbol", "(") else self._scalar())
+            if self._accept(")"):
+                return args
+            self._expect(",")
+
+    def _array(self) -> list[Any]:
+        self._nest()
+        items = self._arguments()
+        self.depth -= 1
+        return items
+
+    def _scalar(self) -> Any:
+        kind, value = self._next()
+        if kind == "string":
+            return value[1:-1].replace("''", "'")
+        if kind == "number":
+            return float(value) if any(char in value for char in ".eE") else int(value)
+        if kind == "quoted":
+            return {"property": value[1:-1]}
+        if kind == "name":
+            upper = value.upper()
+            if upper in {"TRUE", "FALSE"}:
+                return upper == "TRUE"
+            if upper in _LITERAL_FUNCTIONS:
+                return self._literal(upper)
+            if upper not in _KEYWORDS:
+                return {"property": value}
+        raise _invalid(detail=f"unexpected {value!r}")
+
+    def _literal(self, function: str) -> dict[str, Any]:
+        """Parses the arguments of a `TIMESTAMP`, `DATE`, `INTERVAL` or `BBOX` literal."""
+        args = self._arguments()
+        if function in {"INTERVAL", "BBOX"}:
+            return {function.lower(): args}
+        if len(args) != 1:
+            raise _invalid(detail=f"{function} takes a single argument")
+        return {function.lower(): args[0]}
+
+
+def parse_filter(value: str, lang: str | None = None) -> Any:
+    """Parses a `filter` parameter into CQL2 JSON.
+
+    Args:
+        value: The filter.
+        lang: `cql2-text` or `cql2-json`. Detected from the filter when not given.
+
+    Returns:
+        The filter as CQL2 JSON.
+
+    Raises:
+        HTTPException: If the filter is malformed.
+
+    """
+    if lang == CQL2_JSON or (lang is None and value.lstrip().startswith("{")):
+        try:
+            return json.loads(value)
+        except (ValueError, RecursionError) as err:
+            raise _invalid(detail="malformed JSON") from err
+    return _TextParser(value).parse()
+
+
+# Compilation
+
+
+def _is_property(node: Any) -> bool:
+    return isinstance(node, dict) and "property" in node
+
+
+def _queryable(node: Any) -> tuple[str, Queryable]:
+    if not _is_property(node):
+        raise _invalid(detail="expected a property")
+    name = node["property"]
+    if name not in QUERYABLES:
+        raise _invalid(detail=f"unknown queryable {name!r}")
+    return name, QUERYABLES[name]
+
+
+def _column(op: str, node: Any) -> tuple[str, Queryable]:
+    name, queryable = _queryable(node)
+    if queryable.column is None:
+        raise _invalid(detail=f"{op} is not supported on {name}")
+    return name, queryable
+
+
+def _arity(op: str, args: list[Any], count: int) -> None:
+    if len(args) != count:
+        raise _invalid(detail=f"{op} takes {count} arguments")
+
+
+def _scalar(name: str, queryable: Queryable, value: Any) -> Any:
+    """Converts a CQL2 literal to the Python type of the queryable's column."""
+    if isinstance(value, dict) and value.keys() & {"timestamp", "date"}:
+        value = value.get("timestamp", value.get("date"))
+    python_type = queryable.column.type.python_type
+    try:
+        if python_type is datetime and isinstance(value, str) and (instant := parse_instant(value)) is not None:
+            return instant
+        if issubclass(python_type, enum.Enum) and isinstance(value, str):
+            return python_type(value)
+        if python_type in {str, bool} and isinstance(value, python_type):
+            return value
+    except ValueError:
+        pass
+    raise _invalid(detail=f"{value!r} is not a valid value for {name}")
+
+
+def _array(name: str, value: Any) -> list[str]:
+    if not isinstance(value, list) or not all(isinstance(item, str) for item in value):
+        raise _invalid(detail=f"expected an array of strings for {name}")
+    return value
+
+
+def _bbox(value: Any) -> BBox:
+    try:
+        if isinstance(value, dict) and "bbox" in value:
+            return normalize_bbox(value["bbox"])
+        if isinstance(value, dict) and (bbox := record_bbox(value, None)):
+            return bbox
+    except (TypeError, ValueError):
+        pass
+    raise _invalid(detail="expected a BBOX or GeoJSON geometry")
+
+
+def _interval(value: Any) -> Interval:
+    def instant(end: Any) -> Any:
+        return end.get("timestamp", end.get("date")) if isinstance(end, dict) else end
+
+    try:
+        if isinstance(value, dict) and "interval" in value:
+            start, end = value["interval"]
+            return normalize_interval(instant(start), instant(end))
+        if isinstance(value, dict) and value.keys() & {"timestamp", "date"}:
+            return normalize_interval(instant(value), instant(value))
+    except (TypeError, ValueError, AttributeError):
+        pass
+    raise _invalid(detail="expected an INTERVAL, TIMESTAMP or DATE")
+
+
+def _comparison(op: str, args: list[Any]) -> tuple[str, ColumnElement[bool], Queryable]:
+    _arity(op, args, 2)
+    left, right = args
+    if not _is_property(left):
+        left, right, op = right, left, _MIRRORED[op]
+    name, queryable = _column(op, left)
+    return op, _COMPARISONS[op](queryable.column, _scalar(name, queryable, right)), queryable
+
+
+def _like(op: str, args: list[Any]) -> tuple[str, ColumnElement[bool], Queryable]:
+    _arity(op, args, 2)
+    name, queryable = _column(op, args[0])
+    if queryable.column.type.python_type is not str or not isinstance(args[1], str):
+        raise _invalid(detail=f"like is not supported on {name}")
+    return op, queryable.column.like(args[1]), queryable
+
+
+def _between(op: str, args: list[Any]) -> tuple[str, ColumnElement[bool], Queryable]:
+    _arity(op, args, 3)
+    name, queryable = _column(op, args[0])
+    lower, upper = (_scalar(name, queryable, value) for value in args[1:])
+    return op, queryable.column.between(lower, upper), queryable
+
+
+def _in(op: str, args: list[Any]) -> tuple[str, ColumnElement[bool], Queryable]:
+    _arity(op, args, 2)
+    name, queryable = _column(op, args[0])
+    if not isinstance(args[1], list) or not args[1]:
+        raise _invalid(detail="in takes a non-empty array")
+    return op, queryable.column.in_([_scalar(name, queryable, value) for value in args[1]]), queryable
+
+
+def _is_null(op: str, args: list[Any]) -> tuple[str, ColumnElement[bool], Queryable]:
+    _arity(op, args, 1)
+    _, queryable = _column(op, args[0])
+    return op, queryable.column.is_(None), queryable
+
+
+def _array_predicate(op: str, args: list[Any]) -> tuple[str, ColumnElement[bool], Queryable]:
+    _arity(op, args, 2)
+    name, queryable = _column(op, args[0])
+    if queryable.column.type.python_type is not list:
+        raise _invalid(detail=f"{op} is not supported on {name}")
+    column, values = queryable.column, _array(name, args[1])
+    expressions = {
+        "a_contains": column.contains,
+        "a_containedby": column.contained_by,
+        "a_overlaps": column.overlap,
+        "a_equals": column.__eq__,
+    }
+    return op, expressions[op](values), queryable
+
+
+def _intersects(op: str, args: list[Any]) -> tuple[str, ColumnElement[bool], Queryable]:
+    _arity(op, args, 2)
+    left, right = args if _is_property(args[0]) else args[::-1]
+    name, queryable = _queryable(left)
+    if op not in queryable.indexed:
+        raise _invalid(detail=f"{op} is not supported on {name}")
+    if op == "s_intersects":
+        return op, bbox_intersects(_bbox(right)), queryable
+    return op, datetime_intersects(_interval(right)), queryable
+
+
+_PREDICATES: dict[str, Callable[[str, list[Any]], tuple[str, ColumnElement[bool], Queryable]]] = {
+    **dict.fromkeys(_COMPARISONS, _comparison),
+    "like": _like,
+    "between": _between,
+    "in": _in,
+    "isnull": _is_null,
+    **dict.fromkeys(_ARRAY_OPERATORS, _array_predicate),
+    "s_intersects": _intersects,
+    "t_intersects": _intersects,
+}
+
+
+def _compile(node: Any, depth: int = 0) -> tuple[ColumnElement[bool], bool]:
+    """Compiles a CQL2 JSON node into an expression, and whether an index can answer it."""
+    if depth > _MAX_DEPTH:
+        raise _invalid(detail="too deeply nested")
+    if isinstance(node, bool):
+        # `false` matches nothing without reading anything, `true` matches everything
+        return (true(), False) if node else (false(), True)
+    if not isinstance(node, dict) or not isinstance(node.get("op"), str) or not isinstance(node.get("args"), list):
+        raise _invalid(detail="expected an operation with `op` and `args`")
+
+    op, args = node["op"].lower(), node["args"]
+    if op in {"and", "or"}:
+        if len(args) < 2:  # noqa: PLR2004
+            raise _invalid(detail=f"{op} takes at least 2 arguments")
+        compiled = [_compile(arg, depth + 1) for arg in args]
+        expressions = [expression for expression, _ in compiled]
+        indexed = [is_indexed for _, is_indexed in compiled]
+        # A conjunction can be narrowed by any indexed branch, a disjunction needs all of them
+        if op == "and":
+            return and_(*expressions), any(indexed)
+        return or_(*expressions), all(indexed)
+    if op == "not":
+        _arity(op, args, 1)
+        expression, _ = _compile(args[0], depth + 1)
+        return not_(expression), False
+
+    if op not in _PREDICATES:
+        raise _invalid(detail=f"unsupported operator {node['op']!r}")
+    # Comparisons may be mirrored, so the index check uses the operator as compiled
+    op, expression, queryable = _PREDICATES[op](op, args)
+    return expression, op in queryable.indexed
+
+
+def compile_filter(value: str, lang: str | None = None, *, allow_full_scan: bool = False) -> ColumnElement[bool]:
+    """Compiles a CQL2 filter into a SQL expression over records.
+
+    Args:
+        value: The CQL2 text or JSON filter.
+        lang: `cql2-text` or `cql2-json`. Detected from the filter when not given.
+        allow_full_scan: Whether to accept filters that no index can answer.
+
+    Returns:
+        The filter expression.
+
+    Raises:
+        HTTPException: If the filter is malformed, or would require a full scan when not allowed.
+
+    """
+    expression, indexed = _compile(parse_filter(value, lang))
+    if not indexed and not allow_full_scan:
+        raise HTTPException(
+            status_code=HTTPStatus.BAD_REQUEST,
+            detail="Filter cannot be answered from an index. Combine it (with `AND`) with a predicate on an indexed "
+            "queryable, see the queryables document.",
+        )
+    return expression
@@ -0,0 +1,222 @@
+"""Indexed search columns derived from a record's geometry and extent, and predicates over them.
+
+Geometry (GeoJSON) and extent (OGC API Records) are stored as JSONB for round-tripping, which Postgres cannot
+index for spatial or temporal queries. At registration, the values needed for filtering are extracted into plain
+columns backed by dedicated indexes.
+
+"""
+
+from __future__ import annotations
+
+from datetime import UTC, datetime
+from typing import TYPE_CHECKING, Any
+
+from sqlalchemy import Float, func, literal, or_
+from sqlalchemy.dialects.postgresql import Range
+
+from wf_catalogue_service.db.models import Record
+
+if TYPE_CHECKING:
+    from collections.abc import Iterator
+
+    from sqlalchemy import ColumnElement
+
+# (min x, min y, max x, max y)
+BBox = tuple[float, float, float, float]
+
+# (start, end), `None` for open ends
+Interval = tuple[datetime | None, datetime | None]
+
+# Open interval ends as written in OGC `datetime` parameters
+_OPEN_ENDS = frozenset({"", ".."})
+
+_BBOX_2D_LENGTH = 4
+_BBOX_3D_LENGTH = 6
+
+
+def normalize_bbox(values: list[Any]) -> BBox:
+    """Reduces a 2D or 3D OGC bounding box to its horizontal extent.
+
+    Boxes crossing the antimeridian keep their min x greater than their max x.
+
+    Args:
+        values: `[minx, miny, maxx, maxy]` or `[minx, miny, minz, maxx, maxy, maxz]`.
+
+    Returns:
+        The 2D bounding box.
+
+    Raises:
+        ValueError: If the box does not have 4 or 6 numeric values, or its min y is greater than its max y.
+
+    """
+    if len(values) == _BBOX_3D_LENGTH:
+        values = [values[0], values[1], values[3], values[4]]
+    if len(values) != _BBOX_2D_LENGTH:
+        msg = "Bounding box must have 4 or 6 values"
+        raise ValueError(msg)
+    minx, miny, maxx, maxy = (float(value) for value in values)
+    if miny > maxy:
+        msg = "Bounding box min y must not be greater than max y"
+        raise ValueError(msg)
+    return minx, miny, maxx, maxy
+
+
+def _positions(coordinates: Any) -> Iterator[tuple[float, float]]:
+    """Yields the (x, y) positions of nested GeoJSON coordinates."""
+    if not isinstance(coordinates, list) or not coordinates:
+        return
+    if isinstance(coordinates[0], int | float):
+        yield float(coordinates[0]), float(coordinates[1])
+        return
+    for nested in coordinates:
+        yield from _positions(nested)
+
+
+def _geometry_positions(geometry: dict[str, Any]) -> Iterator[tuple[float, float]]:
+    """Yields the (x, y) positions of a GeoJSON geometry, including geometry collections."""
+    if geometry.get("type") == "GeometryCollection":
+        for member in geometry.get("geometries") or []:
+            yield from _geometry_positions(member)
+        return
+    yield from _positions(geometry.get("coordinates"))
+
+
+def record_bbox(geometry: dict[str, Any] | None, extent: dict[str, Any] | None) -> BBox | None:
+    """Computes the bounding box covering a record's geometry and spatial extent.
+
+    Malformed geometries and extent boxes are ignored rather than rejected, as both are free-form on registration.
+
+    Args:
+        geometry: The record's GeoJSON geometry.
+        extent: The record's OGC extent (`{"spatial": {"bbox": [[...]]}, ...}`).
+
+    Returns:
+        The bounding box, or `None` if the record has no usable spatial information.
+
+    """
+    boxes: list[BBox] = []
+    if geometry:
+        try:
+            xs, ys = zip(*_geometry_positions(geometry), strict=True)
+            boxes.append((min(xs), min(ys), max(xs), max(ys)))
+        except (IndexError, TypeError, ValueError, AttributeError):
+            pass
+    spatial = (extent or {}).get("spatial")
+    extent_boxes = spatial.get("bbox") if isinstance(spatial, dict) else None
+    for values in extent_boxes or []:
+        try:
+            minx, miny, maxx, maxy = normalize_bbox(values)
+        except (TypeError, ValueError):
+            continue
+        # Boxes crossing the antimeridian are widened to the full longitude range
+        boxes.append((minx, miny, maxx, maxy) if minx <= maxx else (-180.0, miny, 180.0, maxy))
+    if not boxes:
+        return None
+    minxs, minys, maxxs, maxys = zip(*boxes, strict=True)
+    return min(minxs), min(minys), max(maxxs), max(maxys)
+
+
+def bbox_columns(geometry: dict[str, Any] | None, extent: dict[str, Any] | None) -> dict[str, float | None]:
+    """Values of the `Record` bounding box columns for the given geometry and extent."""
+    bbox = record_bbox(geometry, extent)
+    names = ("bbox_minx", "bbox_miny", "bbox_maxx", "bbox_maxy")
+    return dict(zip(names, bbox or (None,) * len(names), strict=True))
+
+
+def parse_instant(value: str | None) -> datetime | None:
+    """Parses an RFC 3339 date-time or date, assuming UTC when no offset is given.
+
+    Args:
+        value: The timestamp; `None`, empty or `..` for an open interval end.
+
+    Returns:
+        The timezone-aware timestamp, or `None` for an open end.
+
+    Raises:
+        ValueError: If the timestamp is malformed.
+
+    """
+    if value is None or value.strip() in _OPEN_ENDS:
+        return None
+    parsed = datetime.fromisoformat(value.strip())
+    return parsed if parsed.tzinfo else parsed.replace(tzinfo=UTC)
+
+
+def normalize_interval(start: str | None, end: str | None) -> Interval:
+    """Parses the ends of a temporal interval.
+
+    Args:
+        start: The start timestamp, `None`, empty or `..` when open.
+        end: The end timestamp, `None`, empty or `..` when open.
+
+    Returns:
+        The interval.
+
+    Raises:
+        ValueError: If a timestamp is malformed or the interval ends before it starts.
+
+    """
+    lower, upper = parse_instant(start), parse_instant(end)
+    if lower and upper and lower > upper:
+        msg = "Interval must not end before it starts"
+        raise ValueError(msg)
+    return lower, upper
+
+
+def record_interval(extent: dict[str, Any] | None) -> Range[datetime] | None:
+    """Computes the inclusive time range covering all of a record's temporal extent intervals.
+
+    Malformed intervals are ignored rather than rejected, as the extent is free-form on registration.
+
+    Args:
+        extent: The record's OGC extent (`{"temporal": {"interval": [[start, end], ...]}, ...}`).
+
+    Returns:
+        The time range, unbounded on open ends, or `None` if the record has no usable temporal information.
+
+    """
+    temporal = (extent or {}).get("temporal")
+    extent_intervals = temporal.get("interval") if isinstance(temporal, dict) else None
+    intervals: list[Interval] = []
+    for values in extent_intervals or []:
+        try:
+            start, end = values
+            intervals.append(normalize_interval(start, end))
+        except (TypeError, ValueError, AttributeError):
+            continue
+    if not intervals:
+        return None
+    starts, ends = zip(*intervals, strict=True)
+    lower = None if None in starts else min(starts)
+    upper = None if None in ends else max(ends)
+    return Range(lower, upper, bounds="[]")
+
+
+def bbox_intersects(bbox: BBox) -> ColumnElement[bool]:
+    """Predicate matching records whose bounding box intersects `bbox`, answered by the `idx_records_bbox` index.
+
+    Boxes crossing the antimeridian are split in two at 180 degrees.
+
+    """
+    record_box = func.box(
+        func.point(Record.bbox_minx, Record.bbox_miny), func.point(Record.bbox_maxx, Record.bbox_maxy)
+    )
+    minx, miny, maxx, maxy = bbox
+    spans = [(minx, maxx)] if minx <= maxx else [(minx, 180.0), (-180.0, maxx)]
+    return or_(
+        *(
+            record_box.bool_op("&&")(
+                func.box(
+                    func.point(literal(x1, Float), literal(miny, Float)),
+                    func.point(literal(x2, Float), literal(maxy, Float)),
+                )
+            )
+            for x1, x2 in spans
+        )
+    )
+
+
+def datetime_intersects(interval: Interval) -> ColumnElement[bool]:
+    """Predicate matching records whose temporal extent intersects `interval`, answered by the GiST index."""
+    start, end = interval
+    return Record.temporal_extent.overlaps(Range(start, end, bounds="[]"))
@@ -0,0 +1,154 @@
+"""Record counts per property value (facets) for filter sidebars.
+
+Filtered facets are aggregated in a single pass over the matching records: each record is expanded into its distinct
+`(facet, value)` pairs with a lateral subquery, and the pairs are counted with one `GROUP BY`. Unfiltered facets are
+read from `facet_summaries`, which record writes keep up to date incrementally.
+
+"""
+
+from __future__ import annotations
+
+import enum
+from collections import Counter, defaultdict
+from typing import TYPE_CHECKING, Any
+
+from sqlalchemy import Text, cast, delete, func, literal, select, true, union
+from sqlalchemy.dialects.postgresql import insert
+
+from wf_catalogue_service.api.v1.workflows.schemas import FacetCount, FacetsResponse
+from wf_catalogue_service.db.models import FacetSummary, Record
+
+if TYPE_CHECKING:
+    from collections.abc import Iterable
+
+    from sqlalchemy import ColumnElement, Row
+    from sqlalchemy.ext.asyncio import AsyncSession
+
+# Faceted properties, by API name; array properties count each distinct element
+_SCALAR_FACETS = {
+    "type": Record.type,
+    "application:type": Record.application_type,
+    "application:language": Record.application_language,
+}
+_ARRAY_FACETS = {
+    "keywords": Record.keywords,
+    "applicableCollections": Record.applicable_collections,
+}
+
+
+# Columns `record_facet_values` reads
+RECORD_FACET_COLUMNS = (*_SCALAR_FACETS.values(), *_ARRAY_FACETS.values())
+
+
+def record_facet_values(record: Record | Row[Any]) -> set[tuple[str, str]]:
+    """The distinct `(facet, value)` pairs of a record, or of a row of its `RECORD_FACET_COLUMNS`."""
+    pairs = set()
+    for facet, column in _SCALAR_FACETS.items():
+        value = getattr(record, column.key)
+        if value is not None:
+            pairs.add((facet, value.value if isinstance(value, enum.Enum) else value))
+    for facet, column in _ARRAY_FACETS.items():
+        pairs.update((facet, value) for value in getattr(record, column.key) or [])
+    return pairs
+
+
+async def update_facet_summary(
+    session: AsyncSession, catalogue_id: str, pairs: Iterable[tuple[str, str]], delta: int
+) -> None:
+    """Adds `delta` to the summary counts of the given values, dropping values no record has any more.
+
+    Args:
+        session: The database session.
+        catalogue_id: The catalogue of the registered or deleted records.
+        pairs: The records' `(facet, value)` pairs; pairs shared by several records are repeated.
+        delta: `1` for registered records, `-1` for deleted ones.
+
+    """
+    await _add_facet_counts(session, catalogue_id, {pair: delta * count for pair, count in Counter(pairs).items()})
+
+
+async def replace_facet_summary(
+    session: AsyncSession, catalogue_id: str, old_pairs: set[tuple[str, str]], new_pairs: set[tuple[str, str]]
+) -> None:
+    """Updates the summary counts of a replaced record, only writing the values it gained or lost."""
+    changes = dict.fromkeys(new_pairs - old_pairs, 1) | dict.fromkeys(old_pairs - new_pairs, -1)
+    await _add_facet_counts(session, catalogue_id, changes)
+
+
+async def _add_facet_counts(session: AsyncSession, catalogue_id: str, changes: dict[tuple[str, str], int]) -> None:
+    if not changes:
+        return
+    statement = insert(FacetSummary).values([
+        {"catalogue_id": catalogue_id, "facet": facet, "value": value, "count": change}
+        for (facet, value), change in changes.items()
+    ])
+    await session.execute(
+        statement.on_conflict_do_update(
+            index_elements=[FacetSummary.catalogue_id, FacetSummary.facet, FacetSummary.value],
+            set_={"count": FacetSummary.count + statement.excluded.count},
+        )
+    )
+    if min(changes.values()) < 0:
+        await session.execute(
+            delete(FacetSummary).where(FacetSummary.catalogue_id == catalogue_id, FacetSummary.count <= 0)
+        )
+
+
+def _facets_response(rows: Any, limit: int) -> FacetsResponse:
+    """Groups `(facet, value, count)` rows into a response, keeping the `limit` most frequent values per facet."""
+    grouped: dict[str, list[FacetCount]] = defaultdict(list)
+    for facet, value, count in rows:
+        grouped[facet].append(FacetCount(value=value, count=count))
+    return FacetsResponse.model_validate({
+        facet: sorted(counts, key=lambda item: (-item.count, item.value))[:limit] for facet, counts in grouped.items()
+    })
+
+
+async def summary_facets(session: AsyncSession, catalogue_id: str, limit: int) -> FacetsResponse:
+    """Reads the precomputed facets of a whole catalogue.
+
+    Args:
+        session: The database session.
+        catalogue_id: The catalogue.
+        limit: Maximum number of values per facet.
+
+    Returns:
+        The facets.
+
+    """
+    result = await session.execute(
+        select(FacetSummary.facet, FacetSummary.value, FacetSummary.count).where(
+            FacetSummary.catalogue_id == catalogue_id, FacetSummary.count > 0
+        )
+    )
+    return _facets_response(result.all(), limit)
+
+
+async def filtered_facets(session: AsyncSession, where: ColumnElement[bool], limit: int) -> FacetsResponse:
+    """Aggregates the facets of the records matching `where` in a single pass.
+
+    Args:
+        session: The database session.
+        where: The record filter.
+        limit: Maximum number of values per facet.
+
+    Returns:
+        The facets.
+
+    """
+    # `UNION` rather than `UNION ALL`, so that records count once per value, like in the summary
+    values = union(
+        *(
+            select(literal(facet).label("facet"), cast(column, Text).label("value")).correlate(Record)
+            for facet, column in _SCALAR_FACETS.items()
+        ),
+        *(select(literal(facet), func.unnest(column)).correlate(Record) for facet, column in _ARRAY_FACETS.items()),
+    ).lateral("facet_values")
+    result = await session.execute(
+        select(values.c.facet, values.c.value, func.count())
+        .select_from(Record)
+        .join(values, true())
+        .where(where, values.c.value.is_not(None))
+        .group_by(values.c.facet, values.c.value)
+    )
+    return _facets_response(result.all(), limit)
@@ -0,0 +1,297 @@
+"""Record filtering and ordering for listing endpoints."""
+
+from __future__ import annotations
+
+from http import HTTPStatus
+from typing import TYPE_CHECKING, Any
+
+from fastapi import HTTPException
+from sqlalchemy import Float, func, literal, literal_column, select
+from sqlalchemy.dialects.postgresql import REGCONFIG
+from sqlalchemy.orm import load_only
+
+from wf_catalogue_service.api.common.schemas import MatchMode, OrderDirection
+from wf_catalogue_service.api.v1.workflows.cql2 import compile_filter
+from wf_catalogue_service.api.v1.workflows.extents import (
+    bbox_intersects,
+    datetime_intersects,
+    normalize_bbox,
+    normalize_interval,
+)
+from wf_catalogue_service.api.v1.workflows.schemas import RecordProperties
+from wf_catalogue_service.db.models import SEARCH_CONFIG, Record, RecordType
+
+if TYPE_CHECKING:
+    from sqlalchemy import ColumnElement, Select
+    from sqlalchemy.ext.asyncio import AsyncSession
+    from sqlalchemy.orm import InstrumentedAttribute
+    from sqlalchemy.sql.base import ExecutableOption
+
+    from wf_catalogue_service.api.v1.workflows.extents import BBox, Interval
+    from wf_catalogue_service.api.v1.workflows.schemas import RecordFilterParams, RecordFilterRequest
+
+RELEVANCE = "relevance"
+
+# Record columns listings can be ordered by, besides relevance; their values round-trip through page cursors
+SORTABLE = frozenset({"created", "updated", "title"})
+
+# Related rows that can be embedded in list items with `include`
+INCLUDABLE = frozenset({"contacts", "links"})
+
+# Comma-separated listing parameters whose item order does not change the response
+_UNORDERED_CSV_PARAMS = frozenset({"fields", "include", "applicable_collections", "keywords"})
+
+# Record properties selectable with `fields`, keyed by both API name (alias) and attribute name
+_PROPERTY_NAMES = {
+    key: name for name, field in RecordProperties.model_fields.items() for key in (name, field.alias or name)
+}
+
+
+def text_search_query(q: str) -> ColumnElement[Any]:
+    """Builds a `tsquery` from user-entered search text (web search syntax)."""
+    return func.websearch_to_tsquery(literal(SEARCH_CONFIG, REGCONFIG), q)
+
+
+def keywords_text() -> ColumnElement[str]:
+    """Space-separated record keywords, matching the `idx_records_keywords_trgm` index expression."""
+    return func.immutable_array_to_string(Record.keywords, literal_column("' '"))
+
+
+def fuzzy_similarity(q: str) -> ColumnElement[float]:
+    """Trigram word similarity between the search text and the record's title or keywords, whichever is higher."""
+    return func.greatest(
+        func.word_similarity(q, Record.title),
+        func.word_similarity(q, keywords_text()),
+        type_=Float,
+    )
+
+
+def parse_bbox(bbox: str) -> BBox:
+    """Parses an OGC `bbox` parameter (`minx,miny,maxx,maxy`, optionally with min/max z).
+
+    Args:
+        bbox: The comma-separated coordinates.
+
+    Returns:
+        The 2D bounding box. Min x is greater than max x for boxes crossing the antimeridian.
+
+    Raises:
+        HTTPException: If the bounding box is malformed.
+
+    """
+    try:
+        return normalize_bbox(bbox.split(","))
+    except ValueError as err:
+        raise HTTPException(status_code=HTTPStatus.BAD_REQUEST, detail=f"Invalid bbox: {err}") from err
+
+
+def parse_datetime(value: str) -> Interval:
+    """Parses an OGC `datetime` parameter: an instant, or a closed or open (`..`) interval separated by `/`.
+
+    Args:
+        value: The instant or interval.
+
+    Returns:
+        The interval, with equal ends for an instant.
+
+    Raises:
+        HTTPException: If the value is malformed.
+
+    """
+    ends = value.split("/")
+    if len(ends) > 2:  # noqa: PLR2004
+        raise HTTPException(
+            status_code=HTTPStatus.BAD_REQUEST, detail="Invalid datetime: expected an instant or interval"
+        )
+    try:
+        if len(ends) == 1:
+            return normalize_interval(value, value)
+        return normalize_interval(*ends)
+    except ValueError as err:
+        raise HTTPException(status_code=HTTPStatus.BAD_REQUEST, detail=f"Invalid datetime: {err}") from err
+
+
+async def set_fuzzy_threshold(session: AsyncSession, threshold: float) -> None:
+    """Sets the trigram word similarity threshold for the current transaction.
+
+    The threshold is applied by the index-backed `%>` operator, so it has to be set on the connection rather than
+    compared in the `WHERE` clause.
+
+    Args:
+        session: The database session.
+        threshold: Minimum word similarity (0-1) for fuzzy matches.
+
+    """
+    await session.execute(select(func.set_config("pg_trgm.word_similarity_threshold", str(threshold), True)))  # noqa: FBT003
+
+
+def array_match(column: InstrumentedAttribute[list[str]], values: list[str], mode: MatchMode) -> ColumnElement[bool]:
+    """Predicate matching arrays that overlap (`&&`) or contain (`@>`) the values, both answered by GIN indexes."""
+    if mode == MatchMode.any:
+        return column.overlap(values)
+    return column.contains(values)
+
+
+def apply_record_filters(
+    select_query: Select[Any], query: RecordFilterParams, *, allow_full_scan: bool = False
+) -> Select[Any]:
+    """Applies the request's record filters to a select statement.
+
+    Args:
+        select_query: The statement selecting records.
+        query: The filter params.
+        allow_full_scan: Whether to accept CQL2 filters that no index can answer.
+
+    Returns:
+        The filtered statement.
+
+    """
+    # Filter by type
+    if query.type:
+        select_query = select_query.where(Record.type == RecordType(query.type))
+
+    # Fuzzy search over the trigram-indexed title and keywords, full-text search over the search vector otherwise
+    if query.q and query.fuzzy:
+        select_query = select_query.where(Record.title.bool_op("%>")(query.q) | keywords_text().bool_op("%>")(query.q))
+    elif query.q:
+        select_query = select_query.where(Record.search_vector.bool_op("@@")(text_search_query(query.q)))
+
+    # Filter by bounding box
+    if query.bbox:
+        select_query = select_query.where(bbox_intersects(parse_bbox(query.bbox)))
+
+    # Filter by temporal extent
+    if query.datetime_:
+        select_query = select_query.where(datetime_intersects(parse_datetime(query.datetime_)))
+
+    # Filter by applicable collections
+    if query.applicable_collections:
+        select_query = select_query.where(
+            array_match(Record.applicable_collections, split_csv(query.applicable_collections), query.collections_match)
+        )
+
+    # Filter by keywords
+    if query.keywords:
+        select_query = select_query.where(array_match(Record.keywords, split_csv(query.keywords), query.keywords_match))
+
+    # CQL2 filter
+    if query.filter_:
+        select_query = select_query.where(
+            compile_filter(query.filter_, query.filter_lang, allow_full_scan=allow_full_scan)
+        )
+
+    return select_query
+
+
+def resolve_ordering(query: RecordFilterRequest) -> tuple[str, ColumnElement[Any], bool]:
+    """Resolves the sort key name, expression and direction, defaulting to newest first.
+
+    Args:
+        query: The filter params.
+
+    Returns:
+        The sort key name, the sort expression and whether the ordering is descending.
+
+    Raises:
+        HTTPException: If records cannot be ordered by the sort key.
+
+    """
+    if query.q and (query.order_by == RELEVANCE or (query.fuzzy and not query.order_by)):
+        # Relevance is always most relevant first; fuzzy matches are ranked by similarity by default
+        if query.fuzzy:
+            return RELEVANCE, fuzzy_similarity(query.q), True
+        return RELEVANCE, func.ts_rank(Record.search_vector, text_search_query(query.q), type_=Float), True
+    if not query.order_by:
+        return "created", Record.__table__.c.created, True
+    if query.order_by == RELEVANCE:
+        raise HTTPException(status_code=HTTPStatus.BAD_REQUEST, detail="Ordering by relevance requires q")
+    if query.order_by not in SORTABLE:
+        raise HTTPException(
+            status_code=HTTPStatus.BAD_REQUEST,
+            detail=f"Cannot order by: {query.order_by}, expected one of: {', '.join(sorted(SORTABLE))}, {RELEVANCE}",
+        )
+    column = Record.__table__.c[query.order_by]
+    return column.key, column, query.order_direction == OrderDirection.desc
+
+
+def split_csv(value: str | None) -> list[str]:
+    """Splits a comma-separated query parameter into unique, non-empty items, preserving order."""
+    if not value:
+        return []
+    return list(dict.fromkeys(filter(None, (part.strip() for part in value.split(",")))))
+
+
+def listing_cache_key(query: RecordFilterRequest) -> tuple[tuple[str, Any], ...]:
+    """Normalized, hashable form of record listing parameters.
+
+    Parameters left at their default are dropped, and comma-separated sets are deduplicated and sorted, so that
+    equivalent requests share a cache entry.
+
+    """
+    values = query.model_dump(exclude_defaults=True)
+    for name in _UNORDERED_CSV_PARAMS.intersection(values):
+        values[name] = tuple(sorted(split_csv(values[name])))
+    return tuple(sorted(values.items()))
+
+
+def parse_include(include: str | None) -> frozenset[str]:
+    """Resolves a comma-separated `include` parameter.
+
+    Args:
+        include: Comma-separated related entities to embed (`contacts`, `links`).
+
+    Returns:
+        The related entities to embed.
+
+    Raises:
+        HTTPException: If an item cannot be included.
+
+    """
+    selected = frozenset(split_csv(include))
+    if unknown := selected - INCLUDABLE:
+        raise HTTPException(status_code=HTTPStatus.BAD_REQUEST, detail=f"Cannot include: {', '.join(sorted(unknown))}")
+    return selected
+
+
+def parse_fields(fields: str | None) -> frozenset[str] | None:
+    """Resolves a comma-separated `fields` parameter to record property attribute names.
+
+    Args:
+        fields: Comma-separated property names, using either API names (e.g. `applicableCollections`) or
+            attribute names.
+
+    Returns:
+        The selected attribute names, or `None` when all properties are requested.
+
+    Raises:
+        HTTPException: If a field is not a record property.
+
+    """
+    if not fields:
+        return None
+    selected = set()
+    for item in split_csv(fields):
+        if item not in _PROPERTY_NAMES:
+            raise HTTPException(status_code=HTTPStatus.BAD_REQUEST, detail=f"Unknown field: {item}")
+        selected.add(_PROPERTY_NAMES[item])
+    return frozenset(selected)
+
+
+def record_load_options(fields: frozenset[str] | None, *always: InstrumentedAttribute[Any]) -> list[ExecutableOption]:
+    """Builds loader options that only fetch the record columns backing the selected properties.
+
+    Unselected columns, in particular the large JSONB ones, are neither read nor transferred. Accessing them raises
+    instead of issuing a lazy load.
+
+    Args:
+        fields: The selected property attribute names, or `None` for all.
+        *always: Additional attributes to load regardless of the selection.
+
+    Returns:
+        The loader options.
+
+    """
+    if fields is None:
+        return []
+    columns = [getattr(Record, name) for name in sorted(fields) if name in Record.__table__.c]
+    return [load_only(Record.id, *columns, *always, raiseload=True)]
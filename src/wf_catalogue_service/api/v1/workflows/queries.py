@@ -0,0 +1,155 @@
+"""Queries for fetching entities together with their related rows.
+
+Contacts, links and themes are attached to records and catalogues polymorphically, without ORM relationships.
+For a single entity they are embedded as `jsonb_agg` scalar subqueries, so one statement returns the entity with
+everything it references. For many entities they are loaded with one `= ANY(...)` lookup per related table and
+grouped in memory, so the number of statements does not depend on the number of entities.
+
+"""
+
+from __future__ import annotations
+
+from collections import defaultdict
+from typing import TYPE_CHECKING, Any
+
+from sqlalchemy import Text, any_, func, literal, literal_column, select
+from sqlalchemy.dialects.postgresql import ARRAY, JSONB, aggregate_order_by
+
+from wf_catalogue_service.db.models import Concept, Contact, Link, Theme
+
+if TYPE_CHECKING:
+    from collections.abc import Collection
+
+    from sqlalchemy import ColumnElement, ScalarSelect
+    from sqlalchemy.ext.asyncio import AsyncSession
+
+_EMPTY_JSONB_ARRAY = literal_column("'[]'::jsonb", JSONB)
+
+
+def _jsonb_array(element: ColumnElement[Any], order_by: ColumnElement[Any] | None = None) -> ColumnElement[Any]:
+    """`jsonb_agg` of the element, returning an empty array rather than NULL when there are no rows."""
+    aggregated = element if order_by is None else aggregate_order_by(element, order_by)
+    return func.coalesce(func.jsonb_agg(aggregated), _EMPTY_JSONB_ARRAY, type_=JSONB)
+
+
+def contacts_json(entity_id: ColumnElement[str], entity_type: str) -> ScalarSelect[Any]:
+    """Correlated subquery returning the entity's contacts as a JSON array.
+
+    Args:
+        entity_id: The (outer) entity ID column.
+        entity_type: The polymorphic entity type.
+
+    Returns:
+        Scalar subquery yielding a list of contact objects.
+
+    """
+    contact = func.jsonb_build_object(
+        "name",
+        Contact.name,
+        "organization",
+        Contact.organization,
+        "roles",
+        Contact.roles,
+        "links",
+        _EMPTY_JSONB_ARRAY,
+    )
+    return (
+        select(_jsonb_array(contact))
+        .where(Contact.entity_id == entity_id, Contact.entity_type == entity_type)
+        .scalar_subquery()
+    )
+
+
+def links_json(entity_id: ColumnElement[str], entity_type: str) -> ScalarSelect[Any]:
+    """Correlated subquery returning the entity's links as a JSON array, in insertion order.
+
+    Args:
+        entity_id: The (outer) entity ID column.
+        entity_type: The polymorphic entity type.
+
+    Returns:
+        Scalar subquery yielding a list of link objects.
+
+    """
+    link = func.jsonb_build_object(
+        "href",
+        Link.href,
+        "rel",
+        Link.rel,
+        "type",
+        Link.type,
+        "title",
+        Link.title,
+        "jupyter_kernel",
+        Link.jupyter_kernel,
+    )
+    return (
+        select(_jsonb_array(link, Link.id))
+        .where(Link.entity_id == entity_id, Link.entity_type == entity_type)
+        .scalar_subquery()
+    )
+
+
+def themes_json(catalogue_id: ColumnElement[str]) -> ScalarSelect[Any]:
+    """Correlated subquery returning the catalogue's themes, with nested concepts, as a JSON array.
+
+    Args:
+        catalogue_id: The (outer) catalogue ID column.
+
+    Returns:
+        Scalar subquery yielding a list of theme objects.
+
+    """
+    concept = func.jsonb_build_object("id", Concept.concept_id, "title", Concept.title)
+    concepts = select(_jsonb_array(concept, Concept.id)).where(Concept.theme_id == Theme.id).scalar_subquery()
+    theme = func.jsonb_build_object("scheme", Theme.scheme, "concepts", concepts)
+    return select(_jsonb_array(theme, Theme.id)).where(Theme.catalogue_id == catalogue_id).scalar_subquery()
+
+
+async def contacts_by_entity(
+    session: AsyncSession, entity_ids: Collection[str], entity_type: str
+) -> dict[str, list[Contact]]:
+    """Loads the contacts of many entities in one statement, grouped by entity ID.
+
+    Args:
+        session: The database session.
+        entity_ids: The entity IDs.
+        entity_type: The polymorphic entity type.
+
+    Returns:
+        Contacts keyed by entity ID. Entities without contacts are absent.
+
+    """
+    query = select(Contact).where(
+        Contact.entity_id == any_(literal(list(entity_ids), ARRAY(Text))),
+        Contact.entity_type == entity_type,
+    )
+    grouped: dict[str, list[Contact]] = defaultdict(list)
+    for contact in (await session.execute(query)).scalars():
+        grouped[contact.entity_id].append(contact)
+    return grouped
+
+
+async def links_by_entity(
+    session: AsyncSession, entity_ids: Collection[str], entity_type: str
+) -> dict[str, list[Link]]:
+    """Loads the links of many entities in one statement, grouped by entity ID, in insertion order.
+
+    Args:
+        session: The database session.
+        entity_ids: The entity IDs.
+        entity_type: The polymorphic entity type.
+
+    Returns:
+        Links keyed by entity ID. Entities without links are absent.
+
+    """
+    query = (
+        select(Link)
+        .where(Link.entity_id == any_(literal(list(entity_ids), ARRAY(Text))), Link.entity_type == entity_type)
+        .order_by(Link.id)
+    )
+    grouped: dict[str, list[Link]] = defaultdict(list)
+    for link in (await session.execute(query)).scalars():
+        grouped[link.entity_id].append(link)
+    return grouped
@@ -0,0 +1,234 @@
+"""JSON rendering of read responses.
+
+Response models of read endpoints are built from database rows, which are trusted, with `model_construct` rather
+than validation. They are rendered by pydantic-core straight to JSON bytes and returned as raw responses, so
+FastAPI neither validates them against the response model again nor encodes them through `jsonable_encoder`.
+
+Records only change when they are registered, replaced or deleted, so the JSON document of a full record is rendered
+once per write and stored in `records.rendered`. Read endpoints return the stored bytes as they are.
+
+Listing items can also be rendered by Postgres, with `json_build_object` and the API's aliases, so that list pages
+neither load ORM objects nor build models per row. Documents rendered by Postgres are equivalent to those rendered
+from models, with the same keys in the same order, but are formatted with spaces after separators. Values stored as
+`jsonb`, such as input parameters, are the exception: Postgres does not keep their key order, so their keys are not
+guaranteed to be in the order they were registered in.
+
+"""
+
+from __future__ import annotations
+
+from itertools import chain
+from typing import TYPE_CHECKING, Any
+
+from fastapi import Response
+from pydantic_core import to_json
+from sqlalchemy import DateTime, Enum, LargeBinary, Text, case, cast, func, literal, literal_column, select
+from sqlalchemy.dialects.postgresql import JSON, aggregate_order_by
+
+from wf_catalogue_service.api.common.compression import compress, compression_metrics, negotiate_encoding
+from wf_catalogue_service.api.common.conditional import encoded_etag
+from wf_catalogue_service.api.v1.workflows.caches import encoded_cache
+from wf_catalogue_service.api.v1.workflows.schemas import ContactSchema, LinkSchema, RecordPropertiesResponse
+from wf_catalogue_service.core.settings import current_settings
+from wf_catalogue_service.db.models import Contact, Link, Record
+
+if TYPE_CHECKING:
+    from collections.abc import Iterable, Mapping
+    from datetime import datetime
+
+    from fastapi import Request
+    from pydantic import BaseModel
+    from sqlalchemy import ColumnElement, ScalarSelect
+
+    from wf_catalogue_service.api.v1.workflows.schemas import RecordResponse
+
+settings = current_settings()
+
+JSON_MEDIA_TYPE = "application/json"
+
+_EMPTY_JSON_ARRAY = literal_column("'[]'::json", JSON)
+
+
+def render_model(model: BaseModel) -> bytes:
+    """Renders a response model as read endpoints return it: by alias, omitting unset fields."""
+    return model.model_dump_json(by_alias=True, exclude_unset=True).encode()
+
+
+def render_record(record: RecordResponse) -> bytes:
+    """Renders a full record as read endpoints return it."""
+    return render_model(record)
+
+
+def render_array(documents: Iterable[bytes]) -> bytes:
+    """Joins rendered documents into a JSON array."""
+    return b"[" + b",".join(documents) + b"]"
+
+
+def render_page(page: BaseModel, items: bytes) -> bytes:
+    """Renders a paged response around its rendered `items`, which must be left unset on the model."""
+    return b'{"items":' + items + b"," + render_model(page).removeprefix(b"{")
+
+
+def json_response(content: bytes, status_code: int = 200, headers: Mapping[str, str] | None = None) -> Response:
+    """Raw response of rendered JSON."""
+    return Response(content, status_code=status_code, media_type=JSON_MEDIA_TYPE, headers=headers)
+
+
+def encoded_json_response(request: Request, content: bytes, headers: Mapping[str, str]) -> Response:
+    """Raw response of rendered JSON with an `ETag`, compressed with the encoding negotiated with the client.
+
+    Compressed bodies are cached by request URL and entity tag, which together identify the body, so that repeated
+    requests for a cached or pre-rendered body are not compressed again. They are sent with the entity tag of their
+    encoding.
+
+    """
+    encoding = negotiate_encoding(request.headers.get("accept-encoding"))
+    if encoding is None or len(content) < settings.compression.min_size:
+        return json_response(content, headers=headers)
+    key = (str(request.url), headers["ETag"], encoding)
+    generation = encoded_cache.generation
+    encoded = encoded_cache.get(key)
+    if encoded is None:
+        encoded = compress(content, encoding)
+        encoded_cache.set(key, encoded, generation)
+    compression_metrics.record(len(content), len(encoded))
+    return json_response(
+        encoded,
+        headers={
+            **headers,
+            "ETag": encoded_etag(headers["ETag"], encoding),
+            "Content-Encoding": encoding,
+            "Vary": "Accept-Encoding",
+        },
+    )
+
+
+def _json_object(values: Mapping[str, Any]) -> ColumnElement[Any]:
+    """`json_build_object` of the values, which, unlike `jsonb`, keeps keys in the given order."""
+    return func.json_build_object(*chain.from_iterable(values.items()), type_=JSON)
+
+
+def _json_array(element: ColumnElement[Any], order_by: ColumnElement[Any] | None = None) -> ColumnElement[Any]:
+    """JSON array of the aggregated element, empty rather than NULL when there are no rows.
+
+    Unlike `json_agg`, which separates elements with newlines, the array is rendered on a single line.
+
+    """
+    aggregated = element if order_by is None else aggregate_order_by(element, order_by)
+    return func.coalesce(func.array_to_json(func.array_agg(aggregated)), _EMPTY_JSON_ARRAY, type_=JSON)
+
+
+def _json_timestamp(column: ColumnElement[Any]) -> ColumnElement[str]:
+    """Timestamp formatted as pydantic renders UTC datetimes: microseconds only when non-zero, `Z` suffix."""
+    utc = func.timezone("UTC", column)
+    microseconds = func.to_char(utc, "US", type_=Text)
+    return (
+        func.to_char(utc, 'YYYY-MM-DD"T"HH24:MI:SS', type_=Text)
+        + case((microseconds == "000000", ""), else_="." + microseconds)
+        + "Z"
+    )
+
+
+def _json_column(column: ColumnElement[Any]) -> ColumnElement[Any]:
+    """Column value as rendered in documents: enums by value, timestamps as pydantic formats them."""
+    if isinstance(column.type, Enum):
+        return cast(column, Text)
+    if isinstance(column.type, DateTime):
+        return _json_timestamp(column)
+    return column
+
+
+def _contacts_document(entity_id: ColumnElement[str], entity_type: str) -> ScalarSelect[Any]:
+    """Correlated subquery rendering the entity's contacts as `ContactSchema` objects."""
+    contact = _json_object({
+        name: getattr(Contact, name) if name in Contact.__table__.c else _EMPTY_JSON_ARRAY
+        for name in ContactSchema.model_fields
+    })
+    return (
+        select(_json_array(contact))
+        .where(Contact.entity_id == entity_id, Contact.entity_type == entity_type)
+        .scalar_subquery()
+    )
+
+
+def _links_document(entity_id: ColumnElement[str], entity_type: str) -> ScalarSelect[Any]:
+    """Correlated subquery rendering the entity's links as `LinkSchema` objects, in insertion order."""
+    link = _json_object({field.alias or name: getattr(Link, name) for name, field in LinkSchema.model_fields.items()})
+    return (
+        select(_json_array(link, Link.id))
+        .where(Link.entity_id == entity_id, Link.entity_type == entity_type)
+        .scalar_subquery()
+    )
+
+
+def _properties_document(fields: frozenset[str] | None, include: frozenset[str]) -> ColumnElement[Any]:
+    """Renders the record's properties, with contacts when included and empty contacts otherwise."""
+    properties: dict[str, Any] = {}
+    for name, field in RecordPropertiesResponse.model_fields.items():
+        if name == "contacts":
+            if "contacts" in include:
+                properties[name] = _contacts_document(Record.id, "record")
+            elif fields is None or name in fields:
+                properties[name] = _EMPTY_JSON_ARRAY
+        elif name in Record.__table__.c and (fields is None or name in fields):
+            properties[field.alias or name] = _json_column(Record.__table__.c[name])
+    return _json_object(properties)
+
+
+def record_summary_document(fields: frozenset[str] | None, include: frozenset[str]) -> ColumnElement[str]:
+    """Expression rendering a record as a list item, matching the rendered `RecordSummary` of its ORM row.
+
+    Args:
+        fields: The selected property attribute names, or `None` for all.
+        include: The related entities to embed (`contacts`, `links`).
+
+    Returns:
+        The JSON document, as text.
+
+    """
+    document = {"id": Record.id, "type": literal("Feature"), "properties": _properties_document(fields, include)}
+    if "links" in include:
+        document["links"] = _links_document(Record.id, "record")
+    return cast(_json_object(document), Text)
+
+
+def record_document() -> ColumnElement[str]:
+    """Expression rendering a full record, matching `render_record` of its rows.
+
+    Returns:
+        The JSON document, as text.
+
+    """
+    document = {
+        "id": Record.id,
+        "type": literal("Feature"),
+        "geometry": Record.geometry,
+        "conformsTo": func.coalesce(func.to_json(Record.conforms_to), _EMPTY_JSON_ARRAY, type_=JSON),
+        "properties": _properties_document(None, frozenset({"contacts"})),
+        "links": _links_document(Record.id, "record"),
+    }
+    return cast(_json_object(document), Text)
+
+
+def keep_created(document: bytes, created: datetime) -> ColumnElement[bytes]:
+    """Expression of a rendered record document with its creation time replaced by the stored `records.created`.
+
+    Upserts render the document before knowing whether the record exists; when it does, the stored document keeps
+    the original creation time.
+
+    Args:
+        document: The document rendered by `render_record`.
+        created: The creation time it was rendered with.
+
+    Returns:
+        The document, as bytes.
+
+    """
+    head, _, tail = document.partition(b'"created":' + to_json(created))
+    return func.convert_to(
+        literal(head.decode() + '"created":"', Text)
+        + _json_timestamp(Record.created)
+        + literal('"' + tail.decode(), Text),
+        "UTF8",
+        type_=LargeBinary,
+    )
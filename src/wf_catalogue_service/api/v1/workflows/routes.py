@@ -2,115 +2,207 @@
 
 from __future__ import annotations
 
+import hashlib
+import json
 import uuid
+from datetime import UTC, datetime
 from http import HTTPStatus
-from typing import Annotated
+from typing import TYPE_CHECKING, Annotated, Any, NamedTuple
 
-from fastapi import APIRouter, Depends, HTTPException, Query
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response
+from fastapi.responses import JSONResponse, StreamingResponse
 from fastapi.security import HTTPAuthorizationCredentials
-from sqlalchemy import delete, func, select
+from pydantic import ValidationError
+from sqlalchemy import LargeBinary, ScalarSelect, Select, Text, any_, delete, func, literal, null, select, true
+from sqlalchemy.dialects.postgresql import ARRAY, insert
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy.orm import selectinload
 
 from wf_catalogue_service.api.auth.helpers import validate_access_token
-from wf_catalogue_service.api.common.schemas import PagedResponse
+from wf_catalogue_service.api.common.conditional import (
+    check_not_modified,
+    has_preconditions,
+    set_validators,
+    strong_etag,
+    validator_headers,
+)
+from wf_catalogue_service.api.common.counting import count_rows
+from wf_catalogue_service.api.common.pagination import (
+    coerce_cursor_key,
+    decode_cursor,
+    encode_cursor,
+    keyset_predicate,
+)
+from wf_catalogue_service.api.common.schemas import CountMode, PagedResponse, PageLink
+from wf_catalogue_service.api.v1.workflows.applicability import collection_key, record_collection_rows
+from wf_catalogue_service.api.v1.workflows.caches import (
+    catalogue_cache,
+    invalidate_record,
+    listing_cache,
+    track_record_change,
+)
+from wf_catalogue_service.api.v1.workflows.cql2 import queryables_schema
+from wf_catalogue_service.api.v1.workflows.extents import bbox_columns, record_interval
+from wf_catalogue_service.api.v1.workflows.facets import (
+    RECORD_FACET_COLUMNS,
+    filtered_facets,
+    record_facet_values,
+    replace_facet_summary,
+    summary_facets,
+    update_facet_summary,
+)
+from wf_catalogue_service.api.v1.workflows.filters import (
+    apply_record_filters,
+    listing_cache_key,
+    parse_fields,
+    parse_include,
+    record_load_options,
+    resolve_ordering,
+    set_fuzzy_threshold,
+    split_csv,
+)
+from wf_catalogue_service.api.v1.workflows.queries import (
+    contacts_by_entity,
+    contacts_json,
+    links_by_entity,
+    links_json,
+    themes_json,
+)
+from wf_catalogue_service.api.v1.workflows.rendering import (
+    JSON_MEDIA_TYPE,
+    encoded_json_response,
+    json_response,
+    keep_created,
+    record_document,
+    record_summary_document,
+    render_array,
+    render_model,
+    render_page,
+    render_record,
+)
 from wf_catalogue_service.api.v1.workflows.schemas import (
+    BatchItemResult,
+    BatchItemStatus,
+    BatchMode,
+    BatchRegistrationResponse,
     CatalogueResponse,
     CatalogueSummary,
-    ConceptSchema,
     ContactSchema,
+    FacetsRequest,
+    FacetsResponse,
     LinkSchema,
     RecordCreate,
     RecordFilterRequest,
     RecordProperties,
+    RecordPropertiesResponse,
     RecordResponse,
     RecordSummary,
     ThemeSchema,
 )
-from wf_catalogue_service.db.models import Catalogue, Contact, Link, Record, RecordType, Theme
+from wf_catalogue_service.core.settings import current_settings
+from wf_catalogue_service.db.models import Catalogue, Contact, Link, Record, RecordCollection, RecordType
 from wf_catalogue_service.db.session import get_session
 
+if TYPE_CHECKING:
+    from collections.abc import AsyncIterator, Callable, Iterable, Sequence
+
+    from sqlalchemy import Row
+
+    from wf_catalogue_service.api.common.pagination import Cursor
+
+settings = current_settings()
+
+# Cache key of the catalogue list; catalogue details are keyed by catalogue ID
+_COLLECTIONS_KEY = ("collections",)
+
 workflow_router = APIRouter(
     prefix="/collections",
     tags=["Collections"],
 )
 
 
-def _db_record_to_response(record: Record, contacts: list[Contact], links: list[Link]) -> RecordResponse:
+# Record properties backed by a column of the same name on `Record`
+_RECORD_PROPERTY_COLUMNS = tuple(name for name in RecordProperties.model_fields if name in Record.__table__.c)
+
+# Response models below are built from database rows (or validated registration input) with `model_construct`:
+# validating trusted values again is pure overhead. Every field to render must be passed explicitly.
+
+
+def _db_contact_to_schema(contact: Contact) -> ContactSchema:
+    """Convert database contact to OGC Contact."""
+    return ContactSchema.model_construct(
+        name=contact.name,
+        organization=contact.organization,
+        roles=contact.roles,
+        links=[],
+    )
+
+
+def _db_link_to_schema(link: Link) -> LinkSchema:
+    """Convert database link to OGC Link."""
+    return LinkSchema.model_construct(
+        href=link.href,
+        rel=link.rel,
+        type=link.type,
+        title=link.title,
+        jupyter_kernel=link.jupyter_kernel,
+    )
+
+
+def _db_record_properties(
+    record: Record, contacts: list[ContactSchema] | None, fields: frozenset[str] | None = None
+) -> RecordPropertiesResponse:
+    """Convert database record columns to OGC Record properties, restricted to `fields` when given.
+
+    Contacts are only included when provided.
+
+    """
+    values: dict[str, Any] = {
+        name: getattr(record, name) for name in _RECORD_PROPERTY_COLUMNS if fields is None or name in fields
+    }
+    if "type" in values:
+        values["type"] = record.type.value
+    if contacts is not None:
+        values["contacts"] = contacts
+    return RecordPropertiesResponse.model_construct(**values)
+
+
+def _db_record_to_response(
+    record: Record,
+    contacts: list[ContactSchema] | None,
+    links: list[LinkSchema],
+    fields: frozenset[str] | None = None,
+) -> RecordResponse:
     """Convert database record to OGC Record response."""
-    return RecordResponse(
+    return RecordResponse.model_construct(
         id=record.id,
         type="Feature",
         geometry=record.geometry,
         conforms_to=record.conforms_to or [],
-        properties=RecordProperties(
-            type=record.type.value,
-            title=record.title,
-            description=record.description,
-            keywords=record.keywords,
-            language=record.language,
-            license=record.license,
-            created=record.created,
-            updated=record.updated,
-            applicable_collections=record.applicable_collections,
-            contacts=[
-                ContactSchema(
-                    name=c.name,
-                    organization=c.organization,
-                    roles=c.roles,
-                    links=[],
-                )
-                for c in contacts
-            ],
-            input_parameters=record.input_parameters,
-            application_type=record.application_type,
-            application_container=record.application_container,
-            application_language=record.application_language,
-            extent=record.extent,
-            jupyter_kernel_info=record.jupyter_kernel_info,
-            formats=record.formats,
-        ),
-        links=[
-            LinkSchema(
-                href=link.href,
-                rel=link.rel,
-                type=link.type,
-                title=link.title,
-                jupyter_kernel=link.jupyter_kernel,
-            )
-            for link in links
-        ],
+        properties=_db_record_properties(record, contacts, fields),
+        links=links,
     )
 
 
 DEFAULT_CATALOGUE_ID = "eodh-workflows-notebooks"
 
 
-def _db_record_to_summary(record: Record) -> RecordSummary:
-    """Convert database record to summary response."""
-    return RecordSummary(
-        id=record.id,
-        type="Feature",
-        properties=RecordProperties(
-            type=record.type.value,
-            title=record.title,
-            description=record.description,
-            keywords=record.keywords,
-            language=record.language,
-            license=record.license,
-            created=record.created,
-            updated=record.updated,
-            applicable_collections=record.applicable_collections,
-            contacts=[],
-            input_parameters=record.input_parameters,
-            application_type=record.application_type,
-            application_container=record.application_container,
-            application_language=record.application_language,
-            extent=record.extent,
-            jupyter_kernel_info=record.jupyter_kernel_info,
-            formats=record.formats,
-        ),
-    )
+def _db_record_to_summary(
+    record: Record,
+    fields: frozenset[str] | None = None,
+    contacts: list[ContactSchema] | None = None,
+    links: list[LinkSchema] | None = None,
+) -> RecordSummary:
+    """Convert database record to summary response.
+
+    Contacts are empty unless provided or deselected with `fields`; links are only included when provided.
+
+    """
+    if contacts is None and (fields is None or "contacts" in fields):
+        contacts = []
+    values: dict[str, Any] = {"properties": _db_record_properties(record, contacts, fields)}
+    if links is not None:
+        values["links"] = links
+    return RecordSummary.model_construct(id=record.id, type="Feature", **values)
 
 
 @workflow_router.get("")
@@ -118,9 +210,13 @@ async def get_collections(
     session: Annotated[AsyncSession, Depends(get_session)],
 ) -> list[CatalogueSummary]:
     """List all catalogues."""
+    generation = catalogue_cache.generation
+    if (cached := catalogue_cache.get(_COLLECTIONS_KEY)) is not None:
+        return cached
+
     result = await session.execute(select(Catalogue))
     catalogues = result.scalars().all()
-    return [
+    summaries = [
         CatalogueSummary(
             id=cat.id,
             type="Collection",
@@ -129,114 +225,548 @@ async def get_collections(
         )
         for cat in catalogues
     ]
+    catalogue_cache.set(_COLLECTIONS_KEY, summaries, generation)
+    return summaries
+
+
+def _page_links(request: Request, prev_cursor: str | None, next_cursor: str | None) -> list[PageLink]:
+    """Build OGC `self`/`next`/`prev` links from keyset cursors."""
+    links = [PageLink(href=str(request.url), rel="self", type="application/json")]
+    base_url = request.url.remove_query_params(["page", "cursor"])
+    for rel, token in (("next", next_cursor), ("prev", prev_cursor)):
+        if token:
+            links.append(
+                PageLink(href=str(base_url.include_query_params(cursor=token)), rel=rel, type="application/json")
+            )
+    return links
+
+
+class _ListingPage(NamedTuple):
+    """A page of records without its links, which depend on the request URL, and the cursors to link to.
+
+    The page's items are rendered separately, as `items`.
 
+    """
 
-@workflow_router.get("/{catalogue_id}/items")
+    page: PagedResponse[RecordSummary]
+    items: bytes
+    prev_cursor: str | None
+    next_cursor: str | None
+    etag: str
+    last_modified: datetime | None
+
+
+def _catalogue_revision(catalogue_id: str) -> tuple[ScalarSelect[int], ScalarSelect[datetime | None]]:
+    """Scalar subqueries reading the catalogue's record revision and modification time."""
+    where = Catalogue.id == catalogue_id
+    return (
+        select(Catalogue.records_revision).where(where).scalar_subquery(),
+        select(Catalogue.records_modified).where(where).scalar_subquery(),
+    )
+
+
+def _listing_etag(catalogue_id: str, revision: int | None, cache_key: Any) -> str:
+    """Listings change with the catalogue's record revision."""
+    return strong_etag("items", catalogue_id, revision, cache_key)
+
+
+@workflow_router.get(
+    "/{catalogue_id}/items", response_model=PagedResponse[RecordSummary], response_model_exclude_unset=True
+)
 async def get_items(
     catalogue_id: str,
+    request: Request,
     query: Annotated[RecordFilterRequest, Query()],
     session: Annotated[AsyncSession, Depends(get_session)],
-) -> PagedResponse[RecordSummary]:
-    """List records in a catalogue (OGC API Records compliant)."""
-    select_query = select(Record).where(Record.catalogue_id == catalogue_id)
+) -> Response:
+    """List records in a catalogue (OGC API Records compliant).
 
-    # Filter by type
-    if query.type:
-        select_query = select_query.where(Record.type == RecordType(query.type))
+    Supports both page-number and keyset pagination. Following the `next`/`prev` links switches to keyset mode,
+    where the cost of a page does not depend on its depth. Pages are cached in-process until a record of the
+    catalogue is registered or deleted. Conditional requests are answered from the catalogue's record revision.
 
-    # Free text search
-    if query.q:
-        search = f"%{query.q}%"
-        select_query = select_query.where(Record.title.ilike(search) | Record.description.ilike(search))
-
-    # Filter by applicable collection
-    if query.applicable_collections:
-        select_query = select_query.where(Record.applicable_collections.contains([query.applicable_collections]))
-
-    # Filter by keyword
-    if query.keywords:
-        select_query = select_query.where(Record.keywords.contains([query.keywords]))
+    """
+    key = (catalogue_id, listing_cache_key(query))
+    generation = listing_cache.generation
+    listing = listing_cache.get(key)
+    if listing is None:
+        if has_preconditions(request):
+            result = await session.execute(select(*_catalogue_revision(catalogue_id)))
+            revision, modified = result.one()
+            check_not_modified(request, _listing_etag(catalogue_id, revision, key[1]), modified)
+        listing = await _list_records(catalogue_id, query, session, key[1])
+        listing_cache.set(key, listing, generation, tags=[catalogue_id])
+    else:
+        check_not_modified(request, listing.etag, listing.last_modified)
 
-    total_items = await session.scalar(select(func.count()).select_from(select_query.subquery())) or 0
+    page = listing.page.model_copy(update={"links": _page_links(request, listing.prev_cursor, listing.next_cursor)})
+    return encoded_json_response(
+        request, render_page(page, listing.items), validator_headers(listing.etag, listing.last_modified)
+    )
 
-    # Ordering
-    if query.order_by:
-        order_col = getattr(Record, query.order_by, Record.created)
-        select_query = select_query.order_by(order_col.desc() if query.order_direction == "desc" else order_col.asc())
-    else:
-        select_query = select_query.order_by(Record.created.desc())
 
-    # Pagination
-    select_query = select_query.offset((query.page - 1) * query.page_size).limit(query.page_size)
-    result = await session.execute(select_query)
-    records = result.scalars().all()
+async def _list_records(
+    catalogue_id: str, query: RecordFilterRequest, session: AsyncSession, cache_key: Any
+) -> _ListingPage:
+    """Query a page of records, together with the catalogue revision it reflects."""
+    fields = parse_fields(query.fields)
+    include = parse_include(query.include)
+    if query.q and query.fuzzy:
+        await set_fuzzy_threshold(session, settings.listing.fuzzy_similarity_threshold)
+    select_query = apply_record_filters(
+        _listing_query(catalogue_id, fields, include),
+        query,
+        allow_full_scan=settings.listing.allow_full_scan_filters,
+    )
 
-    total_pages = (total_items + query.page_size - 1) // query.page_size
+    count_mode = query.count or (CountMode.exact if query.is_filtered else CountMode.estimated)
+    total_items = await count_rows(session, select_query, count_mode, settings.listing.exact_count_threshold)
+    window = await _fetch_page(session, catalogue_id, query, select_query)
+    items = await _render_items(session, window.rows, fields, include)
 
-    return PagedResponse(
-        items=[_db_record_to_summary(record) for record in records],
+    page = PagedResponse[RecordSummary].model_construct(
         total_items=total_items,
         page=query.page,
-        total_pages=total_pages,
+        total_pages=None if total_items is None else (total_items + query.page_size - 1) // query.page_size,
         page_size=query.page_size,
+        has_more=window.has_next,
+        count=count_mode,
+    )
+    etag = _listing_etag(catalogue_id, window.revision, cache_key)
+    return _ListingPage(page, items, window.prev_cursor, window.next_cursor, etag, window.modified)
+
+
+def _listing_query(catalogue_id: str, fields: frozenset[str] | None, include: frozenset[str]) -> Select[Any]:
+    """Unfiltered query of the catalogue's records, as IDs and items rendered by Postgres or ORM rows."""
+    if settings.listing.render_in_database:
+        return select(Record.id, record_summary_document(fields, include)).where(Record.catalogue_id == catalogue_id)
+    return select(Record.id, Record).options(*record_load_options(fields)).where(Record.catalogue_id == catalogue_id)
+
+
+class _PageWindow(NamedTuple):
+    """The rows of a page, in display order, with the cursors linking to its neighbours."""
+
+    rows: list[Row[Any]]
+    has_next: bool
+    prev_cursor: str | None
+    next_cursor: str | None
+    revision: int | None
+    modified: datetime | None
+
+
+def _keyset_query(
+    catalogue_id: str, query: RecordFilterRequest, select_query: Select[Any]
+) -> tuple[Select[Any], str, Cursor | None]:
+    """Orders a listing query and positions it at the requested page, with one extra row to detect more pages.
+
+    Rows are `(id, item, sort key, catalogue revision, catalogue modification time)`; the record ID breaks ties so
+    that keyset pagination is stable.
+
+    Returns:
+        The query, the ordering name and the decoded cursor, if any.
+
+    """
+    order_by, order_expr, descending = resolve_ordering(query)
+    cursor = decode_cursor(query.cursor) if query.cursor else None
+    if cursor and cursor.order_by != order_by:
+        raise HTTPException(status_code=HTTPStatus.BAD_REQUEST, detail="Cursor does not match requested ordering")
+    scan_descending = descending != (cursor.backward if cursor else False)
+    id_col = Record.__table__.c.id
+    select_query = select_query.add_columns(order_expr.label("sort_key"), *_catalogue_revision(catalogue_id)).order_by(
+        *(col.desc() if scan_descending else col.asc() for col in (order_expr, id_col))
+    )
+    if cursor:
+        key = coerce_cursor_key(order_expr, cursor.key)
+        select_query = select_query.where(
+            keyset_predicate(order_expr, id_col, key, cursor.id, descending=scan_descending)
+        )
+    else:
+        select_query = select_query.offset((query.page - 1) * query.page_size)
+    return select_query.limit(query.page_size + 1), order_by, cursor
+
+
+async def _fetch_page(
+    session: AsyncSession, catalogue_id: str, query: RecordFilterRequest, select_query: Select[Any]
+) -> _PageWindow:
+    """Fetch a page of a listing query, with the catalogue revision it reflects."""
+    statement, order_by, cursor = _keyset_query(catalogue_id, query, select_query)
+    backward = cursor.backward if cursor else False
+    rows = list((await session.execute(statement)).all())
+    has_more = len(rows) > query.page_size
+    rows = rows[: query.page_size]
+    if backward:
+        rows.reverse()
+    if rows:
+        revision, modified = rows[0][3:]
+    else:
+        revision, modified = (await session.execute(select(*_catalogue_revision(catalogue_id)))).one()
+    has_next = backward or has_more
+    has_prev = has_more if backward else bool(cursor) or query.page > 1
+    if not rows:
+        return _PageWindow(rows, has_next, None, None, revision, modified)
+    (first_id, _, first_key), (last_id, _, last_key) = rows[0][:3], rows[-1][:3]
+    return _PageWindow(
+        rows,
+        has_next,
+        encode_cursor(order_by, first_key, first_id, backward=True) if has_prev else None,
+        encode_cursor(order_by, last_key, last_id) if has_next else None,
+        revision,
+        modified,
+    )
+
+
+async def _render_items(
+    session: AsyncSession, rows: list[Row[Any]], fields: frozenset[str] | None, include: frozenset[str]
+) -> bytes:
+    """Render the items of a page, either rendered by Postgres, or built from ORM rows and their related rows."""
+    if settings.listing.render_in_database:
+        return render_array(document.encode() for _, document, *_ in rows)
+    # Embedded related rows - one batched lookup per related table for the whole page
+    page_ids = [record_id for record_id, *_ in rows]
+    contacts = await contacts_by_entity(session, page_ids, "record") if "contacts" in include and rows else None
+    links = await links_by_entity(session, page_ids, "record") if "links" in include and rows else None
+    return render_array(
+        render_model(
+            _db_record_to_summary(
+                record,
+                fields,
+                None if contacts is None else [_db_contact_to_schema(c) for c in contacts.get(record.id, [])],
+                None if links is None else [_db_link_to_schema(link) for link in links.get(record.id, [])],
+            )
+        )
+        for _, record, *_ in rows
     )
 
 
-@workflow_router.get("/{catalogue_id}/items/{record_id}")
+def _record_etag(record_id: str, updated: datetime, fields: frozenset[str] | None) -> str:
+    """Records, with their contacts and links, only change when their `updated` time does."""
+    return strong_etag("item", record_id, updated.isoformat(), None if fields is None else sorted(fields))
+
+
+@workflow_router.get(
+    "/{catalogue_id}/items/{record_id}", response_model=RecordResponse, response_model_exclude_unset=True
+)
 async def get_item(
     catalogue_id: str,
     record_id: str,
+    request: Request,
     session: Annotated[AsyncSession, Depends(get_session)],
-) -> RecordResponse:
-    """Get a single record by ID (OGC API Records compliant)."""
-    # Get record
-    select_query = select(Record).where(Record.id == record_id, Record.catalogue_id == catalogue_id)
+    fields: Annotated[str | None, Query(description="Comma-separated record properties to return.")] = None,
+) -> Response:
+    """Get a single record by ID (OGC API Records compliant).
+
+    Full records are returned as the JSON document rendered at registration. Conditional requests are checked
+    against the record's `updated` time before the record is loaded.
+
+    """
+    selected = parse_fields(fields)
+    if has_preconditions(request):
+        updated = await session.scalar(
+            select(Record.updated).where(Record.id == record_id, Record.catalogue_id == catalogue_id)
+        )
+        if updated is None:
+            raise HTTPException(status_code=HTTPStatus.NOT_FOUND, detail="Record not found")
+        check_not_modified(request, _record_etag(record_id, updated, selected), updated)
+
+    if selected is None:
+        result = await session.execute(
+            select(Record.updated, Record.rendered).where(Record.id == record_id, Record.catalogue_id == catalogue_id)
+        )
+        rendered_row = result.one_or_none()
+        if not rendered_row:
+            raise HTTPException(status_code=HTTPStatus.NOT_FOUND, detail="Record not found")
+        updated, rendered = rendered_row
+        if rendered is not None:
+            return encoded_json_response(
+                request, rendered, validator_headers(_record_etag(record_id, updated, selected), updated)
+            )
+
+    # Sparse field sets, and records not rendered yet: get the record with its contacts and links in a single round
+    # trip
+    with_contacts = selected is None or "contacts" in selected
+    select_query = (
+        select(
+            Record,
+            contacts_json(Record.id, "record") if with_contacts else null(),
+            links_json(Record.id, "record"),
+        )
+        .options(*record_load_options(selected, Record.geometry, Record.conforms_to, Record.updated))
+        .where(Record.id == record_id, Record.catalogue_id == catalogue_id)
+    )
     result = await session.execute(select_query)
-    record = result.scalar_one_or_none()
+    row = result.one_or_none()
 
-    if not record:
+    if not row:
         raise HTTPException(status_code=HTTPStatus.NOT_FOUND, detail="Record not found")
 
-    # Get contacts for this record
-    contacts_query = select(Contact).where(Contact.entity_id == record_id, Contact.entity_type == "record")
-    contacts_result = await session.execute(contacts_query)
-    contacts = list(contacts_result.scalars().all())
+    record, contacts, links = row
+    response = _db_record_to_response(
+        record,
+        [ContactSchema.model_construct(**c) for c in contacts] if with_contacts else None,
+        [LinkSchema.model_construct(**link) for link in links],
+        selected,
+    )
+    return encoded_json_response(
+        request,
+        render_model(response),
+        validator_headers(_record_etag(record.id, record.updated, selected), record.updated),
+    )
+
+
+@workflow_router.get("/{catalogue_id}/batch", response_model=list[RecordResponse], response_model_exclude_unset=True)
+async def get_items_batch(
+    catalogue_id: str,
+    ids: Annotated[str, Query(description="Comma-separated record IDs.")],
+    session: Annotated[AsyncSession, Depends(get_session)],
+    fields: Annotated[str | None, Query(description="Comma-separated record properties to return.")] = None,
+) -> Response:
+    """Get several full records by ID, in the requested order.
+
+    Unknown IDs are skipped. Full records are joined from the JSON documents rendered at registration in a single
+    statement; sparse field sets take a fixed number of statements (records, contacts and links) regardless of the
+    batch size.
+
+    """
+    record_ids = split_csv(ids)
+    if len(record_ids) > settings.listing.max_batch_size:
+        raise HTTPException(
+            status_code=HTTPStatus.BAD_REQUEST,
+            detail=f"At most {settings.listing.max_batch_size} records can be fetched at once",
+        )
+    selected = parse_fields(fields)
+
+    if selected is None:
+        result = await session.execute(
+            select(Record.id, Record.rendered).where(
+                Record.id == any_(literal(record_ids, ARRAY(Text))), Record.catalogue_id == catalogue_id
+            )
+        )
+        rendered = dict(result.tuples().all())
+        if None not in rendered.values():
+            documents = (rendered[record_id] for record_id in record_ids if record_id in rendered)
+            return json_response(render_array(documents))
+
+    # Sparse field sets (and records not rendered yet)
+    result = await session.execute(
+        select(Record)
+        .options(*record_load_options(selected, Record.geometry, Record.conforms_to))
+        .where(Record.id == any_(literal(record_ids, ARRAY(Text))), Record.catalogue_id == catalogue_id)
+    )
+    records = {record.id: record for record in result.scalars()}
+    if not records:
+        return json_response(render_array([]))
+
+    contacts = None
+    if selected is None or "contacts" in selected:
+        contacts = await contacts_by_entity(session, records.keys(), "record")
+    links = await links_by_entity(session, records.keys(), "record")
+
+    return json_response(
+        render_array(
+            render_model(
+                _db_record_to_response(
+                    records[record_id],
+                    None if contacts is None else [_db_contact_to_schema(c) for c in contacts.get(record_id, [])],
+                    [_db_link_to_schema(link) for link in links.get(record_id, [])],
+                    selected,
+                )
+            )
+            for record_id in record_ids
+            if record_id in records
+        )
+    )
+
+
+@workflow_router.get(
+    "/{catalogue_id}/by-collection", response_model=list[RecordSummary], response_model_exclude_unset=True
+)
+async def get_items_by_collection(
+    catalogue_id: str,
+    collection: Annotated[str, Query(description="STAC collection ID or URL.")],
+    session: Annotated[AsyncSession, Depends(get_session)],
+    fields: Annotated[str | None, Query(description="Comma-separated record properties to return.")] = None,
+) -> Response:
+    """List the records applicable to a STAC collection, newest first.
+
+    Served from the hashed collection index rather than the `applicableCollections` arrays. Responses only depend on
+    the collection, so they may be cached by clients and proxies.
+
+    """
+    selected = parse_fields(fields)
+    headers = {"Cache-Control": f"public, max-age={settings.listing.collection_lookup_max_age}"}
+    key = collection_key(collection)
+    if key is None:
+        return json_response(render_array([]), headers=headers)
+
+    result = await session.execute(
+        select(Record)
+        .options(*record_load_options(selected))
+        .join(RecordCollection, RecordCollection.record_id == Record.id)
+        .where(RecordCollection.collection_key == key, Record.catalogue_id == catalogue_id)
+        .order_by(Record.created.desc(), Record.id.desc())
+    )
+    return json_response(
+        render_array(render_model(_db_record_to_summary(record, selected)) for record in result.scalars()),
+        headers=headers,
+    )
+
+
+async def _export_batches(
+    session: AsyncSession, catalogue_id: str, after: str | None
+) -> AsyncIterator[Sequence[bytes]]:
+    """Stream the full records of a catalogue, ordered by ID, in batches of rendered documents.
+
+    Records are read through a server-side cursor by a single statement, so the export reflects one snapshot of
+    the catalogue and memory use does not depend on its size. Records without a stored document are rendered by
+    Postgres.
+
+    """
+    statement = (
+        select(func.coalesce(Record.rendered, func.convert_to(record_document(), "UTF8"), type_=LargeBinary))
+        .where(Record.catalogue_id == catalogue_id)
+        .order_by(Record.id)
+        .execution_options(yield_per=settings.listing.export_batch_size)
+    )
+    if after is not None:
+        statement = statement.where(Record.id > after)
+    result = await session.stream_scalars(statement)
+    async for batch in result.partitions():
+        yield batch
+
+
+async def _ndjson_lines(batches: AsyncIterator[Sequence[bytes]]) -> AsyncIterator[bytes]:
+    async for batch in batches:
+        yield b"".join(document + b"\n" for document in batch)
+
+
+async def _feature_collection(batches: AsyncIterator[Sequence[bytes]]) -> AsyncIterator[bytes]:
+    yield b'{"type":"FeatureCollection","features":['
+    separator = b""
+    async for batch in batches:
+        yield separator + b",".join(batch)
+        separator = b","
+    yield b"]}"
+
+
+@workflow_router.get("/{catalogue_id}/items.ndjson", response_class=StreamingResponse)
+async def export_items_ndjson(
+    catalogue_id: str,
+    session: Annotated[AsyncSession, Depends(get_session)],
+    after: Annotated[
+        str | None, Query(description="Resume after this record ID, the last one received by an interrupted export.")
+    ] = None,
+) -> StreamingResponse:
+    """Export all records of a catalogue as newline-delimited JSON, one full record per line, ordered by ID.
+
+    Records are streamed as they are read from a single snapshot, so harvesters get a consistent copy of the
+    catalogue without paging through it.
+
+    """
+    return StreamingResponse(
+        _ndjson_lines(_export_batches(session, catalogue_id, after)), media_type="application/x-ndjson"
+    )
+
+
+@workflow_router.get("/{catalogue_id}/items.geojson", response_class=StreamingResponse)
+async def export_items_geojson(
+    catalogue_id: str,
+    session: Annotated[AsyncSession, Depends(get_session)],
+    after: Annotated[
+        str | None, Query(description="Resume after this record ID, the last one received by an interrupted export.")
+    ] = None,
+) -> StreamingResponse:
+    """Export all records of a catalogue as a GeoJSON FeatureCollection of full records, ordered by ID.
+
+    Records are streamed as they are read from a single snapshot, like the NDJSON export.
 
-    # Get links for this record
-    links_query = select(Link).where(Link.entity_id == record_id, Link.entity_type == "record")
-    links_result = await session.execute(links_query)
-    links = list(links_result.scalars().all())
+    """
+    return StreamingResponse(
+        _feature_collection(_export_batches(session, catalogue_id, after)), media_type="application/geo+json"
+    )
+
+
+@workflow_router.get("/{catalogue_id}/facets")
+async def get_facets(
+    catalogue_id: str,
+    query: Annotated[FacetsRequest, Query()],
+    session: Annotated[AsyncSession, Depends(get_session)],
+) -> FacetsResponse:
+    """Count records per type, keyword, applicable collection, application type and application language.
+
+    Counts cover the records matching the same filters as `/items`. Unfiltered counts are read from a summary
+    maintained on registration and deletion.
+
+    """
+    if not query.is_filtered:
+        return await summary_facets(session, catalogue_id, query.limit)
+
+    if query.q and query.fuzzy:
+        await set_fuzzy_threshold(session, settings.listing.fuzzy_similarity_threshold)
+    select_query = apply_record_filters(
+        select(Record.id).where(Record.catalogue_id == catalogue_id),
+        query,
+        allow_full_scan=settings.listing.allow_full_scan_filters,
+    )
+    return await filtered_facets(session, select_query.whereclause, query.limit)
+
+
+@workflow_router.get("/{catalogue_id}/queryables", response_class=JSONResponse)
+async def get_queryables(
+    catalogue_id: str,
+    request: Request,
+    session: Annotated[AsyncSession, Depends(get_session)],
+) -> JSONResponse:
+    """Get the properties that can be used in CQL2 filters, as a JSON Schema (OGC API Features - Part 3)."""
+    if not await session.scalar(select(Catalogue.id).where(Catalogue.id == catalogue_id)):
+        raise HTTPException(status_code=HTTPStatus.NOT_FOUND, detail="Catalogue not found")
+    return JSONResponse(queryables_schema(str(request.url)), media_type="application/schema+json")
 
-    return _db_record_to_response(record, contacts, links)
+
+def _catalogue_etag(catalogue_id: str, updated: datetime) -> str:
+    """Catalogue metadata, with its themes, contacts and links, only changes when its `updated` time does."""
+    return strong_etag("catalogue", catalogue_id, updated.isoformat())
 
 
 @workflow_router.get("/{catalogue_id}")
 async def get_catalogue(
     catalogue_id: str,
+    request: Request,
+    response: Response,
     session: Annotated[AsyncSession, Depends(get_session)],
 ) -> CatalogueResponse:
-    """Get catalogue metadata (OGC API Records compliant)."""
-    query = (
-        select(Catalogue)
-        .options(selectinload(Catalogue.themes).selectinload(Theme.concepts))
-        .where(Catalogue.id == catalogue_id)
-    )
-    result = await session.execute(query)
-    catalogue = result.scalar_one_or_none()
+    """Get catalogue metadata (OGC API Records compliant).
 
-    if not catalogue:
-        raise HTTPException(status_code=HTTPStatus.NOT_FOUND, detail="Catalogue not found")
+    Conditional requests are checked against the catalogue's `updated` time before the catalogue is loaded.
+
+    """
+    generation = catalogue_cache.generation
+    if (cached := catalogue_cache.get(catalogue_id)) is not None:
+        etag = _catalogue_etag(cached.id, cached.updated)
+        check_not_modified(request, etag, cached.updated)
+        set_validators(response, etag, cached.updated)
+        return cached
+
+    if has_preconditions(request):
+        updated = await session.scalar(select(Catalogue.updated).where(Catalogue.id == catalogue_id))
+        if updated is None:
+            raise HTTPException(status_code=HTTPStatus.NOT_FOUND, detail="Catalogue not found")
+        check_not_modified(request, _catalogue_etag(catalogue_id, updated), updated)
 
-    # Contacts and links (polymorphic - no relationships)
-    contacts_query = select(Contact).where(Contact.entity_id == catalogue_id, Contact.entity_type == "catalogue")
-    contacts_result = await session.execute(contacts_query)
-    contacts = list(contacts_result.scalars().all())
+    # Themes, contacts and links are aggregated into the catalogue row - a single round trip
+    query = select(
+        Catalogue,
+        themes_json(Catalogue.id),
+        contacts_json(Catalogue.id, "catalogue"),
+        links_json(Catalogue.id, "catalogue"),
+    ).where(Catalogue.id == catalogue_id)
+    result = await session.execute(query)
+    row = result.one_or_none()
 
-    links_query = select(Link).where(Link.entity_id == catalogue_id, Link.entity_type == "catalogue")
-    links_result = await session.execute(links_query)
-    links = list(links_result.scalars().all())
+    if not row:
+        raise HTTPException(status_code=HTTPStatus.NOT_FOUND, detail="Catalogue not found")
 
-    return CatalogueResponse(
+    catalogue, themes, contacts, links = row
+    catalogue_response = CatalogueResponse(
         id=catalogue.id,
         type="Collection",
         item_type=catalogue.item_type,
@@ -244,46 +774,77 @@ async def get_catalogue(
         title=catalogue.title,
         description=catalogue.description,
         keywords=catalogue.keywords,
-        themes=[
-            ThemeSchema(
-                scheme=theme.scheme,
-                concepts=[ConceptSchema(id=c.concept_id, title=c.title) for c in theme.concepts],
-            )
-            for theme in catalogue.themes
-        ],
+        themes=[ThemeSchema.model_validate(theme) for theme in themes],
         language=catalogue.language,
         created=catalogue.created,
         updated=catalogue.updated,
-        contacts=[ContactSchema(name=c.name, organization=c.organization, roles=c.roles, links=[]) for c in contacts],
+        contacts=[ContactSchema.model_validate(c) for c in contacts],
         license=catalogue.license,
-        links=[LinkSchema(href=link.href, rel=link.rel, type=link.type, title=link.title) for link in links],
+        links=[LinkSchema.model_validate(link) for link in links],
     )
+    catalogue_cache.set(catalogue_id, catalogue_response, generation, tags=[catalogue_id])
+    set_validators(response, _catalogue_etag(catalogue.id, catalogue.updated), catalogue.updated)
+    return catalogue_response
 
 
 # Registration router
 register_router = APIRouter(tags=["Registration"])
 
 
-@register_router.post("/register", response_model=RecordResponse, status_code=HTTPStatus.CREATED)
-async def register_record(
-    data: RecordCreate,
-    session: Annotated[AsyncSession, Depends(get_session)],
-    credential: Annotated[HTTPAuthorizationCredentials, Depends(validate_access_token)],  # noqa: ARG001
-) -> RecordResponse:
-    """Register a new workflow/notebook record."""
-    # Check for existing record
-    existing = await session.get(Record, data.id)
-    if existing:
-        raise HTTPException(status_code=HTTPStatus.CONFLICT, detail="Record with this ID already exists")
+class _NewRecord(NamedTuple):
+    """The rows of a record to register, with its rendered document set."""
+
+    record: Record
+    contacts: list[Contact]
+    links: list[Link]
+    collections: list[RecordCollection]
+
+    def related_rows(self) -> list[Any]:
+        """The contact, link and collection rows to insert."""
+        return [*self.contacts, *self.links, *self.collections]
+
+    def record_values(self) -> dict[str, Any]:
+        """Column values of the record row, for Core inserts."""
+        return {
+            column.key: getattr(self.record, column.key) for column in Record.__table__.c if column.computed is None
+        }
 
-    # Determine record type from properties
-    record_type = RecordType(data.properties.type)
 
-    # Create record (auto-assign to default catalogue)
+# Header of write responses for records that were already registered with the same content, and left as they were
+_UNCHANGED_HEADERS = {"Record-Unchanged": "true"}
+
+_CONFLICT_DETAIL = "Record with this ID already exists"
+
+
+async def _lock_records(session: AsyncSession, record_ids: Iterable[str]) -> None:
+    """Lock record IDs until the end of the transaction, so that writes of the same record run one after the other.
+
+    The locks are advisory locks on the hashes of the IDs, which can be taken whether or not the records exist, and
+    are taken in hash order so that concurrent batches cannot deadlock. They are taken in their own statement, so that
+    the write statements that follow read the records as left by the writes they waited for.
+
+    """
+    ids = sorted(set(record_ids))
+    if not ids:
+        return
+    record_id = func.unnest(literal(ids, ARRAY(Text))).column_valued("record_id")
+    await session.execute(
+        select(func.pg_advisory_xact_lock(func.hashtext(record_id))).order_by(func.hashtext(record_id))
+    )
+
+
+def _content_hash(data: RecordCreate) -> str:
+    """Hash of a registered payload in canonical form: its validated values as compact JSON with sorted keys."""
+    canonical = json.dumps(data.model_dump(mode="json"), sort_keys=True, separators=(",", ":"), ensure_ascii=False)
+    return hashlib.blake2b(canonical.encode(), digest_size=16).hexdigest()
+
+
+def _new_record(data: RecordCreate, now: datetime) -> _NewRecord:
+    """Build the rows of a record to register in the default catalogue, rendering its JSON document."""
     record = Record(
         id=data.id,
         catalogue_id=DEFAULT_CATALOGUE_ID,
-        type=record_type,
+        type=RecordType(data.properties.type),
         geometry=data.geometry,
         conforms_to=data.conforms_to,
         title=data.properties.title,
@@ -299,13 +860,14 @@ async def register_record(
         extent=data.properties.extent,
         jupyter_kernel_info=data.properties.jupyter_kernel_info,
         formats=data.properties.formats,
+        created=now,
+        updated=now,
+        content_hash=_content_hash(data),
+        temporal_extent=record_interval(data.properties.extent),
+        **bbox_columns(data.geometry, data.properties.extent),
     )
-    session.add(record)
-
-    # Create contacts
-    contacts = []
-    for contact_data in data.properties.contacts:
-        contact = Contact(
+    contacts = [
+        Contact(
             id=str(uuid.uuid4()),
             entity_id=record.id,
             entity_type="record",
@@ -313,13 +875,10 @@ async def register_record(
             organization=contact_data.organization,
             roles=contact_data.roles,
         )
-        session.add(contact)
-        contacts.append(contact)
-
-    # Create links
-    links = []
-    for link_data in data.links:
-        link = Link(
+        for contact_data in data.properties.contacts
+    ]
+    links = [
+        Link(
             entity_id=record.id,
             entity_type="record",
             href=link_data.href,
@@ -328,13 +887,294 @@ async def register_record(
             title=link_data.title,
             jupyter_kernel=link_data.jupyter_kernel,
         )
-        session.add(link)
-        links.append(link)
+        for link_data in data.links
+    ]
+    record.rendered = render_record(
+        _db_record_to_response(
+            record,
+            [_db_contact_to_schema(c) for c in contacts],
+            [_db_link_to_schema(link) for link in links],
+        )
+    )
+    return _NewRecord(
+        record, contacts, links, record_collection_rows(record.id, data.properties.applicable_collections)
+    )
+
+
+@register_router.post("/register", response_model=RecordResponse, status_code=HTTPStatus.CREATED)
+async def register_record(
+    data: RecordCreate,
+    session: Annotated[AsyncSession, Depends(get_session)],
+    credential: Annotated[HTTPAuthorizationCredentials, Depends(validate_access_token)],  # noqa: ARG001
+) -> Response:
+    """Register a new workflow/notebook record, rendering the JSON document returned when it is read.
+
+    Registering a record again with the same content writes nothing, and returns it with `Record-Unchanged: true`.
+
+    """
+    # Create the record (auto-assigned to the default catalogue) unless its ID is taken, then its contacts and links
+    new = _new_record(data, datetime.now(UTC))
+    await _lock_records(session, [data.id])
+    result = await session.execute(
+        insert(Record)
+        .values(new.record_values())
+        .on_conflict_do_nothing(index_elements=[Record.id])
+        .returning(Record.id)
+    )
+    if result.scalar() is None:
+        result = await session.execute(
+            select(Record.rendered).where(Record.id == data.id, Record.content_hash == new.record.content_hash)
+        )
+        rendered = result.scalar()
+        if rendered is None:
+            raise HTTPException(status_code=HTTPStatus.CONFLICT, detail=_CONFLICT_DETAIL)
+        return json_response(rendered, headers=_UNCHANGED_HEADERS)
+    session.add_all(new.related_rows())
+    await update_facet_summary(session, DEFAULT_CATALOGUE_ID, record_facet_values(new.record), 1)
 
+    await track_record_change(session, DEFAULT_CATALOGUE_ID, data.id)
     await session.commit()
-    await session.refresh(record)
+    invalidate_record(DEFAULT_CATALOGUE_ID)
+
+    return json_response(new.record.rendered, status_code=HTTPStatus.CREATED)
+
+
+def _upsert_statement(new: _NewRecord) -> Select[Any]:
+    """Statement upserting a record and deleting its previous contacts, links and collection rows.
 
-    return _db_record_to_response(record, contacts, links)
+    Records registered with the same content hash are left as they are. Returns the written document of the record
+    (`rendered`) unless it was left as it was, and the previous facet columns and document (`stored`) of the record
+    when it existed. The previous row and related rows are read from the statement's snapshot, so the record must be
+    locked with `_lock_records` beforehand for them to be current.
+
+    """
+    record = new.record
+    previous = (
+        select(Record.id, Record.catalogue_id, *RECORD_FACET_COLUMNS, Record.rendered.label("stored"))
+        .where(Record.id == record.id)
+        .cte("previous")
+    )
+    values = new.record_values()
+    statement = insert(Record).values(values)
+    kept = {"id", "catalogue_id", "created", "rendered"}
+    upsert = statement.on_conflict_do_update(
+        index_elements=[Record.id],
+        set_={
+            **{key: statement.excluded[key] for key in values if key not in kept},
+            "rendered": keep_created(record.rendered, record.created),
+        },
+        where=Record.content_hash.is_distinct_from(statement.excluded.content_hash),
+    )
+    upserted = upsert.returning(Record.rendered).cte("upserted")
+    written = select(upserted.c.rendered).exists()
+    deletions = (
+        delete(Contact)
+        .where(Contact.entity_id == record.id, Contact.entity_type == "record", written)
+        .cte("deleted_contacts"),
+        delete(Link).where(Link.entity_id == record.id, Link.entity_type == "record", written).cte("deleted_links"),
+        delete(RecordCollection).where(RecordCollection.record_id == record.id, written).cte("deleted_collections"),
+    )
+    return (
+        select(upserted.c.rendered, previous)
+        .select_from(upserted.outerjoin(previous, true(), full=True))
+        .add_cte(*deletions)
+    )
+
+
+@register_router.put("/register/{record_id}", response_model=RecordResponse)
+async def upsert_record(
+    record_id: str,
+    data: RecordCreate,
+    session: Annotated[AsyncSession, Depends(get_session)],
+    credential: Annotated[HTTPAuthorizationCredentials, Depends(validate_access_token)],  # noqa: ARG001
+) -> Response:
+    """Register a workflow/notebook record, or replace it with its contacts and links if it exists.
+
+    The record is written with a single `INSERT ... ON CONFLICT (id) DO UPDATE` statement, which also deletes the
+    previous contacts and links, after locking its ID so that concurrent writes of the same record are applied one
+    after the other. Replaced records keep their catalogue and creation time, and get a new update time.
+    The response is `201 Created` for a new record and `200 OK` for a replaced one. Records registered with the same
+    content are not written again, and are returned with `Record-Unchanged: true`.
+
+    """
+    if data.id != record_id:
+        raise HTTPException(status_code=HTTPStatus.BAD_REQUEST, detail="Record ID does not match the path")
+
+    new = _new_record(data, datetime.now(UTC))
+    await _lock_records(session, [record_id])
+    result = await session.execute(_upsert_statement(new))
+    row = result.one()
+    if row.rendered is None:
+        return json_response(row.stored, headers=_UNCHANGED_HEADERS)
+    session.add_all(new.related_rows())
+    catalogue_id = DEFAULT_CATALOGUE_ID if row.id is None else row.catalogue_id
+    if row.id is None:
+        await update_facet_summary(session, DEFAULT_CATALOGUE_ID, record_facet_values(new.record), 1)
+    elif catalogue_id:
+        old_pairs = record_facet_values(row)
+        await replace_facet_summary(session, catalogue_id, old_pairs, record_facet_values(new.record))
+
+    await track_record_change(session, catalogue_id, record_id)
+    await session.commit()
+    invalidate_record(catalogue_id)
+
+    return json_response(row.rendered, status_code=HTTPStatus.CREATED if row.id is None else HTTPStatus.OK)
+
+
+_NDJSON_MEDIA_TYPE = "application/x-ndjson"
+
+
+def _validation_detail(error: ValidationError) -> str:
+    return "; ".join(f"{'.'.join(map(str, e['loc'])) or 'record'}: {e['msg']}" for e in error.errors())
+
+
+async def _parse_batch(request: Request) -> list[RecordCreate | ValidationError]:
+    """Parse a batch registration body: a JSON array of records, or one record per line (NDJSON).
+
+    Records are validated one by one, so that invalid records can be reported individually.
+
+    """
+    body = await request.body()
+    validate: Callable[[Any], RecordCreate]
+    if request.headers.get("content-type", "").startswith(_NDJSON_MEDIA_TYPE):
+        payloads: list[Any] = [line for line in body.splitlines() if line.strip()]
+        validate = RecordCreate.model_validate_json
+    else:
+        try:
+            payloads = json.loads(body)
+        except ValueError as err:
+            raise HTTPException(status_code=HTTPStatus.BAD_REQUEST, detail="Invalid JSON body") from err
+        if not isinstance(payloads, list):
+            raise HTTPException(status_code=HTTPStatus.BAD_REQUEST, detail="Expected a JSON array of records")
+        validate = RecordCreate.model_validate
+    if len(payloads) > settings.registration.max_batch_size:
+        raise HTTPException(
+            status_code=HTTPStatus.REQUEST_ENTITY_TOO_LARGE,
+            detail=f"At most {settings.registration.max_batch_size} records per batch",
+        )
+    parsed: list[RecordCreate | ValidationError] = []
+    for payload in payloads:
+        try:
+            parsed.append(validate(payload))
+        except ValidationError as err:
+            parsed.append(err)
+    return parsed
+
+
+_BATCH_REQUEST_BODY = {
+    "required": True,
+    "content": {
+        media_type: {"schema": {"type": "array", "items": {"$ref": "#/components/schemas/RecordCreate"}}}
+        for media_type in (JSON_MEDIA_TYPE, _NDJSON_MEDIA_TYPE)
+    },
+}
+
+
+@register_router.post(
+    "/register/batch",
+    response_model=BatchRegistrationResponse,
+    status_code=HTTPStatus.CREATED,
+    openapi_extra={"requestBody": _BATCH_REQUEST_BODY},
+)
+async def register_records(
+    request: Request,
+    session: Annotated[AsyncSession, Depends(get_session)],
+    credential: Annotated[HTTPAuthorizationCredentials, Depends(validate_access_token)],  # noqa: ARG001
+    mode: Annotated[
+        BatchMode,
+        Query(description="`atomic` registers all records or none, `partial` registers every record it can."),
+    ] = BatchMode.atomic,
+) -> Response:
+    """Register many workflow/notebook records in one transaction, from a JSON array or NDJSON.
+
+    Existing IDs are detected with a single query, and the records, contacts and links are inserted with multi-row
+    statements. Records are inserted with `ON CONFLICT (id) DO NOTHING`, so that IDs registered concurrently since
+    they were checked are reported as conflicts. Records already registered with the same content are left as they
+    are, and reported as unchanged.
+    The response reports the outcome of each record, by position. It is `201 Created` when records are registered
+    and none failed, `422 Unprocessable Entity` when an atomic batch is rejected, and `200 OK` otherwise.
+
+    """
+    batch = await _parse_batch(request)
+    results: list[BatchItemResult] = []
+    ids = [data.id for data in batch if isinstance(data, RecordCreate)]
+    await _lock_records(session, ids)
+    result = await session.execute(
+        select(Record.id, Record.content_hash).where(Record.id == any_(literal(ids, ARRAY(Text))))
+    )
+    existing = dict(result.tuples().all())
+    taken = set(existing)
+    accepted: list[RecordCreate] = []
+    unchanged = 0
+    for index, data in enumerate(batch):
+        if isinstance(data, ValidationError):
+            results.append(
+                BatchItemResult(index=index, status=BatchItemStatus.invalid, detail=_validation_detail(data))
+            )
+        elif data.id in existing and existing[data.id] == _content_hash(data):
+            unchanged += 1
+            results.append(BatchItemResult(index=index, id=data.id, status=BatchItemStatus.unchanged))
+        elif data.id in taken:
+            results.append(
+                BatchItemResult(
+                    index=index,
+                    id=data.id,
+                    status=BatchItemStatus.conflict,
+                    detail=_CONFLICT_DETAIL,
+                )
+            )
+        else:
+            taken.add(data.id)
+            accepted.append(data)
+            results.append(BatchItemResult(index=index, id=data.id, status=BatchItemStatus.created))
+
+    failed = len(batch) - len(accepted) - unchanged
+    new_records: list[_NewRecord] = []
+    if accepted and not (failed and mode == BatchMode.atomic):
+        now = datetime.now(UTC)
+        new_records = [_new_record(data, now) for data in accepted]
+        result = await session.execute(
+            insert(Record).on_conflict_do_nothing(index_elements=[Record.id]).returning(Record.id),
+            [new.record_values() for new in new_records],
+        )
+        inserted = set(result.scalars())
+        if len(inserted) < len(new_records):
+            results = [
+                item.model_copy(update={"status": BatchItemStatus.conflict, "detail": _CONFLICT_DETAIL})
+                if item.status == BatchItemStatus.created and item.id not in inserted
+                else item
+                for item in results
+            ]
+            failed += len(new_records) - len(inserted)
+            new_records = [new for new in new_records if new.record.id in inserted]
+
+    if failed and mode == BatchMode.atomic:
+        await session.rollback()
+        results = [
+            item.model_copy(update={"status": BatchItemStatus.skipped})
+            if item.status == BatchItemStatus.created
+            else item
+            for item in results
+        ]
+        report = BatchRegistrationResponse(created=0, unchanged=unchanged, failed=failed, items=results)
+        return json_response(render_model(report), status_code=HTTPStatus.UNPROCESSABLE_ENTITY)
+
+    if new_records:
+        session.add_all([row for new in new_records for row in new.related_rows()])
+        await update_facet_summary(
+            session,
+            DEFAULT_CATALOGUE_ID,
+            (pair for new in new_records for pair in record_facet_values(new.record)),
+            1,
+        )
+        await track_record_change(session, DEFAULT_CATALOGUE_ID, None)
+        await session.commit()
+        invalidate_record(DEFAULT_CATALOGUE_ID)
+
+    report = BatchRegistrationResponse(created=len(new_records), unchanged=unchanged, failed=failed, items=results)
+    return json_response(
+        render_model(report), status_code=HTTPStatus.CREATED if new_records and not failed else HTTPStatus.OK
+    )
 
 
 @register_router.delete("/register/{record_id}", status_code=HTTPStatus.NO_CONTENT)
@@ -344,11 +1184,17 @@ async def delete_record(
     credential: Annotated[HTTPAuthorizationCredentials, Depends(validate_access_token)],  # noqa: ARG001
 ) -> None:
     """Delete a workflow/notebook record."""
+    await _lock_records(session, [record_id])
     record = await session.get(Record, record_id)
     if not record:
         raise HTTPException(status_code=HTTPStatus.NOT_FOUND, detail="Record not found")
 
     await session.execute(delete(Contact).where(Contact.entity_id == record_id, Contact.entity_type == "record"))
     await session.execute(delete(Link).where(Link.entity_id == record_id, Link.entity_type == "record"))
+    await session.execute(delete(RecordCollection).where(RecordCollection.record_id == record_id))
+    if record.catalogue_id:
+        await update_facet_summary(session, record.catalogue_id, record_facet_values(record), -1)
     await session.delete(record)
+    await track_record_change(session, record.catalogue_id, record_id)
     await session.commit()
+    invalidate_record(record.catalogue_id)
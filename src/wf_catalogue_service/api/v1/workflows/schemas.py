@@ -3,11 +3,12 @@
 from __future__ import annotations
 
 from datetime import datetime
+from enum import StrEnum
 from typing import Any, Literal
 
 from pydantic import BaseModel, ConfigDict, Field
 
-from wf_catalogue_service.api.common.schemas import FilterParams, PaginationParams
+from wf_catalogue_service.api.common.schemas import CountMode, FilterParams, MatchMode, PaginationParams
 
 
 class LinkSchema(BaseModel):
@@ -56,6 +57,19 @@ class RecordProperties(BaseModel):
     formats: list[dict[str, Any]] | None = None
 
 
+class RecordPropertiesResponse(RecordProperties):
+    """OGC Record properties returned by read endpoints.
+
+    All properties are optional so that sparse fieldsets (`fields`) can omit them. Routes returning this model
+    exclude unset fields from the response, so every property must be set explicitly when building it.
+
+    """
+
+    type: Literal["workflow", "notebook"] | None = None  # type: ignore[assignment]
+    title: str | None = None  # type: ignore[assignment]
+    description: str | None = None  # type: ignore[assignment]
+
+
 class RecordCreate(BaseModel):
     """Input for creating/registering a workflow record (OGC Feature structure)."""
 
@@ -69,6 +83,41 @@ class RecordCreate(BaseModel):
     links: list[LinkSchema] = Field(default_factory=list)
 
 
+class BatchMode(StrEnum):
+    """Enum representing whether a batch registration is all-or-nothing or registers the records it can."""
+
+    atomic = "atomic"
+    partial = "partial"
+
+
+class BatchItemStatus(StrEnum):
+    """Enum representing the outcome of one record of a batch registration."""
+
+    created = "created"
+    unchanged = "unchanged"
+    conflict = "conflict"
+    invalid = "invalid"
+    skipped = "skipped"
+
+
+class BatchItemResult(BaseModel):
+    """Outcome of one record of a batch registration, by position in the batch."""
+
+    index: int
+    id: str | None = None
+    status: BatchItemStatus
+    detail: str | None = None
+
+
+class BatchRegistrationResponse(BaseModel):
+    """Per-record report of a batch registration."""
+
+    created: int
+    unchanged: int
+    failed: int
+    items: list[BatchItemResult]
+
+
 class RecordResponse(BaseModel):
     """Full workflow record response (OGC Feature structure)."""
 
@@ -78,7 +127,7 @@ class RecordResponse(BaseModel):
     type: Literal["Feature"] = "Feature"
     geometry: dict[str, Any] | None = None
     conforms_to: list[str] = Field(default_factory=list, alias="conformsTo")
-    properties: RecordProperties
+    properties: RecordPropertiesResponse
     links: list[LinkSchema] = Field(default_factory=list)
 
 
@@ -89,18 +138,119 @@ class RecordSummary(BaseModel):
 
     id: str
     type: Literal["Feature"] = "Feature"
-    properties: RecordProperties
+    properties: RecordPropertiesResponse
+    links: list[LinkSchema] = Field(default_factory=list)
 
 
-class RecordFilterRequest(PaginationParams, FilterParams):
-    """Record filter params matching OGC query parameters."""
+class RecordFilterParams(BaseModel):
+    """Record filters matching OGC query parameters, shared by listings and facets."""
 
     model_config = ConfigDict(populate_by_name=True)
 
-    q: str | None = Field(default=None, description="Free text search")
+    q: str | None = Field(default=None, description="Full-text search over title, keywords and description.")
+    fuzzy: bool = Field(
+        default=False,
+        description="Match `q` against titles and keywords by trigram similarity, tolerating typos.",
+    )
+    bbox: str | None = Field(
+        default=None,
+        description="Bounding box `minx,miny,maxx,maxy` (WGS 84). Matches records whose geometry or spatial extent "
+        "intersects it.",
+    )
+    datetime_: str | None = Field(
+        default=None,
+        alias="datetime",
+        description="Instant (`2024-06-01T00:00:00Z`), closed interval (`2024-01-01T00:00:00Z/2024-12-31T23:59:59Z`) "
+        "or open interval (`../2024-12-31T23:59:59Z`, `2024-01-01T00:00:00Z/..`). Matches records whose temporal "
+        "extent intersects it.",
+    )
+    filter_: str | None = Field(
+        default=None,
+        alias="filter",
+        description="OGC CQL2 filter, e.g. `type = 'workflow' AND a_contains(keywords, ('ndvi'))`. Every branch "
+        "must include a predicate answered by an index, see `/collections/{catalogue_id}/queryables`.",
+    )
+    filter_lang: Literal["cql2-text", "cql2-json"] | None = Field(
+        default=None,
+        alias="filter-lang",
+        description="Encoding of `filter`. Detected from the filter when not given.",
+    )
     type: Literal["workflow", "notebook"] | None = Field(default=None, description="Record type filter")
-    applicable_collections: str | None = Field(default=None, alias="applicableCollections")
-    keywords: str | None = None
+    applicable_collections: str | None = Field(
+        default=None,
+        alias="applicableCollections",
+        description="Comma-separated STAC collection IDs, matched according to `collections_match`.",
+    )
+    collections_match: MatchMode = Field(
+        default=MatchMode.all,
+        description="Whether records must apply to `any` or `all` of the `applicableCollections`.",
+    )
+    keywords: str | None = Field(
+        default=None, description="Comma-separated keywords, matched according to `keywords_match`."
+    )
+    keywords_match: MatchMode = Field(
+        default=MatchMode.all, description="Whether records must have `any` or `all` of the `keywords`."
+    )
+
+    @property
+    def is_filtered(self) -> bool:
+        """Whether any record filter is set."""
+        return any((
+            self.q,
+            self.type,
+            self.applicable_collections,
+            self.keywords,
+            self.bbox,
+            self.datetime_,
+            self.filter_,
+        ))
+
+
+class RecordFilterRequest(PaginationParams, FilterParams, RecordFilterParams):
+    """Record listing params: the record filters, with pagination, ordering and the shape of the items."""
+
+    order_by: str | None = Field(
+        default=None,
+        description="Sort key: `created`, `updated`, `title`, or `relevance` to rank `q` matches. Defaults to newest "
+        "first.",
+    )
+    fields: str | None = Field(
+        default=None,
+        description="Comma-separated record properties to return, e.g. `title,type,keywords`. Defaults to all.",
+    )
+    include: str | None = Field(
+        default=None,
+        description="Comma-separated related entities to embed in each item: `contacts`, `links`.",
+    )
+    count: CountMode | None = Field(
+        default=None,
+        description="Count strategy. Defaults to `estimated` for unfiltered listings, `exact` otherwise.",
+    )
+
+
+class FacetsRequest(RecordFilterParams):
+    """Facet params: the record filters of listings and the number of values to return per facet."""
+
+    limit: int = Field(default=50, ge=1, le=1000, description="Maximum number of values per facet.")
+
+
+class FacetCount(BaseModel):
+    """Number of records with a given property value."""
+
+    value: str
+    count: int
+
+
+class FacetsResponse(BaseModel):
+    """Record counts per value of each faceted property, most frequent values first."""
+
+    model_config = ConfigDict(populate_by_name=True)
+
+    type: list[FacetCount] = Field(default_factory=list)
+    keywords: list[FacetCount] = Field(default_factory=list)
+    applicable_collections: list[FacetCount] = Field(default_factory=list, alias="applicableCollections")
+    application_type: list[FacetCount] = Field(default_factory=list, alias="application:type")
+    application_language: list[FacetCount] = Field(default_factory=list, alias="application:language")
 
 
 class ConceptSchema(BaseModel):
@@ -43,6 +43,60 @@ class DatabaseSettings(BaseModel):
         return f"postgresql://{self.user}:{self.password}@{self.host}:{self.port}/{self.name}"
 
 
+class ListingSettings(BaseModel):
+    """Record listing settings."""
+
+    # Planner estimates at or below this value are replaced by a capped exact count
+    exact_count_threshold: int = 1000
+    # Minimum trigram word similarity (0-1) for fuzzy search matches
+    fuzzy_similarity_threshold: float = 0.4
+    max_batch_size: int = 100
+    # Accept CQL2 filters that no index can answer (sequential scans)
+    allow_full_scan_filters: bool = False
+    # `Cache-Control` max-age (seconds) of records-by-collection lookups
+    collection_lookup_max_age: int = 60
+    # Render listing items in Postgres rather than from ORM rows
+    render_in_database: bool = True
+    # Records fetched per round trip by streaming exports
+    export_batch_size: int = 500
+
+
+class RegistrationSettings(BaseModel):
+    """Record registration settings."""
+
+    # Maximum number of records per batch registration
+    max_batch_size: int = 5000
+
+
+class CacheSettings(BaseModel):
+    """In-process response cache settings."""
+
+    # Seconds before cached responses expire; 0 disables caching
+    ttl: float = 30.0
+    # Maximum number of cached catalogue responses (catalogue list and details)
+    max_catalogue_entries: int = 64
+    # Maximum number of cached record listing pages
+    max_listing_entries: int = 1024
+    # Seconds before the cross-worker invalidation listener reconnects after losing its connection
+    listener_reconnect_delay: float = 5.0
+    # Seconds between checks of the invalidation listener connection
+    listener_keepalive: float = 30.0
+    # Maximum number of cached compressed response bodies
+    max_encoded_entries: int = 1024
+
+
+class CompressionSettings(BaseModel):
+    """Response compression settings."""
+
+    enabled: bool = True
+    # Smaller response bodies (bytes) are sent uncompressed
+    min_size: int = 1024
+    # Compression levels: gzip 1-9, brotli 0-11, zstd 1-22
+    gzip_level: int = 6
+    brotli_level: int = 5
+    zstd_level: int = 3
+
+
 class OAuth2Settings(BaseModel):
     """OAuth2 settings."""
 
@@ -101,6 +155,10 @@ class Settings(BaseSettings):
 
     environment: str = "local"
     db: DatabaseSettings = DatabaseSettings()
+    listing: ListingSettings = ListingSettings()
+    cache: CacheSettings = CacheSettings()
+    registration: RegistrationSettings = RegistrationSettings()
+    compression: CompressionSettings = CompressionSettings()
     eodh: EODHSettings | None = None
     model_config = SettingsConfigDict(
         env_file=consts.directories.ROOT_DIR / ".env",
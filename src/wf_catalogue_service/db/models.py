@@ -6,10 +6,45 @@ import enum
 from datetime import datetime
 from typing import Any
 
-from sqlalchemy import CheckConstraint, DateTime, Enum, ForeignKey, Index, Integer, Text
-from sqlalchemy.dialects.postgresql import ARRAY, JSONB
+from sqlalchemy import (
+    DDL,
+    CheckConstraint,
+    Computed,
+    DateTime,
+    Enum,
+    Float,
+    ForeignKey,
+    Index,
+    Integer,
+    LargeBinary,
+    Text,
+    event,
+    text,
+)
+from sqlalchemy.dialects.postgresql import ARRAY, JSONB, TSTZRANGE, TSVECTOR, Range
 from sqlalchemy.orm import DeclarativeBase, Mapped, mapped_column, relationship
 
+# Text search configuration used for the records full-text index and queries
+SEARCH_CONFIG = "english"
+
+# `array_to_string` is only STABLE, so an IMMUTABLE wrapper is needed to use it in generated columns and indexes
+IMMUTABLE_ARRAY_TO_STRING_DDL = """
+CREATE OR REPLACE FUNCTION immutable_array_to_string(text[], text) RETURNS text
+LANGUAGE sql IMMUTABLE PARALLEL SAFE AS $$ SELECT array_to_string($1, $2) $$
+"""
+
+# Space-separated keywords, as used by the search vector and the keywords trigram index
+RECORD_KEYWORDS_TEXT_EXPRESSION = "immutable_array_to_string(keywords, ' ')"
+
+RECORD_SEARCH_VECTOR_EXPRESSION = (
+    f"setweight(to_tsvector('{SEARCH_CONFIG}', title), 'A') || "
+    f"setweight(to_tsvector('{SEARCH_CONFIG}', {RECORD_KEYWORDS_TEXT_EXPRESSION}), 'B') || "
+    f"setweight(to_tsvector('{SEARCH_CONFIG}', description), 'C')"
+)
+
+# Bounding box of the record's geometry and spatial extent, as indexed for `&&` (overlap) queries
+RECORD_BBOX_EXPRESSION = "box(point(bbox_minx, bbox_miny), point(bbox_maxx, bbox_maxy))"
+
 
 class RecordType(enum.Enum):
     """Record type enum."""
@@ -22,6 +57,10 @@ class Base(DeclarativeBase):
     """Base class for all models."""
 
 
+event.listen(Base.metadata, "before_create", DDL("CREATE EXTENSION IF NOT EXISTS pg_trgm"))
+event.listen(Base.metadata, "before_create", DDL(IMMUTABLE_ARRAY_TO_STRING_DDL))
+
+
 class Catalogue(Base):
     """Catalogue model - top-level catalogue metadata."""
 
@@ -38,6 +77,9 @@ class Catalogue(Base):
     updated: Mapped[datetime] = mapped_column(DateTime(timezone=True), nullable=False, default=datetime.utcnow)
     license: Mapped[str | None] = mapped_column(Text)
     conforms_to: Mapped[list[str] | None] = mapped_column(ARRAY(Text))
+    # Incremented, and `records_modified` set, by every record registration or deletion (listing validators)
+    records_revision: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+    records_modified: Mapped[datetime | None] = mapped_column(DateTime(timezone=True))
 
     records: Mapped[list[Record]] = relationship(back_populates="catalogue", cascade="all, delete-orphan")
     themes: Mapped[list[Theme]] = relationship(back_populates="catalogue", cascade="all, delete-orphan")
@@ -70,6 +112,21 @@ class Record(Base):
     # Notebook-specific
     jupyter_kernel_info: Mapped[dict[str, Any] | None] = mapped_column(JSONB)
     formats: Mapped[dict[str, Any] | None] = mapped_column(JSONB)
+    # Bounding box of geometry and extent, derived on registration
+    bbox_minx: Mapped[float | None] = mapped_column(Float)
+    bbox_miny: Mapped[float | None] = mapped_column(Float)
+    bbox_maxx: Mapped[float | None] = mapped_column(Float)
+    bbox_maxy: Mapped[float | None] = mapped_column(Float)
+    # Time range covering the extent's temporal intervals, derived on registration
+    temporal_extent: Mapped[Range[datetime] | None] = mapped_column(TSTZRANGE)
+    # JSON document of the full record as returned by read endpoints, rendered on registration
+    rendered: Mapped[bytes | None] = mapped_column(LargeBinary, deferred=True)
+    # Hash of the canonical registered payload, to skip writes of unchanged records
+    content_hash: Mapped[str | None] = mapped_column(Text, deferred=True)
+    # Full-text search document, maintained by Postgres
+    search_vector: Mapped[str | None] = mapped_column(
+        TSVECTOR, Computed(RECORD_SEARCH_VECTOR_EXPRESSION, persisted=True), deferred=True
+    )
 
     catalogue: Mapped[Catalogue | None] = relationship(back_populates="records")
 
@@ -77,9 +134,48 @@ class Record(Base):
         Index("idx_records_catalogue", "catalogue_id"),
         Index("idx_records_type", "type"),
         Index("idx_records_keywords", "keywords", postgresql_using="gin"),
+        Index("idx_records_applicable_collections", "applicable_collections", postgresql_using="gin"),
+        # Keyset pagination: (sort key, id) within a catalogue
+        Index("idx_records_catalogue_created", "catalogue_id", "created", "id"),
+        Index("idx_records_catalogue_updated", "catalogue_id", "updated", "id"),
+        Index("idx_records_catalogue_title", "catalogue_id", "title", "id"),
+        Index("idx_records_search_vector", "search_vector", postgresql_using="gin"),
+        # Fuzzy (trigram) search
+        Index("idx_records_title_trgm", "title", postgresql_using="gin", postgresql_ops={"title": "gin_trgm_ops"}),
+        Index(
+            "idx_records_keywords_trgm",
+            text(f"({RECORD_KEYWORDS_TEXT_EXPRESSION}) gin_trgm_ops"),
+            postgresql_using="gin",
+        ),
+        # Spatial (bbox) filter
+        Index("idx_records_bbox", text(f"({RECORD_BBOX_EXPRESSION})"), postgresql_using="gist"),
+        # Temporal (datetime) filter
+        Index("idx_records_temporal_extent", "temporal_extent", postgresql_using="gist"),
     )
 
 
+class RecordCollection(Base):
+    """Record collection model - hashed index of the STAC collections a record applies to."""
+
+    __tablename__ = "record_collections"
+
+    collection_key: Mapped[str] = mapped_column(Text, primary_key=True)
+    record_id: Mapped[str] = mapped_column(Text, ForeignKey("records.id", ondelete="CASCADE"), primary_key=True)
+
+    __table_args__ = (Index("idx_record_collections_record", "record_id"),)
+
+
+class FacetSummary(Base):
+    """Facet summary model - number of records per property value in a catalogue, maintained on registration."""
+
+    __tablename__ = "facet_summaries"
+
+    catalogue_id: Mapped[str] = mapped_column(Text, ForeignKey("catalogues.id", ondelete="CASCADE"), primary_key=True)
+    facet: Mapped[str] = mapped_column(Text, primary_key=True)
+    value: Mapped[str] = mapped_column(Text, primary_key=True)
+    count: Mapped[int] = mapped_column(Integer, nullable=False)
+
+
 class Contact(Base):
     """Contact model - contact information for entities (catalogue or record)."""
 
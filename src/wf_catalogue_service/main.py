@@ -2,16 +2,37 @@
 
 from __future__ import annotations
 
+from contextlib import asynccontextmanager
+from typing import TYPE_CHECKING
+
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 
+from wf_catalogue_service.api.common.compression import CompressionMiddleware
 from wf_catalogue_service.api.health.routes import health_router
+from wf_catalogue_service.api.v1.workflows.caches import InvalidationListener
 from wf_catalogue_service.api.v1.workflows.routes import register_router, workflow_router
 from wf_catalogue_service.core.settings import current_settings
 
+if TYPE_CHECKING:
+    from collections.abc import AsyncGenerator
+
 settings = current_settings()
 
 
+@asynccontextmanager
+async def lifespan(_app: FastAPI) -> AsyncGenerator[None]:
+    """Run the cache invalidation listener for the lifetime of the worker."""
+    listener = InvalidationListener(
+        settings.db.sync_url,
+        reconnect_delay=settings.cache.listener_reconnect_delay,
+        keepalive=settings.cache.listener_keepalive,
+    )
+    listener.start()
+    yield
+    await listener.stop()
+
+
 def create_api_v1(parent_app: FastAPI) -> FastAPI:
     """Create and register API v1 sub-application."""
     sub_app = FastAPI(
@@ -24,6 +45,7 @@ def create_api_v1(parent_app: FastAPI) -> FastAPI:
     sub_app.include_router(health_router)
     sub_app.include_router(workflow_router)
     sub_app.include_router(register_router)
+    sub_app.add_middleware(CompressionMiddleware)
     parent_app.mount("/api/v1.0", sub_app)
     return sub_app
 
@@ -34,6 +56,7 @@ app = FastAPI(
     description="Workflow Catalogue Service API.",
     docs_url=None,
     debug=settings.environment.lower() in {"local", "dev"},
+    lifespan=lifespan,
 )
 
 app_v1 = create_api_v1(app)
@@ -18,3 +18,14 @@ async def test_health_returns_ok(client: AsyncClient) -> None:
 
     assert response.status_code == status.HTTP_200_OK
     assert response.json() == {"status": "ok"}
+
+
+@pytest.mark.asyncio
+async def test_metrics_report_compression_savings(client: AsyncClient) -> None:
+    """Test that the metrics endpoint reports the bytes saved by response compression."""
+    response = await client.get("/metrics")
+
+    assert response.status_code == status.HTTP_200_OK
+    compression = response.json()["compression"]
+    assert compression["bytes_out"] <= compression["bytes_in"]
+    assert 0 <= compression["saved_ratio"] < 1
@@ -2,15 +2,43 @@
 
 from __future__ import annotations
 
-from typing import TYPE_CHECKING
+import copy
+import json
+from typing import TYPE_CHECKING, Any
 
 import pytest
+from sqlalchemy import update
 from starlette import status
 
+from wf_catalogue_service.api.v1.workflows import rendering
+from wf_catalogue_service.api.v1.workflows.caches import clear_caches
+from wf_catalogue_service.api.v1.workflows.routes import settings
+from wf_catalogue_service.db.models import Contact, Record
+from wf_catalogue_service.main import app_v1
+
 if TYPE_CHECKING:
     from httpx import AsyncClient
+    from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
 
 CATALOGUE_ID = "eodh-workflows-notebooks"
+AUTH_HEADER = {"Authorization": "Bearer test-token"}
+
+
+async def _register_many(client: AsyncClient, workflow_json: Any, count: int) -> list[str]:
+    """Register `count` copies of the workflow fixture with distinct IDs."""
+    ids = []
+    for i in range(count):
+        payload = copy.deepcopy(workflow_json)
+        payload["id"] = f"{workflow_json['id']}-{i:03d}"
+        payload["properties"]["title"] = f"Workflow {i:03d}"
+        response = await client.post("/register", json=payload, headers=AUTH_HEADER)
+        assert response.status_code == status.HTTP_201_CREATED
+        ids.append(payload["id"])
+    return ids
+
+
+def _link(data: dict[str, Any], rel: str) -> str | None:
+    return next((link["href"] for link in data["links"] if link["rel"] == rel), None)
 
 
 @pytest.mark.asyncio
@@ -63,3 +91,805 @@ async def test_get_item_not_found(client: AsyncClient) -> None:
     response = await client.get(f"/collections/{CATALOGUE_ID}/items/unknown-record")
 
     assert response.status_code == status.HTTP_404_NOT_FOUND
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize(
+    "params",
+    [
+        {"order_by": "created", "order_direction": "asc"},
+        {"order_by": "updated", "order_direction": "desc"},
+        {"order_by": "title", "order_direction": "asc"},
+        {"order_by": "title", "order_direction": "desc"},
+        {"q": "workflow", "order_by": "relevance"},
+        {"q": "workflow", "fuzzy": "true"},
+    ],
+)
+async def test_get_items_cursor_pagination_walks_all_records(
+    client: AsyncClient, workflow_json: Any, params: dict[str, str]
+) -> None:
+    """Test that following `next` links visits every record exactly once, in order, for every sort key."""
+    await _register_many(client, workflow_json, 7)
+    expected = [
+        item["id"]
+        for item in (await client.get(f"/collections/{CATALOGUE_ID}/items", params=params | {"page_size": 50})).json()[
+            "items"
+        ]
+    ]
+
+    seen: list[str] = []
+    response = await client.get(f"/collections/{CATALOGUE_ID}/items", params=params | {"page_size": 3})
+    while True:
+        assert response.status_code == status.HTTP_200_OK
+        data = response.json()
+        seen.extend(item["id"] for item in data["items"])
+        next_href = _link(data, "next")
+        if next_href is None:
+            break
+        response = await client.get(next_href)
+
+    assert seen == expected
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize(
+    "params",
+    [
+        {"order_by": "temporal_extent"},
+        {"order_by": "rendered"},
+        {"order_by": "content_hash"},
+        {"order_by": "search_vector"},
+        {"order_by": "bbox_minx"},
+        {"order_by": "unknown"},
+        {"order_by": "relevance"},
+    ],
+)
+async def test_get_items_unsortable_key_returns_400(client: AsyncClient, params: dict[str, str]) -> None:
+    """Test that listings can only be ordered by keys whose values round-trip through cursors."""
+    response = await client.get(f"/collections/{CATALOGUE_ID}/items", params=params)
+
+    assert response.status_code == status.HTTP_400_BAD_REQUEST
+
+
+@pytest.mark.asyncio
+async def test_get_items_cursor_prev_link_returns_previous_page(client: AsyncClient, workflow_json: Any) -> None:
+    """Test that the `prev` link of the second page returns the first page."""
+    await _register_many(client, workflow_json, 5)
+    first = (await client.get(f"/collections/{CATALOGUE_ID}/items", params={"page_size": 2})).json()
+    assert _link(first, "prev") is None
+
+    second = (await client.get(_link(first, "next"))).json()
+    previous = (await client.get(_link(second, "prev"))).json()
+
+    assert [item["id"] for item in previous["items"]] == [item["id"] for item in first["items"]]
+    assert _link(previous, "prev") is None
+
+
+@pytest.mark.asyncio
+async def test_get_items_invalid_cursor_returns_400(client: AsyncClient) -> None:
+    """Test that a malformed cursor is rejected."""
+    response = await client.get(f"/collections/{CATALOGUE_ID}/items", params={"cursor": "not-a-cursor"})
+
+    assert response.status_code == status.HTTP_400_BAD_REQUEST
+
+
+@pytest.mark.asyncio
+async def test_get_items_count_none_skips_totals(client: AsyncClient, workflow_json: Any) -> None:
+    """Test that count=none returns only the has-more flag."""
+    await _register_many(client, workflow_json, 3)
+
+    response = await client.get(f"/collections/{CATALOGUE_ID}/items", params={"count": "none", "page_size": 2})
+
+    assert response.status_code == status.HTTP_200_OK
+    data = response.json()
+    assert data["count"] == "none"
+    assert data["total_items"] is None
+    assert data["total_pages"] is None
+    assert data["has_more"] is True
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("count", ["exact", "estimated"])
+async def test_get_items_count_modes_on_small_catalogue(client: AsyncClient, workflow_json: Any, count: str) -> None:
+    """Test that exact and estimated counts agree on a catalogue below the exact count threshold."""
+    await _register_many(client, workflow_json, 3)
+
+    response = await client.get(f"/collections/{CATALOGUE_ID}/items", params={"count": count, "page_size": 2})
+
+    data = response.json()
+    assert data["count"] == count
+    assert data["total_items"] == 3  # noqa: PLR2004
+    assert data["total_pages"] == 2  # noqa: PLR2004
+
+
+@pytest.mark.asyncio
+async def test_get_items_default_count_mode(client: AsyncClient) -> None:
+    """Test that unfiltered listings are estimated and filtered listings are counted exactly."""
+    unfiltered = (await client.get(f"/collections/{CATALOGUE_ID}/items")).json()
+    filtered = (await client.get(f"/collections/{CATALOGUE_ID}/items", params={"type": "workflow"})).json()
+
+    assert unfiltered["count"] == "estimated"
+    assert filtered["count"] == "exact"
+
+
+@pytest.mark.asyncio
+async def test_get_items_full_text_search_matches_stemmed_terms(client: AsyncClient, workflow_json: Any) -> None:
+    """Test that `q` matches word forms across title, keywords and description."""
+    await client.post("/register", json=workflow_json, headers=AUTH_HEADER)
+
+    for q, expected in (("calculations", 1), ("vegetation", 1), ("sentinel2", 1), ("ocean", 0)):
+        response = await client.get(f"/collections/{CATALOGUE_ID}/items", params={"q": q})
+        assert response.status_code == status.HTTP_200_OK
+        assert response.json()["total_items"] == expected, q
+
+
+@pytest.mark.asyncio
+async def test_get_items_order_by_relevance(client: AsyncClient, workflow_json: Any) -> None:
+    """Test that relevance ordering ranks title matches above description matches."""
+    weak = copy.deepcopy(workflow_json)
+    weak["id"] = "weak-match"
+    weak["properties"].update(
+        title="Cloud masking", keywords=["clouds"], description="Optionally computes water index."
+    )
+    strong = copy.deepcopy(workflow_json)
+    strong["id"] = "strong-match"
+    strong["properties"].update(title="Water index", keywords=["water"], description="Water index for lakes.")
+    for payload in (weak, strong):
+        await client.post("/register", json=payload, headers=AUTH_HEADER)
+
+    response = await client.get(
+        f"/collections/{CATALOGUE_ID}/items", params={"q": "water index", "order_by": "relevance", "page_size": 1}
+    )
+
+    data = response.json()
+    assert [item["id"] for item in data["items"]] == ["strong-match"]
+    next_page = (await client.get(_link(data, "next"))).json()
+    assert [item["id"] for item in next_page["items"]] == ["weak-match"]
+
+
+@pytest.mark.asyncio
+async def test_get_items_sparse_fields(client: AsyncClient, workflow_json: Any) -> None:
+    """Test that `fields` limits list item properties to the selected ones."""
+    await client.post("/register", json=workflow_json, headers=AUTH_HEADER)
+
+    response = await client.get(
+        f"/collections/{CATALOGUE_ID}/items", params={"fields": "title,type,keywords,applicableCollections"}
+    )
+
+    assert response.status_code == status.HTTP_200_OK
+    item = response.json()["items"][0]
+    assert item["id"] == workflow_json["id"]
+    assert set(item["properties"]) == {"title", "type", "keywords", "applicableCollections"}
+
+
+@pytest.mark.asyncio
+async def test_get_items_without_fields_returns_all_properties(client: AsyncClient, workflow_json: Any) -> None:
+    """Test that listings without `fields` keep returning every property, including nulls."""
+    await client.post("/register", json=workflow_json, headers=AUTH_HEADER)
+
+    properties = (await client.get(f"/collections/{CATALOGUE_ID}/items")).json()["items"][0]["properties"]
+
+    assert properties["contacts"] == []
+    assert properties["formats"] is None
+    assert properties["application:type"] == "cwl"
+
+
+@pytest.mark.asyncio
+async def test_get_item_sparse_fields(client: AsyncClient, workflow_json: Any) -> None:
+    """Test that `fields` on a single record keeps links but only returns selected properties."""
+    await client.post("/register", json=workflow_json, headers=AUTH_HEADER)
+
+    response = await client.get(
+        f"/collections/{CATALOGUE_ID}/items/{workflow_json['id']}", params={"fields": "title,contacts"}
+    )
+
+    data = response.json()
+    assert set(data["properties"]) == {"title", "contacts"}
+    assert data["properties"]["contacts"][0]["name"] == "EODH Platform Team"
+    assert data["links"][0]["rel"] == "self"
+
+
+@pytest.mark.asyncio
+async def test_get_items_unknown_field_returns_400(client: AsyncClient) -> None:
+    """Test that unknown fields are rejected."""
+    response = await client.get(f"/collections/{CATALOGUE_ID}/items", params={"fields": "title,bogus"})
+
+    assert response.status_code == status.HTTP_400_BAD_REQUEST
+
+
+@pytest.mark.asyncio
+async def test_get_item_single_round_trip(
+    client: AsyncClient, workflow_json: Any, executed_statements: list[str]
+) -> None:
+    """Test that a record is fetched with its contacts and links in one statement."""
+    await client.post("/register", json=workflow_json, headers=AUTH_HEADER)
+    executed_statements.clear()
+
+    response = await client.get(f"/collections/{CATALOGUE_ID}/items/{workflow_json['id']}")
+
+    data = response.json()
+    assert data["properties"]["contacts"] == [
+        {"name": "EODH Platform Team", "organization": "EO DataHub", "roles": ["author"], "links": []}
+    ]
+    assert [link["href"] for link in data["links"]] == [link["href"] for link in workflow_json["links"]]
+    assert len(executed_statements) == 1
+
+
+@pytest.mark.asyncio
+async def test_get_item_without_stored_document_keeps_contact_shape(
+    client: AsyncClient, workflow_json: Any, session_factory: async_sessionmaker[AsyncSession]
+) -> None:
+    """Test that records read from their rows have the same contacts as registered ones, with empty links."""
+    registered = (await client.post("/register", json=workflow_json, headers=AUTH_HEADER)).json()
+    async with session_factory() as session:
+        await session.execute(update(Record).where(Record.id == workflow_json["id"]).values(rendered=None))
+        await session.commit()
+
+    response = await client.get(f"/collections/{CATALOGUE_ID}/items/{workflow_json['id']}")
+
+    assert response.json()["properties"]["contacts"] == registered["properties"]["contacts"]
+    assert response.json()["properties"]["contacts"][0]["links"] == []
+
+
+@pytest.mark.asyncio
+async def test_get_catalogue_contacts_have_links(
+    client: AsyncClient, session_factory: async_sessionmaker[AsyncSession]
+) -> None:
+    """Test that catalogue contacts are returned with their (empty) links."""
+    async with session_factory() as session:
+        session.add(Contact(id="c1", entity_id=CATALOGUE_ID, entity_type="catalogue", name="EODH", roles=["host"]))
+        await session.commit()
+
+    response = await client.get(f"/collections/{CATALOGUE_ID}")
+
+    assert response.json()["contacts"] == [{"name": "EODH", "organization": None, "roles": ["host"], "links": []}]
+
+
+@pytest.mark.asyncio
+async def test_get_catalogue_single_round_trip(client: AsyncClient, executed_statements: list[str]) -> None:
+    """Test that a catalogue is fetched with its themes, contacts and links in one statement."""
+    response = await client.get(f"/collections/{CATALOGUE_ID}")
+
+    assert response.status_code == status.HTTP_200_OK
+    assert response.json()["themes"] == []
+    assert len(executed_statements) == 1
+
+
+@pytest.mark.asyncio
+async def test_get_items_batch_returns_full_records_in_order(client: AsyncClient, workflow_json: Any) -> None:
+    """Test that the batch endpoint returns full records in request order, skipping unknown IDs."""
+    ids = await _register_many(client, workflow_json, 3)
+    requested = [ids[2], "unknown-record", ids[0]]
+
+    response = await client.get(f"/collections/{CATALOGUE_ID}/batch", params={"ids": ",".join(requested)})
+
+    assert response.status_code == status.HTTP_200_OK
+    data = response.json()
+    assert [record["id"] for record in data] == [ids[2], ids[0]]
+    for record in data:
+        assert record["properties"]["contacts"][0]["name"] == "EODH Platform Team"
+        assert record["links"][0]["rel"] == "self"
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("batch_size", [1, 20])
+@pytest.mark.parametrize(("fields", "statements"), [(None, 1), ("title,contacts", 3)])
+async def test_get_items_batch_constant_query_count(
+    client: AsyncClient,
+    workflow_json: Any,
+    executed_statements: list[str],
+    batch_size: int,
+    fields: str | None,
+    statements: int,
+) -> None:
+    """Test that the number of statements does not depend on the batch size."""
+    ids = await _register_many(client, workflow_json, batch_size)
+    executed_statements.clear()
+
+    response = await client.get(
+        f"/collections/{CATALOGUE_ID}/batch", params={"ids": ",".join(ids), **({"fields": fields} if fields else {})}
+    )
+
+    assert len(response.json()) == batch_size
+    assert len(executed_statements) == statements
+
+
+@pytest.mark.asyncio
+async def test_get_items_batch_too_large_returns_400(client: AsyncClient) -> None:
+    """Test that batches above the configured maximum are rejected."""
+    ids = ",".join(f"record-{i}" for i in range(1000))
+
+    response = await client.get(f"/collections/{CATALOGUE_ID}/batch", params={"ids": ids})
+
+    assert response.status_code == status.HTTP_400_BAD_REQUEST
+
+
+@pytest.mark.asyncio
+async def test_get_items_include_contacts_and_links(client: AsyncClient, workflow_json: Any) -> None:
+    """Test that `include` embeds each record's contacts and links in the listing."""
+    await _register_many(client, workflow_json, 2)
+
+    response = await client.get(f"/collections/{CATALOGUE_ID}/items", params={"include": "contacts,links"})
+
+    assert response.status_code == status.HTTP_200_OK
+    for item in response.json()["items"]:
+        assert item["properties"]["contacts"][0]["name"] == "EODH Platform Team"
+        assert [link["href"] for link in item["links"]] == [link["href"] for link in workflow_json["links"]]
+
+
+@pytest.mark.asyncio
+async def test_get_items_without_include_omits_links(client: AsyncClient, workflow_json: Any) -> None:
+    """Test that listings stay lean unless related rows are requested."""
+    await _register_many(client, workflow_json, 1)
+
+    response = await client.get(f"/collections/{CATALOGUE_ID}/items")
+
+    item = response.json()["items"][0]
+    assert "links" not in item
+    assert item["properties"]["contacts"] == []
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("page_size", [1, 20])
+@pytest.mark.parametrize(("render_in_database", "statements"), [(True, 1), (False, 3)])
+async def test_get_items_include_constant_query_count(
+    client: AsyncClient,
+    workflow_json: Any,
+    executed_statements: list[str],
+    monkeypatch: pytest.MonkeyPatch,
+    page_size: int,
+    render_in_database: bool,  # noqa: FBT001
+    statements: int,
+) -> None:
+    """Test that embedding related rows costs at most one statement per related table, whatever the page size."""
+    monkeypatch.setattr(settings.listing, "render_in_database", render_in_database)
+    await _register_many(client, workflow_json, page_size)
+    executed_statements.clear()
+
+    response = await client.get(
+        f"/collections/{CATALOGUE_ID}/items",
+        params={"include": "contacts,links", "page_size": page_size, "count": "none"},
+    )
+
+    assert len(response.json()["items"]) == page_size
+    assert len(executed_statements) == statements
+
+
+@pytest.mark.asyncio
+async def test_get_items_unknown_include_returns_400(client: AsyncClient) -> None:
+    """Test that only contacts and links can be included."""
+    response = await client.get(f"/collections/{CATALOGUE_ID}/items", params={"include": "themes"})
+
+    assert response.status_code == status.HTTP_400_BAD_REQUEST
+
+
+async def _register_applicable(
+    client: AsyncClient, workflow_json: Any, record_id: str, collections: list[str], keywords: list[str]
+) -> None:
+    properties = {**workflow_json["properties"], "applicableCollections": collections, "keywords": keywords}
+    await client.post(
+        "/register", json={**workflow_json, "id": record_id, "properties": properties}, headers=AUTH_HEADER
+    )
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize(
+    ("params", "expected"),
+    [
+        ({"applicableCollections": "sentinel2-l2a"}, {"s2", "s1-s2"}),
+        ({"applicableCollections": "sentinel1-grd,sentinel2-l2a"}, {"s1-s2"}),
+        ({"applicableCollections": "sentinel1-grd,sentinel2-l2a", "collections_match": "any"}, {"s1", "s2", "s1-s2"}),
+        ({"applicableCollections": "landsat-c2,dem", "collections_match": "any"}, set()),
+        ({"keywords": "sar,flood"}, {"s1"}),
+        ({"keywords": "ndvi,flood", "keywords_match": "any"}, {"s1", "s2"}),
+    ],
+)
+async def test_get_items_multi_value_filters(
+    client: AsyncClient, workflow_json: Any, params: Any, expected: Any
+) -> None:
+    """Test that collections and keywords filters take several values with any/all semantics."""
+    await _register_applicable(client, workflow_json, "s1", ["sentinel1-grd"], ["sar", "flood"])
+    await _register_applicable(client, workflow_json, "s2", ["sentinel2-l2a"], ["ndvi"])
+    await _register_applicable(client, workflow_json, "s1-s2", ["sentinel1-grd", "sentinel2-l2a"], ["fusion"])
+
+    response = await client.get(f"/collections/{CATALOGUE_ID}/items", params=params)
+
+    assert response.status_code == status.HTTP_200_OK
+    assert {item["id"] for item in response.json()["items"]} == expected
+
+
+S2_COLLECTION_URL = "https://example.com/stac/collections/sentinel2_ard"
+
+
+@pytest.mark.asyncio
+async def test_get_items_by_collection(client: AsyncClient, workflow_json: Any) -> None:
+    """Test that records are looked up by normalized collection URL, newest first."""
+    await _register_applicable(client, workflow_json, "s2", [S2_COLLECTION_URL], [])
+    await _register_applicable(client, workflow_json, "s1-s2", ["sentinel1_grd", f"{S2_COLLECTION_URL}/"], [])
+    await _register_applicable(client, workflow_json, "s1", ["sentinel1_grd"], [])
+
+    response = await client.get(f"/collections/{CATALOGUE_ID}/by-collection", params={"collection": S2_COLLECTION_URL})
+
+    assert response.status_code == status.HTTP_200_OK
+    assert response.headers["cache-control"].startswith("public, max-age=")
+    assert sorted(item["id"] for item in response.json()) == ["s1-s2", "s2"]
+
+
+@pytest.mark.asyncio
+async def test_get_items_by_collection_after_delete(client: AsyncClient, workflow_json: Any) -> None:
+    """Test that deleted records are removed from the collection index."""
+    await _register_applicable(client, workflow_json, "s2", [S2_COLLECTION_URL], [])
+    await client.delete("/register/s2", headers=AUTH_HEADER)
+
+    response = await client.get(f"/collections/{CATALOGUE_ID}/by-collection", params={"collection": S2_COLLECTION_URL})
+
+    assert response.json() == []
+
+
+@pytest.mark.asyncio
+async def test_get_items_by_collection_single_index_lookup(
+    client: AsyncClient, workflow_json: Any, executed_statements: list[str]
+) -> None:
+    """Test that the lookup is one statement over the collection index, not the applicable collections arrays."""
+    await _register_applicable(client, workflow_json, "s2", [S2_COLLECTION_URL], [])
+    executed_statements.clear()
+
+    await client.get(f"/collections/{CATALOGUE_ID}/by-collection", params={"collection": S2_COLLECTION_URL})
+
+    assert len(executed_statements) == 1
+    assert "record_collections" in executed_statements[0]
+    assert "applicable_collections @>" not in executed_statements[0]
+
+
+def _facet_values(facets: list[dict[str, Any]]) -> dict[str, int]:
+    return {facet["value"]: facet["count"] for facet in facets}
+
+
+@pytest.mark.asyncio
+async def test_get_facets_counts_catalogue(client: AsyncClient, workflow_json: Any) -> None:
+    """Test that unfiltered facets count every record of the catalogue, most frequent values first."""
+    await _register_applicable(client, workflow_json, "s1", ["sentinel1-grd"], ["sar", "flood"])
+    await _register_applicable(client, workflow_json, "s2", ["sentinel2-l2a"], ["ndvi", "flood"])
+
+    response = await client.get(f"/collections/{CATALOGUE_ID}/facets")
+
+    assert response.status_code == status.HTTP_200_OK
+    data = response.json()
+    assert _facet_values(data["type"]) == {"workflow": 2}
+    assert data["keywords"][0] == {"value": "flood", "count": 2}
+    assert _facet_values(data["keywords"]) == {"flood": 2, "sar": 1, "ndvi": 1}
+    assert _facet_values(data["applicableCollections"]) == {"sentinel1-grd": 1, "sentinel2-l2a": 1}
+    assert _facet_values(data["application:type"]) == {"cwl": 2}
+    assert _facet_values(data["application:language"]) == {"CWL": 2}
+
+
+@pytest.mark.asyncio
+async def test_get_facets_filtered(client: AsyncClient, workflow_json: Any) -> None:
+    """Test that filtered facets only count the matching records."""
+    await _register_applicable(client, workflow_json, "s1", ["sentinel1-grd"], ["sar", "flood"])
+    await _register_applicable(client, workflow_json, "s2", ["sentinel2-l2a"], ["ndvi", "flood"])
+
+    response = await client.get(f"/collections/{CATALOGUE_ID}/facets", params={"keywords": "sar"})
+
+    assert response.status_code == status.HTTP_200_OK
+    data = response.json()
+    assert _facet_values(data["keywords"]) == {"flood": 1, "sar": 1}
+    assert _facet_values(data["applicableCollections"]) == {"sentinel1-grd": 1}
+
+
+@pytest.mark.asyncio
+async def test_get_facets_limit(client: AsyncClient, workflow_json: Any) -> None:
+    """Test that facets are truncated to the most frequent values."""
+    await _register_applicable(client, workflow_json, "s1", ["sentinel1-grd"], ["sar", "flood"])
+    await _register_applicable(client, workflow_json, "s2", ["sentinel2-l2a"], ["ndvi", "flood"])
+
+    response = await client.get(f"/collections/{CATALOGUE_ID}/facets", params={"limit": 1})
+
+    assert response.json()["keywords"] == [{"value": "flood", "count": 2}]
+
+
+@pytest.mark.asyncio
+async def test_get_facets_summary_matches_aggregation(client: AsyncClient, workflow_json: Any) -> None:
+    """Test that the maintained summary equals a full aggregation, including after deletes."""
+    await _register_applicable(client, workflow_json, "s1", ["sentinel1-grd"], ["sar", "flood"])
+    await _register_applicable(client, workflow_json, "s2", ["sentinel2-l2a"], ["ndvi", "flood"])
+    await _register_applicable(client, workflow_json, "s1-s2", ["sentinel1-grd", "sentinel2-l2a"], ["flood"])
+    await client.delete("/register/s1", headers=AUTH_HEADER)
+
+    summary = (await client.get(f"/collections/{CATALOGUE_ID}/facets")).json()
+    aggregated = (await client.get(f"/collections/{CATALOGUE_ID}/facets", params={"type": "workflow"})).json()
+
+    assert summary == aggregated
+    assert "sar" not in _facet_values(summary["keywords"])
+    assert _facet_values(summary["applicableCollections"]) == {"sentinel1-grd": 1, "sentinel2-l2a": 2}
+
+
+@pytest.mark.asyncio
+async def test_get_facets_count_repeated_values_once(client: AsyncClient, workflow_json: Any) -> None:
+    """Test that filtered and unfiltered facets count a record once per value, even if it repeats the value."""
+    await _register_applicable(client, workflow_json, "s1", ["sentinel1-grd", "sentinel1-grd"], ["flood", "flood"])
+
+    summary = (await client.get(f"/collections/{CATALOGUE_ID}/facets")).json()
+    aggregated = (await client.get(f"/collections/{CATALOGUE_ID}/facets", params={"type": "workflow"})).json()
+
+    assert summary == aggregated
+    assert _facet_values(aggregated["keywords"]) == {"flood": 1}
+    assert _facet_values(aggregated["applicableCollections"]) == {"sentinel1-grd": 1}
+
+
+def test_get_facets_documents_only_supported_params() -> None:
+    """Test that facets document the record filters and limit, but not the listing's paging, ordering or shape."""
+    operation = app_v1.openapi()["paths"]["/collections/{catalogue_id}/facets"]["get"]
+
+    params = {param["name"] for param in operation["parameters"]}
+
+    assert {"q", "type", "keywords", "filter", "limit"} <= params
+    assert not params & {"page", "page_size", "cursor", "order_by", "order_direction", "count", "fields", "include"}
+
+
+@pytest.mark.asyncio
+async def test_get_facets_unfiltered_reads_summary(
+    client: AsyncClient, workflow_json: Any, executed_statements: list[str]
+) -> None:
+    """Test that unfiltered facets are a single read of the summary, not an aggregation over records."""
+    await _register_applicable(client, workflow_json, "s1", ["sentinel1-grd"], ["sar"])
+    executed_statements.clear()
+
+    await client.get(f"/collections/{CATALOGUE_ID}/facets")
+
+    assert len(executed_statements) == 1
+    assert "facet_summaries" in executed_statements[0]
+    assert "unnest" not in executed_statements[0]
+
+
+@pytest.mark.asyncio
+async def test_get_catalogue_served_from_cache(client: AsyncClient, executed_statements: list[str]) -> None:
+    """Test that repeated catalogue requests are answered without querying the database."""
+    first = await client.get(f"/collections/{CATALOGUE_ID}")
+    collections = await client.get("/collections")
+    executed_statements.clear()
+
+    assert (await client.get(f"/collections/{CATALOGUE_ID}")).json() == first.json()
+    assert (await client.get("/collections")).json() == collections.json()
+    assert executed_statements == []
+
+
+@pytest.mark.asyncio
+async def test_get_items_cache_key_ignores_parameter_order(
+    client: AsyncClient, workflow_json: Any, executed_statements: list[str]
+) -> None:
+    """Test that equivalent listing parameters share a cached page, with links matching the request URL."""
+    await _register_applicable(client, workflow_json, "s1", ["sentinel1-grd"], ["sar", "flood"])
+    await client.get(f"/collections/{CATALOGUE_ID}/items", params={"keywords": "sar,flood", "page_size": 1})
+    executed_statements.clear()
+
+    response = await client.get(f"/collections/{CATALOGUE_ID}/items?page_size=1&keywords=flood,sar,flood")
+
+    assert executed_statements == []
+    assert [item["id"] for item in response.json()["items"]] == ["s1"]
+    assert _link(response.json(), "self") == str(response.request.url)
+
+
+@pytest.mark.asyncio
+async def test_get_items_cache_invalidated_by_writes(client: AsyncClient, workflow_json: Any) -> None:
+    """Test that registering or deleting a record is visible in the next listing."""
+    assert (await client.get(f"/collections/{CATALOGUE_ID}/items")).json()["items"] == []
+
+    await _register_applicable(client, workflow_json, "s1", ["sentinel1-grd"], ["sar"])
+    items = (await client.get(f"/collections/{CATALOGUE_ID}/items")).json()["items"]
+    assert [item["id"] for item in items] == ["s1"]
+
+    await client.delete("/register/s1", headers=AUTH_HEADER)
+    assert (await client.get(f"/collections/{CATALOGUE_ID}/items")).json()["items"] == []
+
+
+@pytest.mark.asyncio
+async def test_get_item_if_none_match_returns_304_without_loading_record(
+    client: AsyncClient, workflow_json: Any, executed_statements: list[str]
+) -> None:
+    """Test that a current ETag is answered with 304 after reading the record's `updated` time only."""
+    await client.post("/register", json=workflow_json, headers=AUTH_HEADER)
+    url = f"/collections/{CATALOGUE_ID}/items/{workflow_json['id']}"
+    etag = (await client.get(url)).headers["etag"]
+    executed_statements.clear()
+
+    response = await client.get(url, headers={"If-None-Match": etag})
+
+    assert response.status_code == status.HTTP_304_NOT_MODIFIED
+    assert response.content == b""
+    assert response.headers["etag"] == etag
+    assert len(executed_statements) == 1
+    assert "geometry" not in executed_statements[0]
+    assert "contacts" not in executed_statements[0]
+
+
+@pytest.mark.asyncio
+async def test_get_item_etag_depends_on_fields_and_record(client: AsyncClient, workflow_json: Any) -> None:
+    """Test that sparse field sets and re-registered records get different ETags."""
+    await client.post("/register", json=workflow_json, headers=AUTH_HEADER)
+    url = f"/collections/{CATALOGUE_ID}/items/{workflow_json['id']}"
+    full = await client.get(url)
+    sparse = await client.get(url, params={"fields": "title"})
+
+    assert full.headers["etag"] != sparse.headers["etag"]
+    assert (await client.get(url, headers={"If-None-Match": sparse.headers["etag"]})).status_code == status.HTTP_200_OK
+
+    await client.delete(f"/register/{workflow_json['id']}", headers=AUTH_HEADER)
+    await client.post("/register", json=workflow_json, headers=AUTH_HEADER)
+    response = await client.get(url, headers={"If-None-Match": full.headers["etag"]})
+
+    assert response.status_code == status.HTTP_200_OK
+    assert response.headers["etag"] != full.headers["etag"]
+
+
+@pytest.mark.asyncio
+async def test_get_item_if_modified_since(client: AsyncClient, workflow_json: Any) -> None:
+    """Test that `If-Modified-Since` at or after the `Last-Modified` time returns 304."""
+    await client.post("/register", json=workflow_json, headers=AUTH_HEADER)
+    url = f"/collections/{CATALOGUE_ID}/items/{workflow_json['id']}"
+    last_modified = (await client.get(url)).headers["last-modified"]
+
+    current = await client.get(url, headers={"If-Modified-Since": last_modified})
+    stale = await client.get(url, headers={"If-Modified-Since": "Mon, 01 Jan 2001 00:00:00 GMT"})
+
+    assert current.status_code == status.HTTP_304_NOT_MODIFIED
+    assert stale.status_code == status.HTTP_200_OK
+
+
+@pytest.mark.asyncio
+async def test_get_item_conditional_not_found(client: AsyncClient) -> None:
+    """Test that conditional requests for unknown records return 404."""
+    response = await client.get(f"/collections/{CATALOGUE_ID}/items/missing", headers={"If-None-Match": "*"})
+
+    assert response.status_code == status.HTTP_404_NOT_FOUND
+
+
+@pytest.mark.asyncio
+async def test_get_catalogue_if_none_match_returns_304(client: AsyncClient) -> None:
+    """Test that catalogue metadata supports conditional requests."""
+    response = await client.get(f"/collections/{CATALOGUE_ID}")
+    assert "last-modified" in response.headers
+
+    response = await client.get(f"/collections/{CATALOGUE_ID}", headers={"If-None-Match": response.headers["etag"]})
+
+    assert response.status_code == status.HTTP_304_NOT_MODIFIED
+
+
+@pytest.mark.asyncio
+async def test_get_items_etag_follows_catalogue_revision(
+    client: AsyncClient, workflow_json: Any, executed_statements: list[str]
+) -> None:
+    """Test that listings are not modified until a record of the catalogue is registered or deleted."""
+    await _register_applicable(client, workflow_json, "s1", ["sentinel1-grd"], ["sar"])
+    url = f"/collections/{CATALOGUE_ID}/items"
+    etag = (await client.get(url)).headers["etag"]
+    clear_caches()
+    executed_statements.clear()
+
+    response = await client.get(url, headers={"If-None-Match": etag})
+
+    assert response.status_code == status.HTTP_304_NOT_MODIFIED
+    assert len(executed_statements) == 1
+    assert "records_revision" in executed_statements[0]
+
+    await _register_applicable(client, workflow_json, "s2", ["sentinel2-l2a"], ["ndvi"])
+    response = await client.get(url, headers={"If-None-Match": etag})
+
+    assert response.status_code == status.HTTP_200_OK
+    assert response.headers["etag"] != etag
+    assert len(response.json()["items"]) == 2  # noqa: PLR2004
+
+
+@pytest.mark.asyncio
+async def test_get_items_empty_page_has_validators(client: AsyncClient) -> None:
+    """Test that empty listings are conditional too."""
+    response = await client.get(f"/collections/{CATALOGUE_ID}/items")
+
+    response = await client.get(
+        f"/collections/{CATALOGUE_ID}/items", headers={"If-None-Match": response.headers["etag"]}
+    )
+
+    assert response.status_code == status.HTTP_304_NOT_MODIFIED
+
+
+@pytest.mark.asyncio
+async def test_get_item_returns_rendered_document(
+    client: AsyncClient, workflow_json: Any, executed_statements: list[str]
+) -> None:
+    """Test that full records are the document rendered on registration, read without contacts or links."""
+    registered = await client.post("/register", json=workflow_json, headers=AUTH_HEADER)
+    executed_statements.clear()
+
+    response = await client.get(f"/collections/{CATALOGUE_ID}/items/{workflow_json['id']}")
+
+    assert response.headers["content-type"] == "application/json"
+    assert response.content == registered.content
+    assert len(executed_statements) == 1
+    assert "contacts" not in executed_statements[0]
+    batch = await client.get(f"/collections/{CATALOGUE_ID}/batch", params={"ids": workflow_json["id"]})
+    assert batch.json() == [response.json()]
+
+
+@pytest.mark.asyncio
+async def test_get_item_rendered_document_matches_built_response(
+    client: AsyncClient, workflow_json: Any, session_factory: async_sessionmaker[AsyncSession]
+) -> None:
+    """Test that the rendered document has the same content as a response built from the record's rows."""
+    await client.post("/register", json=workflow_json, headers=AUTH_HEADER)
+    url = f"/collections/{CATALOGUE_ID}/items/{workflow_json['id']}"
+    rendered = (await client.get(url)).json()
+    async with session_factory() as session:
+        await session.execute(update(Record).where(Record.id == workflow_json["id"]).values(rendered=None))
+        await session.commit()
+
+    built = (await client.get(url)).json()
+
+    assert rendered == built
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize(
+    "params",
+    [{}, {"include": "contacts,links"}, {"fields": "title,updated,applicableCollections", "include": "links"}],
+)
+async def test_get_items_rendered_in_database_match_built_items(
+    client: AsyncClient,
+    workflow_json: Any,
+    notebook_json: Any,
+    monkeypatch: pytest.MonkeyPatch,
+    params: dict[str, str],
+) -> None:
+    """Test that pages rendered by Postgres have the same content, keys in the same order, as pages built in Python."""
+    await client.post("/register", json=workflow_json, headers=AUTH_HEADER)
+    await client.post("/register", json=notebook_json, headers=AUTH_HEADER)
+    url = f"/collections/{CATALOGUE_ID}/items"
+    monkeypatch.setattr(settings.listing, "render_in_database", True)
+    in_database = (await client.get(url, params=params)).content
+    monkeypatch.setattr(settings.listing, "render_in_database", False)
+    clear_caches()
+
+    built = (await client.get(url, params=params)).content
+
+    assert json.loads(in_database, object_pairs_hook=list) == json.loads(built, object_pairs_hook=list)
+
+
+@pytest.mark.asyncio
+async def test_get_item_compressed_once(
+    client: AsyncClient, workflow_json: Any, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    """Test that rendered records are compressed with the negotiated encoding once, then served compressed."""
+    monkeypatch.setattr(settings.compression, "min_size", 0)
+    compressed = []
+    compress = rendering.compress
+    monkeypatch.setattr(
+        rendering, "compress", lambda body, encoding: compressed.append(encoding) or compress(body, encoding)
+    )
+    registered = await client.post("/register", json=workflow_json, headers=AUTH_HEADER)
+    url = f"/collections/{CATALOGUE_ID}/items/{workflow_json['id']}"
+
+    responses = [await client.get(url, headers={"Accept-Encoding": "gzip"}) for _ in range(2)]
+
+    assert [response.headers["content-encoding"] for response in responses] == ["gzip", "gzip"]
+    assert [response.content for response in responses] == [registered.content, registered.content]
+    assert compressed == ["gzip"]
+    identity = await client.get(url, headers={"Accept-Encoding": "identity"})
+    assert "content-encoding" not in identity.headers
+    assert identity.content == registered.content
+
+
+@pytest.mark.asyncio
+async def test_get_item_compressed_has_own_etag(
+    client: AsyncClient, workflow_json: Any, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    """Test that compressed records have an entity tag per encoding, which revalidates like the uncompressed one."""
+    monkeypatch.setattr(settings.compression, "min_size", 0)
+    await client.post("/register", json=workflow_json, headers=AUTH_HEADER)
+    url = f"/collections/{CATALOGUE_ID}/items/{workflow_json['id']}"
+    identity = await client.get(url, headers={"Accept-Encoding": "identity"})
+    compressed = await client.get(url, headers={"Accept-Encoding": "gzip"})
+
+    assert compressed.headers["etag"] == identity.headers["etag"].removesuffix('"') + '-gzip"'
+    for etag in (compressed.headers["etag"], identity.headers["etag"]):
+        revalidated = await client.get(url, headers={"Accept-Encoding": "gzip", "If-None-Match": etag})
+        assert revalidated.status_code == status.HTTP_304_NOT_MODIFIED
+        assert revalidated.headers["etag"] == etag
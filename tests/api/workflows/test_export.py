@@ -0,0 +1,100 @@
+"""Tests for streaming catalogue exports."""
+
+from __future__ import annotations
+
+import copy
+import json
+from typing import TYPE_CHECKING, Any
+
+import pytest
+from sqlalchemy import update
+from starlette import status
+
+from wf_catalogue_service.api.v1.workflows.routes import settings
+from wf_catalogue_service.db.models import Record
+
+if TYPE_CHECKING:
+    from httpx import AsyncClient
+    from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+CATALOGUE_ID = "eodh-workflows-notebooks"
+AUTH_HEADER = {"Authorization": "Bearer test-token"}
+
+
+async def _register(client: AsyncClient, workflow_json: dict[str, Any], *record_ids: str) -> None:
+    """Register copies of the workflow with the given IDs."""
+    for record_id in record_ids:
+        response = await client.post(
+            "/register", json={**copy.deepcopy(workflow_json), "id": record_id}, headers=AUTH_HEADER
+        )
+        assert response.status_code == status.HTTP_201_CREATED
+
+
+@pytest.mark.asyncio
+async def test_export_ndjson_streams_full_records_by_id(
+    client: AsyncClient, workflow_json: Any, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    """Test that the NDJSON export has one full record per line, ordered by ID, across fetch batches."""
+    monkeypatch.setattr(settings.listing, "export_batch_size", 2)
+    await _register(client, workflow_json, "c", "a", "d", "b", "e")
+
+    response = await client.get(f"/collections/{CATALOGUE_ID}/items.ndjson")
+
+    assert response.status_code == status.HTTP_200_OK
+    assert response.headers["content-type"] == "application/x-ndjson"
+    lines = response.content.splitlines()
+    assert [json.loads(line)["id"] for line in lines] == ["a", "b", "c", "d", "e"]
+    record = await client.get(f"/collections/{CATALOGUE_ID}/items/a")
+    assert lines[0] == record.content
+
+
+@pytest.mark.asyncio
+async def test_export_ndjson_resumes_after_record(client: AsyncClient, workflow_json: Any) -> None:
+    """Test that `after` resumes an export past the last record received."""
+    await _register(client, workflow_json, "a", "b", "c")
+
+    response = await client.get(f"/collections/{CATALOGUE_ID}/items.ndjson", params={"after": "a"})
+
+    assert [json.loads(line)["id"] for line in response.content.splitlines()] == ["b", "c"]
+
+
+@pytest.mark.asyncio
+async def test_export_geojson_feature_collection(client: AsyncClient, workflow_json: Any) -> None:
+    """Test that the GeoJSON export is a FeatureCollection of the same records as the NDJSON export."""
+    await _register(client, workflow_json, "a", "b")
+    ndjson = await client.get(f"/collections/{CATALOGUE_ID}/items.ndjson")
+
+    response = await client.get(f"/collections/{CATALOGUE_ID}/items.geojson")
+
+    assert response.headers["content-type"] == "application/geo+json"
+    data = response.json()
+    assert data["type"] == "FeatureCollection"
+    assert data["features"] == [json.loads(line) for line in ndjson.content.splitlines()]
+
+
+@pytest.mark.asyncio
+async def test_export_empty_catalogue(client: AsyncClient) -> None:
+    """Test that exports of empty catalogues are empty."""
+    ndjson = await client.get(f"/collections/{CATALOGUE_ID}/items.ndjson")
+    geojson = await client.get(f"/collections/{CATALOGUE_ID}/items.geojson")
+
+    assert ndjson.content == b""
+    assert geojson.json() == {"type": "FeatureCollection", "features": []}
+
+
+@pytest.mark.asyncio
+async def test_export_renders_records_without_stored_document(
+    client: AsyncClient, workflow_json: Any, session_factory: async_sessionmaker[AsyncSession]
+) -> None:
+    """Test that records without a stored document are rendered by Postgres with the same content."""
+    await _register(client, workflow_json, "a")
+    stored = (await client.get(f"/collections/{CATALOGUE_ID}/items.ndjson")).content
+    async with session_factory() as session:
+        await session.execute(update(Record).where(Record.id == "a").values(rendered=None))
+        await session.commit()
+
+    rendered = (await client.get(f"/collections/{CATALOGUE_ID}/items.ndjson")).content
+
+    assert len(rendered.splitlines()) == 1
+    # Postgres does not keep the key order of `jsonb` values, such as input parameters, so compare parsed documents
+    assert json.loads(rendered) == json.loads(stored)
@@ -0,0 +1,169 @@
+"""Tests for CQL2 record filters."""
+
+from __future__ import annotations
+
+import json
+from typing import TYPE_CHECKING, Any
+
+import pytest
+import pytest_asyncio
+from sqlalchemy import select, text
+from starlette import status
+
+from wf_catalogue_service.api.common.counting import query_plan
+from wf_catalogue_service.api.v1.workflows.cql2 import compile_filter
+from wf_catalogue_service.api.v1.workflows.routes import settings
+from wf_catalogue_service.db.models import Record
+
+if TYPE_CHECKING:
+    from httpx import AsyncClient
+    from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+AUTH_HEADER = {"Authorization": "Bearer test-token"}
+CATALOGUE_ID = "eodh-workflows-notebooks"
+
+
+async def _register(client: AsyncClient, workflow_json: dict[str, Any], record_id: str, **properties: Any) -> None:
+    """Register a copy of the workflow with overridden properties."""
+    data = {**workflow_json, "id": record_id, "properties": {**workflow_json["properties"], **properties}}
+    response = await client.post("/register", json=data, headers=AUTH_HEADER)
+    assert response.status_code == status.HTTP_201_CREATED
+
+
+async def _filtered_ids(client: AsyncClient, params: dict[str, str]) -> set[str]:
+    response = await client.get(f"/collections/{CATALOGUE_ID}/items", params=params)
+    assert response.status_code == status.HTTP_200_OK, response.text
+    return {item["id"] for item in response.json()["items"]}
+
+
+def _plan_nodes(plan: dict[str, Any]) -> list[dict[str, Any]]:
+    """Flattens a plan tree into its nodes."""
+    return [plan, *(node for child in plan.get("Plans", []) for node in _plan_nodes(child))]
+
+
+@pytest_asyncio.fixture
+async def records(client: AsyncClient, workflow_json: dict[str, Any]) -> None:
+    """Register workflows and notebooks with distinct keywords and application languages."""
+    await _register(
+        client, workflow_json, "ndvi-cwl", keywords=["ndvi", "sentinel2"], **{"application:language": "CWL"}
+    )
+    await _register(client, workflow_json, "ndvi-python", keywords=["ndvi"], **{"application:language": "Python"})
+    await _register(client, workflow_json, "sar-cwl", keywords=["sar"], **{"application:language": "CWL"})
+    await _register(client, workflow_json, "ndvi-notebook", type="notebook", keywords=["ndvi"])
+
+
+@pytest.mark.asyncio
+@pytest.mark.usefixtures("records")
+@pytest.mark.parametrize(
+    ("cql2", "expected"),
+    [
+        (
+            "type = 'workflow' AND a_contains(keywords, ('ndvi')) AND \"application:language\" = 'CWL'",
+            {"ndvi-cwl"},
+        ),
+        ("a_contains(keywords, ('ndvi')) AND NOT type = 'notebook'", {"ndvi-cwl", "ndvi-python"}),
+        ("a_overlaps(keywords, ('sar', 'sentinel2'))", {"ndvi-cwl", "sar-cwl"}),
+        ("id IN ('sar-cwl', 'ndvi-notebook', 'unknown')", {"sar-cwl", "ndvi-notebook"}),
+        ("a_contains(keywords, ('ndvi', 'sentinel2')) OR id = 'sar-cwl'", {"ndvi-cwl", "sar-cwl"}),
+    ],
+)
+async def test_cql2_text_filter(client: AsyncClient, cql2: str, expected: set[str]) -> None:
+    """Test that CQL2 text filters combine predicates."""
+    assert await _filtered_ids(client, {"filter": cql2}) == expected
+
+
+@pytest.mark.asyncio
+@pytest.mark.usefixtures("records")
+async def test_cql2_json_filter(client: AsyncClient) -> None:
+    """Test that CQL2 JSON filters are accepted."""
+    cql2 = {
+        "op": "and",
+        "args": [
+            {"op": "a_contains", "args": [{"property": "keywords"}, ["ndvi"]]},
+            {"op": "=", "args": [{"property": "application:language"}, "Python"]},
+        ],
+    }
+
+    ids = await _filtered_ids(client, {"filter": json.dumps(cql2), "filter-lang": "cql2-json"})
+
+    assert ids == {"ndvi-python"}
+
+
+@pytest.mark.asyncio
+@pytest.mark.usefixtures("records")
+async def test_cql2_full_scan_filter_rejected(client: AsyncClient) -> None:
+    """Test that filters without an indexed predicate are rejected by default."""
+    response = await client.get(
+        f"/collections/{CATALOGUE_ID}/items", params={"filter": "\"application:language\" = 'CWL'"}
+    )
+
+    assert response.status_code == status.HTTP_400_BAD_REQUEST
+    assert "index" in response.json()["detail"]
+
+
+@pytest.mark.asyncio
+@pytest.mark.usefixtures("records")
+async def test_cql2_full_scan_filter_allowed_by_settings(client: AsyncClient, monkeypatch: pytest.MonkeyPatch) -> None:
+    """Test that full-scan filters can be enabled in settings."""
+    monkeypatch.setattr(settings.listing, "allow_full_scan_filters", True)
+
+    ids = await _filtered_ids(client, {"filter": "\"application:language\" = 'CWL'"})
+
+    # The notebook is copied from the workflow fixture, whose language is CWL
+    assert ids == {"ndvi-cwl", "sar-cwl", "ndvi-notebook"}
+
+
+@pytest.mark.asyncio
+async def test_cql2_invalid_filter_returns_400(client: AsyncClient) -> None:
+    """Test that malformed filters are rejected."""
+    response = await client.get(f"/collections/{CATALOGUE_ID}/items", params={"filter": "type = "})
+
+    assert response.status_code == status.HTTP_400_BAD_REQUEST
+    assert response.json()["detail"].startswith("Invalid filter")
+
+
+@pytest.mark.asyncio
+async def test_get_queryables(client: AsyncClient) -> None:
+    """Test that the queryables document describes filterable properties."""
+    response = await client.get(f"/collections/{CATALOGUE_ID}/queryables")
+
+    assert response.status_code == status.HTTP_200_OK
+    assert response.headers["content-type"] == "application/schema+json"
+    data = response.json()
+    assert data["$id"].endswith(f"/collections/{CATALOGUE_ID}/queryables")
+    assert {"type", "keywords", "application:language", "geometry", "datetime"} <= data["properties"].keys()
+
+
+@pytest.mark.asyncio
+async def test_get_queryables_unknown_catalogue_returns_404(client: AsyncClient) -> None:
+    """Test that queryables are only served for existing catalogues."""
+    response = await client.get("/collections/unknown/queryables")
+
+    assert response.status_code == status.HTTP_404_NOT_FOUND
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize(
+    ("cql2", "index"),
+    [
+        ("a_contains(keywords, ('ndvi')) AND \"application:language\" = 'CWL'", "idx_records_keywords"),
+        ("a_overlaps(keywords, ('ndvi', 'sar'))", "idx_records_keywords"),
+        # The planner may answer from the trigram index or by scanning the catalogue/title index
+        ("title LIKE '%NDVI%'", None),
+        ("type = 'notebook'", "idx_records_type"),
+        ("s_intersects(geometry, BBOX(0, 0, 10, 10))", "idx_records_bbox"),
+        ("t_intersects(datetime, INTERVAL('2024-01-01T00:00:00Z', '..'))", "idx_records_temporal_extent"),
+    ],
+)
+async def test_cql2_filter_uses_index(
+    session_factory: async_sessionmaker[AsyncSession], cql2: str, index: str | None
+) -> None:
+    """Test that accepted filters compile to predicates the planner answers from an index."""
+    async with session_factory() as session:
+        await session.execute(text("SET LOCAL enable_seqscan = off"))
+        plan = await query_plan(session, select(Record.id).where(compile_filter(cql2)))
+
+    nodes = _plan_nodes(plan)
+    indexes = {node.get("Index Name") for node in nodes} - {None}
+    assert index in indexes if index else indexes
+    assert "Seq Scan" not in {node["Node Type"] for node in nodes}
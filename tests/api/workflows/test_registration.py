@@ -2,13 +2,24 @@
 
 from __future__ import annotations
 
+import asyncio
+import copy
+import json
 from typing import TYPE_CHECKING, Any
 
+import asyncpg
 import pytest
+from sqlalchemy import insert, literal, select, text
 from starlette import status
 
+from wf_catalogue_service.api.v1.workflows import routes
+from wf_catalogue_service.api.v1.workflows.caches import INVALIDATION_CHANNEL, track_record_change
+from wf_catalogue_service.api.v1.workflows.routes import settings
+from wf_catalogue_service.db.models import Contact, Link, Record
+
 if TYPE_CHECKING:
     from httpx import AsyncClient
+    from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
 
 CATALOGUE_ID = "eodh-workflows-notebooks"
 AUTH_HEADER = {"Authorization": "Bearer test-token"}
@@ -48,9 +59,9 @@ async def test_register_without_auth_returns_403(client: AsyncClient, workflow_j
 
 @pytest.mark.asyncio
 async def test_register_duplicate_returns_409(client: AsyncClient, workflow_json: Any) -> None:
-    """Test that POST /register with duplicate ID returns 409."""
+    """Test that POST /register with duplicate ID and different content returns 409."""
     await client.post("/register", json=workflow_json, headers=AUTH_HEADER)
-    response = await client.post("/register", json=workflow_json, headers=AUTH_HEADER)
+    response = await client.post("/register", json=_revised(workflow_json), headers=AUTH_HEADER)
 
     assert response.status_code == status.HTTP_409_CONFLICT
 
@@ -98,3 +109,344 @@ async def test_full_workflow_flow(client: AsyncClient, workflow_json: Any) -> No
     # Verify deleted
     response = await client.get(f"/collections/{CATALOGUE_ID}/items/{workflow_json['id']}")
     assert response.status_code == status.HTTP_404_NOT_FOUND
+
+
+@pytest.mark.asyncio
+async def test_writes_notify_other_workers(
+    client: AsyncClient, workflow_json: Any, session_factory: async_sessionmaker[AsyncSession]
+) -> None:
+    """Test that registration and deletion notify cache invalidation listeners once committed."""
+    url = session_factory.kw["bind"].url.set(drivername="postgresql").render_as_string(hide_password=False)
+    connection = await asyncpg.connect(url)
+    payloads: asyncio.Queue[str] = asyncio.Queue()
+    await connection.add_listener(INVALIDATION_CHANNEL, lambda *args: payloads.put_nowait(args[-1]))
+    try:
+        await client.post("/register", json=workflow_json, headers=AUTH_HEADER)
+        await client.delete(f"/register/{workflow_json['id']}", headers=AUTH_HEADER)
+
+        expected = {"catalogue_id": CATALOGUE_ID, "record_id": workflow_json["id"]}
+        assert json.loads(await asyncio.wait_for(payloads.get(), timeout=5)) == expected
+        assert json.loads(await asyncio.wait_for(payloads.get(), timeout=5)) == expected
+    finally:
+        await connection.close()
+
+
+def _copies(workflow_json: dict[str, Any], *record_ids: str) -> list[dict[str, Any]]:
+    """Copies of the workflow with the given IDs."""
+    return [{**copy.deepcopy(workflow_json), "id": record_id} for record_id in record_ids]
+
+
+@pytest.mark.asyncio
+async def test_register_batch_returns_201(client: AsyncClient, workflow_json: Any) -> None:
+    """Test that POST /register/batch registers every record and reports each one."""
+    response = await client.post("/register/batch", json=_copies(workflow_json, "a", "b", "c"), headers=AUTH_HEADER)
+
+    assert response.status_code == status.HTTP_201_CREATED
+    assert response.json() == {
+        "created": 3,
+        "unchanged": 0,
+        "failed": 0,
+        "items": [{"index": i, "id": record_id, "status": "created"} for i, record_id in enumerate("abc")],
+    }
+    single = await client.get(f"/collections/{CATALOGUE_ID}/items/a")
+    assert single.json()["properties"]["title"] == workflow_json["properties"]["title"]
+    listing = await client.get(f"/collections/{CATALOGUE_ID}/items")
+    assert listing.json()["total_items"] == 3  # noqa: PLR2004
+
+
+@pytest.mark.asyncio
+async def test_register_batch_ndjson(client: AsyncClient, workflow_json: Any) -> None:
+    """Test that POST /register/batch accepts one record per line."""
+    body = b"\n".join(json.dumps(record).encode() for record in _copies(workflow_json, "a", "b"))
+
+    response = await client.post(
+        "/register/batch", content=body, headers={**AUTH_HEADER, "Content-Type": "application/x-ndjson"}
+    )
+
+    assert response.status_code == status.HTTP_201_CREATED
+    assert response.json()["created"] == 2  # noqa: PLR2004
+
+
+@pytest.mark.asyncio
+async def test_register_batch_atomic_rejects_all(client: AsyncClient, workflow_json: Any) -> None:
+    """Test that an atomic batch with a conflicting or invalid record registers nothing."""
+    await client.post("/register", json={**_revised(workflow_json), "id": "b"}, headers=AUTH_HEADER)
+    records = [*_copies(workflow_json, "a", "b", "a"), {"id": "d"}]
+
+    response = await client.post("/register/batch", json=records, headers=AUTH_HEADER)
+
+    assert response.status_code == status.HTTP_422_UNPROCESSABLE_ENTITY
+    report = response.json()
+    assert report["created"] == 0
+    assert report["failed"] == 3  # noqa: PLR2004
+    assert [item["status"] for item in report["items"]] == ["skipped", "conflict", "conflict", "invalid"]
+    assert "properties" in report["items"][3]["detail"]
+    response = await client.get(f"/collections/{CATALOGUE_ID}/items/a")
+    assert response.status_code == status.HTTP_404_NOT_FOUND
+
+
+@pytest.mark.asyncio
+async def test_register_batch_partial_registers_valid_records(client: AsyncClient, workflow_json: Any) -> None:
+    """Test that a partial batch registers the records it can and reports the others."""
+    await client.post("/register", json={**_revised(workflow_json), "id": "b"}, headers=AUTH_HEADER)
+
+    response = await client.post(
+        "/register/batch",
+        json=_copies(workflow_json, "a", "b", "c"),
+        params={"mode": "partial"},
+        headers=AUTH_HEADER,
+    )
+
+    assert response.status_code == status.HTTP_200_OK
+    report = response.json()
+    assert (report["created"], report["failed"]) == (2, 1)
+    assert [item["status"] for item in report["items"]] == ["created", "conflict", "created"]
+    response = await client.get(f"/collections/{CATALOGUE_ID}/items/c")
+    assert response.status_code == status.HTTP_200_OK
+
+
+@pytest.mark.asyncio
+async def test_register_batch_reports_records_inserted_concurrently_as_conflicts(
+    client: AsyncClient, workflow_json: Any, session_factory: async_sessionmaker[AsyncSession]
+) -> None:
+    """Test that IDs inserted by another transaction after the batch checked them are reported as conflicts."""
+    await client.post("/register", json={**workflow_json, "id": "x"}, headers=AUTH_HEADER)
+    columns = [column for column in Record.__table__.c if column.computed is None]
+    async with session_factory() as writer:
+        # Insert a copy of "x" as "b" without taking the record locks, and commit it once the batch waits for it
+        await writer.execute(
+            insert(Record).from_select(
+                [column.key for column in columns],
+                select(*(literal("b") if column.key == "id" else column for column in columns)).where(Record.id == "x"),
+            )
+        )
+        batch = asyncio.create_task(
+            client.post(
+                "/register/batch",
+                json=_copies(workflow_json, "a", "b", "c"),
+                params={"mode": "partial"},
+                headers=AUTH_HEADER,
+            )
+        )
+        await _wait_for_blocked_session(session_factory)
+        await writer.commit()
+    response = await batch
+
+    assert response.status_code == status.HTTP_200_OK
+    report = response.json()
+    assert (report["created"], report["failed"]) == (2, 1)
+    assert [item["status"] for item in report["items"]] == ["created", "conflict", "created"]
+    async with session_factory() as session:
+        contacts = await session.scalars(select(Contact.entity_id).where(Contact.entity_id == "b"))
+        assert contacts.all() == []
+
+
+@pytest.mark.asyncio
+async def test_register_batch_too_large_returns_413(
+    client: AsyncClient, workflow_json: Any, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    """Test that batches over the configured size are rejected."""
+    monkeypatch.setattr(settings.registration, "max_batch_size", 2)
+
+    response = await client.post("/register/batch", json=_copies(workflow_json, "a", "b", "c"), headers=AUTH_HEADER)
+
+    assert response.status_code == status.HTTP_413_REQUEST_ENTITY_TOO_LARGE
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("size", [1, 20])
+async def test_register_batch_statement_count_is_constant(
+    client: AsyncClient, workflow_json: Any, executed_statements: list[str], size: int
+) -> None:
+    """Test that a batch runs the same statements whatever its size."""
+    records = _copies(workflow_json, *(f"record-{i}" for i in range(size)))
+
+    response = await client.post("/register/batch", json=records, headers=AUTH_HEADER)
+
+    assert response.status_code == status.HTTP_201_CREATED
+    inserts = [statement for statement in executed_statements if statement.startswith("INSERT INTO records ")]
+    assert len(inserts) == 1
+
+
+async def _wait_for_blocked_session(session_factory: async_sessionmaker[AsyncSession]) -> None:
+    """Wait until a session is waiting for a lock held by another one."""
+    async with session_factory() as session:
+        for _ in range(500):
+            if (await session.execute(text("SELECT count(*) FROM pg_locks WHERE NOT granted"))).scalar():
+                return
+            await asyncio.sleep(0.01)
+
+
+def _revised(workflow_json: dict[str, Any]) -> dict[str, Any]:
+    """The workflow with a new title, keywords, contact and links."""
+    revised = copy.deepcopy(workflow_json)
+    revised["properties"]["title"] = "NDVI Calculation v2"
+    revised["properties"]["keywords"] = ["ndvi", "landsat"]
+    revised["properties"]["contacts"] = [{"name": "Jane Doe", "roles": ["maintainer"]}]
+    revised["links"] = [
+        {"rel": "self", "href": "https://example.com/ndvi-workflow.json"},
+        {"rel": "describedby", "href": "https://example.com/ndvi-workflow.html"},
+    ]
+    return revised
+
+
+@pytest.mark.asyncio
+async def test_upsert_new_record_returns_201(client: AsyncClient, workflow_json: Any) -> None:
+    """Test that PUT /register/{id} registers a record that does not exist."""
+    response = await client.put(f"/register/{workflow_json['id']}", json=workflow_json, headers=AUTH_HEADER)
+
+    assert response.status_code == status.HTTP_201_CREATED
+    record = await client.get(f"/collections/{CATALOGUE_ID}/items/{workflow_json['id']}")
+    assert record.content == response.content
+
+
+@pytest.mark.asyncio
+async def test_upsert_replaces_record(client: AsyncClient, workflow_json: Any) -> None:
+    """Test that PUT /register/{id} replaces a record, its contacts and links, keeping its creation time."""
+    registered = (await client.post("/register", json=workflow_json, headers=AUTH_HEADER)).json()
+
+    response = await client.put(f"/register/{workflow_json['id']}", json=_revised(workflow_json), headers=AUTH_HEADER)
+
+    assert response.status_code == status.HTTP_200_OK
+    data = response.json()
+    assert data["properties"]["title"] == "NDVI Calculation v2"
+    assert data["properties"]["created"] == registered["properties"]["created"]
+    assert data["properties"]["updated"] > registered["properties"]["updated"]
+    assert [contact["name"] for contact in data["properties"]["contacts"]] == ["Jane Doe"]
+    assert [link["rel"] for link in data["links"]] == ["self", "describedby"]
+    record = await client.get(f"/collections/{CATALOGUE_ID}/items/{workflow_json['id']}")
+    assert record.content == response.content
+    listing = await client.get(f"/collections/{CATALOGUE_ID}/items", params={"include": "contacts,links"})
+    assert listing.json()["items"][0]["properties"]["contacts"] == data["properties"]["contacts"]
+    assert listing.json()["items"][0]["links"] == data["links"]
+
+
+@pytest.mark.asyncio
+async def test_upsert_updates_facets(client: AsyncClient, workflow_json: Any) -> None:
+    """Test that replacing a record moves its facet counts to its new values."""
+    await client.post("/register", json=workflow_json, headers=AUTH_HEADER)
+
+    await client.put(f"/register/{workflow_json['id']}", json=_revised(workflow_json), headers=AUTH_HEADER)
+
+    facets = (await client.get(f"/collections/{CATALOGUE_ID}/facets")).json()
+    assert {facet["value"]: facet["count"] for facet in facets["keywords"]} == {"ndvi": 1, "landsat": 1}
+    assert facets["type"] == [{"value": "workflow", "count": 1}]
+
+
+@pytest.mark.asyncio
+async def test_concurrent_upserts_apply_one_after_the_other(
+    client: AsyncClient,
+    workflow_json: Any,
+    session_factory: async_sessionmaker[AsyncSession],
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    """Test that a PUT waiting for a concurrent registration of the same record replaces it once it is committed."""
+    entered, release = asyncio.Event(), asyncio.Event()
+
+    async def held_track_record_change(*args: Any) -> None:
+        # Keep the transaction of the first registration open until the second one is waiting for it
+        if not entered.is_set():
+            entered.set()
+            await release.wait()
+        await track_record_change(*args)
+
+    monkeypatch.setattr(routes, "track_record_change", held_track_record_change)
+    record_id = workflow_json["id"]
+    first = asyncio.create_task(client.put(f"/register/{record_id}", json=workflow_json, headers=AUTH_HEADER))
+    await entered.wait()
+    second = asyncio.create_task(
+        client.put(f"/register/{record_id}", json=_revised(workflow_json), headers=AUTH_HEADER)
+    )
+    await _wait_for_blocked_session(session_factory)
+    release.set()
+
+    assert (await first).status_code == status.HTTP_201_CREATED
+    assert (await second).status_code == status.HTTP_200_OK
+    facets = (await client.get(f"/collections/{CATALOGUE_ID}/facets")).json()
+    assert {facet["value"]: facet["count"] for facet in facets["keywords"]} == {"ndvi": 1, "landsat": 1}
+    async with session_factory() as session:
+        contacts = await session.scalars(select(Contact.name).where(Contact.entity_id == record_id))
+        links = await session.scalars(select(Link.rel).where(Link.entity_id == record_id))
+        assert contacts.all() == ["Jane Doe"]
+        assert sorted(links.all()) == ["describedby", "self"]
+
+
+@pytest.mark.asyncio
+async def test_upsert_id_mismatch_returns_400(client: AsyncClient, workflow_json: Any) -> None:
+    """Test that PUT /register/{id} rejects a record with another ID."""
+    response = await client.put("/register/other", json=workflow_json, headers=AUTH_HEADER)
+
+    assert response.status_code == status.HTTP_400_BAD_REQUEST
+
+
+@pytest.mark.asyncio
+async def test_upsert_writes_record_in_one_statement(
+    client: AsyncClient, workflow_json: Any, executed_statements: list[str]
+) -> None:
+    """Test that replacing a record neither checks for it nor deletes its related rows in separate statements."""
+    await client.post("/register", json=workflow_json, headers=AUTH_HEADER)
+    executed_statements.clear()
+
+    await client.put(f"/register/{workflow_json['id']}", json=_revised(workflow_json), headers=AUTH_HEADER)
+
+    writes = [statement for statement in executed_statements if "INSERT INTO records" in statement]
+    assert len(writes) == 1
+    assert "ON CONFLICT (id) DO UPDATE" in writes[0]
+    assert not any(
+        statement.startswith(("SELECT records.", "DELETE FROM contacts", "DELETE FROM links"))
+        for statement in executed_statements
+    )
+
+
+@pytest.mark.asyncio
+async def test_register_unchanged_writes_nothing(
+    client: AsyncClient, workflow_json: Any, executed_statements: list[str]
+) -> None:
+    """Test that registering a record again with the same content returns it without writing anything."""
+    registered = await client.post("/register", json=workflow_json, headers=AUTH_HEADER)
+    executed_statements.clear()
+
+    response = await client.post("/register", json=workflow_json, headers=AUTH_HEADER)
+
+    assert response.status_code == status.HTTP_200_OK
+    assert response.headers["record-unchanged"] == "true"
+    assert response.content == registered.content
+    assert not any("pg_notify" in statement or "UPDATE" in statement for statement in executed_statements)
+
+
+@pytest.mark.asyncio
+async def test_upsert_unchanged_keeps_record(
+    client: AsyncClient, workflow_json: Any, executed_statements: list[str]
+) -> None:
+    """Test that PUT /register/{id} with the same content neither rewrites the record nor invalidates caches."""
+    registered = await client.put(f"/register/{workflow_json['id']}", json=workflow_json, headers=AUTH_HEADER)
+    listing = await client.get(f"/collections/{CATALOGUE_ID}/items")
+    executed_statements.clear()
+
+    response = await client.put(f"/register/{workflow_json['id']}", json=workflow_json, headers=AUTH_HEADER)
+
+    assert response.status_code == status.HTTP_200_OK
+    assert response.headers["record-unchanged"] == "true"
+    assert response.content == registered.content
+    assert not any("pg_notify" in statement or "UPDATE catalogues" in statement for statement in executed_statements)
+    revalidated = await client.get(
+        f"/collections/{CATALOGUE_ID}/items", headers={"If-None-Match": listing.headers["etag"]}
+    )
+    assert revalidated.status_code == status.HTTP_304_NOT_MODIFIED
+    record = await client.get(f"/collections/{CATALOGUE_ID}/items/{workflow_json['id']}")
+    assert record.content == registered.content
+
+
+@pytest.mark.asyncio
+async def test_register_batch_reports_unchanged_records(client: AsyncClient, workflow_json: Any) -> None:
+    """Test that a batch registering records again with the same content reports them as unchanged."""
+    await client.post("/register/batch", json=_copies(workflow_json, "a", "b"), headers=AUTH_HEADER)
+
+    response = await client.post(
+        "/register/batch", json=[*_copies(workflow_json, "a", "b"), *_copies(workflow_json, "c")], headers=AUTH_HEADER
+    )
+
+    assert response.status_code == status.HTTP_201_CREATED
+    report = response.json()
+    assert (report["created"], report["unchanged"], report["failed"]) == (1, 2, 0)
+    assert [item["status"] for item in report["items"]] == ["unchanged", "unchanged", "created"]
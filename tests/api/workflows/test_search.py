@@ -0,0 +1,255 @@
+"""Tests for record search and spatial and temporal filtering."""
+
+from __future__ import annotations
+
+import itertools
+from datetime import UTC, datetime
+from typing import TYPE_CHECKING, Any
+
+import pytest
+import pytest_asyncio
+from sqlalchemy import insert, text
+from starlette import status
+
+from wf_catalogue_service.db.models import Record, RecordType
+
+if TYPE_CHECKING:
+    from httpx import AsyncClient
+    from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+AUTH_HEADER = {"Authorization": "Bearer test-token"}
+CATALOGUE_ID = "eodh-workflows-notebooks"
+RECORD_COUNT = 5000
+TARGET_ID = "ndvi-calculation"
+
+_SENSORS = ["Landsat", "MODIS", "Pleiades", "WorldView", "Copernicus DEM", "VIIRS"]
+_PRODUCTS = ["land cover", "surface temperature", "burnt area", "flood extent", "snow mask", "water quality"]
+_METHODS = ["classification", "change detection", "composite", "mosaic", "time series", "anomaly"]
+
+
+@pytest_asyncio.fixture
+async def large_catalogue(session_factory: async_sessionmaker[AsyncSession]) -> None:
+    """Populate the catalogue with thousands of synthetic records plus one NDVI workflow."""
+    now = datetime.now(tz=UTC)
+    combinations = itertools.cycle(itertools.product(_SENSORS, _PRODUCTS, _METHODS))
+    rows = [
+        {
+            "id": f"record-{i:05d}",
+            "catalogue_id": CATALOGUE_ID,
+            "type": RecordType.workflow,
+            "title": f"{sensor} {product} {method} {i}",
+            "description": f"Computes {product} {method} from {sensor} imagery.",
+            "keywords": [sensor.lower(), *product.split(), method],
+            "applicable_collections": [],
+            "created": now,
+            "updated": now,
+        }
+        for i, (sensor, product, method) in zip(range(RECORD_COUNT), combinations, strict=False)
+    ]
+    rows.append({
+        "id": TARGET_ID,
+        "catalogue_id": CATALOGUE_ID,
+        "type": RecordType.workflow,
+        "title": "NDVI Calculation",
+        "description": "Calculates the Normalized Difference Vegetation Index.",
+        "keywords": ["ndvi", "vegetation", "sentinel2"],
+        "applicable_collections": [],
+        "created": now,
+        "updated": now,
+    })
+    async with session_factory() as session:
+        await session.execute(insert(Record), rows)
+        await session.commit()
+        await session.execute(text("ANALYZE records"))
+
+
+@pytest.mark.asyncio
+@pytest.mark.usefixtures("large_catalogue")
+@pytest.mark.parametrize("q", ["ndvii", "sentinal2", "NDVI calculaton"])
+async def test_fuzzy_search_tolerates_typos(client: AsyncClient, q: str) -> None:
+    """Test that misspelled queries find the intended record first."""
+    response = await client.get(f"/collections/{CATALOGUE_ID}/items", params={"q": q, "fuzzy": True})
+
+    assert response.status_code == status.HTTP_200_OK
+    data = response.json()
+    assert data["items"]
+    assert data["items"][0]["id"] == TARGET_ID
+
+
+@pytest.mark.asyncio
+@pytest.mark.usefixtures("large_catalogue")
+async def test_fuzzy_search_applies_similarity_threshold(client: AsyncClient) -> None:
+    """Test that dissimilar queries return no matches."""
+    response = await client.get(f"/collections/{CATALOGUE_ID}/items", params={"q": "xyzzy", "fuzzy": True})
+
+    assert response.json()["items"] == []
+
+
+@pytest.mark.asyncio
+@pytest.mark.usefixtures("large_catalogue")
+async def test_fuzzy_search_uses_trigram_indexes(session_factory: async_sessionmaker[AsyncSession]) -> None:
+    """Test that the fuzzy predicate can be answered from the trigram indexes."""
+    async with session_factory() as session:
+        await session.execute(text("SET LOCAL enable_seqscan = off"))
+        result = await session.execute(
+            text(
+                "EXPLAIN SELECT id FROM records "
+                "WHERE title %> 'ndvii' OR immutable_array_to_string(keywords, ' ') %> 'ndvii'"
+            )
+        )
+        plan = "\n".join(result.scalars().all())
+
+    assert "idx_records_title_trgm" in plan
+    assert "idx_records_keywords_trgm" in plan
+    assert "Seq Scan" not in plan
+
+
+async def _register_at(
+    client: AsyncClient, workflow_json: dict[str, Any], record_id: str, lon: float, lat: float
+) -> None:
+    """Register a copy of the workflow located at the given point."""
+    data = {**workflow_json, "id": record_id, "geometry": {"type": "Point", "coordinates": [lon, lat]}}
+    response = await client.post("/register", json=data, headers=AUTH_HEADER)
+    assert response.status_code == status.HTTP_201_CREATED
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize(
+    ("bbox", "expected"),
+    [
+        ("-10,40,30,60", {"europe"}),
+        ("-180,-90,180,90", {"europe", "fiji", "samoa"}),
+        ("170,-30,-170,0", {"fiji", "samoa"}),
+        ("100,0,110,10", set()),
+    ],
+)
+async def test_bbox_filter(client: AsyncClient, workflow_json: dict[str, Any], bbox: str, expected: set[str]) -> None:
+    """Test that `bbox` matches records located inside it, including boxes crossing the antimeridian."""
+    await _register_at(client, workflow_json, "europe", 10, 50)
+    await _register_at(client, workflow_json, "fiji", 178, -18)
+    await _register_at(client, workflow_json, "samoa", -172, -14)
+
+    response = await client.get(f"/collections/{CATALOGUE_ID}/items", params={"bbox": bbox})
+
+    assert response.status_code == status.HTTP_200_OK
+    assert {item["id"] for item in response.json()["items"]} == expected
+
+
+@pytest.mark.asyncio
+async def test_bbox_filter_matches_spatial_extent(client: AsyncClient, workflow_json: dict[str, Any]) -> None:
+    """Test that records without geometry are matched on their extent's bounding box."""
+    properties = {**workflow_json["properties"], "extent": {"spatial": {"bbox": [[-10, 35, 40, 70]]}}}
+    await client.post("/register", json={**workflow_json, "properties": properties}, headers=AUTH_HEADER)
+
+    inside = await client.get(f"/collections/{CATALOGUE_ID}/items", params={"bbox": "0,50,1,51"})
+    outside = await client.get(f"/collections/{CATALOGUE_ID}/items", params={"bbox": "100,0,110,10"})
+
+    assert [item["id"] for item in inside.json()["items"]] == [workflow_json["id"]]
+    assert outside.json()["items"] == []
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("bbox", ["1,2,3", "a,b,c,d", "0,10,1,0"])
+async def test_invalid_bbox_returns_400(client: AsyncClient, bbox: str) -> None:
+    """Test that malformed bounding boxes are rejected."""
+    response = await client.get(f"/collections/{CATALOGUE_ID}/items", params={"bbox": bbox})
+
+    assert response.status_code == status.HTTP_400_BAD_REQUEST
+
+
+@pytest.mark.asyncio
+@pytest.mark.usefixtures("large_catalogue")
+async def test_bbox_filter_uses_gist_index(session_factory: async_sessionmaker[AsyncSession]) -> None:
+    """Test that the bbox predicate can be answered from the GiST index."""
+    async with session_factory() as session:
+        await session.execute(text("SET LOCAL enable_seqscan = off"))
+        result = await session.execute(
+            text(
+                "EXPLAIN SELECT id FROM records "
+                "WHERE box(point(bbox_minx, bbox_miny), point(bbox_maxx, bbox_maxy)) && box(point(0, 0), point(1, 1))"
+            )
+        )
+        plan = "\n".join(result.scalars().all())
+
+    assert "idx_records_bbox" in plan
+    assert "Seq Scan" not in plan
+
+
+async def _register_valid_for(
+    client: AsyncClient, workflow_json: dict[str, Any], record_id: str, start: str | None, end: str | None
+) -> None:
+    """Register a copy of the workflow with the given temporal extent."""
+    properties = {**workflow_json["properties"], "extent": {"temporal": {"interval": [[start, end]]}}}
+    response = await client.post(
+        "/register", json={**workflow_json, "id": record_id, "properties": properties}, headers=AUTH_HEADER
+    )
+    assert response.status_code == status.HTTP_201_CREATED
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize(
+    ("value", "expected"),
+    [
+        ("2024-06-01T00:00:00Z", {"landsat", "sentinel"}),
+        ("2010-06-01T00:00:00Z", {"landsat"}),
+        ("2024-01-01T00:00:00Z/2024-12-31T23:59:59Z", {"landsat", "sentinel"}),
+        ("../2014-12-31T00:00:00Z", {"landsat"}),
+        ("2026-01-01T00:00:00Z/..", {"sentinel"}),
+        ("1990-01-01T00:00:00Z/1999-12-31T00:00:00Z", set()),
+    ],
+)
+async def test_datetime_filter(
+    client: AsyncClient, workflow_json: dict[str, Any], value: str, expected: set[str]
+) -> None:
+    """Test that `datetime` matches records whose temporal extent intersects the instant or interval."""
+    await _register_valid_for(client, workflow_json, "landsat", "2000-01-01T00:00:00Z", "2025-06-30T00:00:00Z")
+    await _register_valid_for(client, workflow_json, "sentinel", "2015-06-23T00:00:00Z", None)
+    await client.post("/register", json={**workflow_json, "id": "timeless"}, headers=AUTH_HEADER)
+
+    response = await client.get(f"/collections/{CATALOGUE_ID}/items", params={"datetime": value})
+
+    assert response.status_code == status.HTTP_200_OK
+    assert {item["id"] for item in response.json()["items"]} == expected
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("value", ["yesterday", "2024-12-31/2024-01-01", "2024-01-01/2024-02-01/2024-03-01"])
+async def test_invalid_datetime_returns_400(client: AsyncClient, value: str) -> None:
+    """Test that malformed instants and intervals are rejected."""
+    response = await client.get(f"/collections/{CATALOGUE_ID}/items", params={"datetime": value})
+
+    assert response.status_code == status.HTTP_400_BAD_REQUEST
+
+
+@pytest.mark.asyncio
+@pytest.mark.usefixtures("large_catalogue")
+async def test_datetime_filter_uses_gist_index(session_factory: async_sessionmaker[AsyncSession]) -> None:
+    """Test that the temporal predicate can be answered from the GiST index."""
+    async with session_factory() as session:
+        await session.execute(text("SET LOCAL enable_seqscan = off"))
+        result = await session.execute(
+            text("EXPLAIN SELECT id FROM records WHERE temporal_extent && tstzrange('2024-01-01', '2025-01-01', '[]')")
+        )
+        plan = "\n".join(result.scalars().all())
+
+    assert "idx_records_temporal_extent" in plan
+    assert "Seq Scan" not in plan
+
+
+@pytest.mark.asyncio
+@pytest.mark.usefixtures("large_catalogue")
+@pytest.mark.parametrize("operator", ["&&", "@>"])
+async def test_applicable_collections_filter_uses_gin_index(
+    session_factory: async_sessionmaker[AsyncSession], operator: str
+) -> None:
+    """Test that any/all applicable collection filters are a single GIN index lookup."""
+    collections = ", ".join(f"'collection-{i}'" for i in range(30))
+    async with session_factory() as session:
+        await session.execute(text("SET LOCAL enable_seqscan = off"))
+        result = await session.execute(
+            text(f"EXPLAIN SELECT id FROM records WHERE applicable_collections {operator} ARRAY[{collections}]")  # noqa: S608
+        )
+        plan = "\n".join(result.scalars().all())
+
+    assert "idx_records_applicable_collections" in plan
+    assert "Seq Scan" not in plan
@@ -10,15 +10,17 @@ from typing import TYPE_CHECKING, Any
 import pytest
 import pytest_asyncio
 from httpx import ASGITransport, AsyncClient
+from sqlalchemy import event
 from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
 
 from wf_catalogue_service import consts
+from wf_catalogue_service.api.v1.workflows.caches import clear_caches
 from wf_catalogue_service.db.models import Base, Catalogue
 from wf_catalogue_service.db.session import get_session
 from wf_catalogue_service.main import app_v1
 
 if TYPE_CHECKING:
-    from collections.abc import AsyncGenerator
+    from collections.abc import AsyncGenerator, Generator
 
     from _pytest.config import Config
     from _pytest.python import Function
@@ -41,8 +43,8 @@ def pytest_collection_modifyitems(config: Config, items: list[Function]) -> None
 
 
 @pytest_asyncio.fixture
-async def client() -> AsyncGenerator[AsyncClient]:
-    """Create async test client with test database."""
+async def session_factory() -> AsyncGenerator[async_sessionmaker[AsyncSession]]:
+    """Create a fresh test database schema with the default catalogue and yield a session factory."""
     engine = create_async_engine(TEST_DATABASE_URL, echo=False)
     factory = async_sessionmaker(engine, expire_on_commit=False)
 
@@ -64,17 +66,41 @@ async def client() -> AsyncGenerator[AsyncClient]:
         session.add(catalogue)
         await session.commit()
 
+    yield factory
+
+    await engine.dispose()
+
+
+@pytest_asyncio.fixture
+async def client(session_factory: async_sessionmaker[AsyncSession]) -> AsyncGenerator[AsyncClient]:
+    """Create async test client with test database."""
+
     async def override_get_session() -> AsyncGenerator[AsyncSession]:
-        async with factory() as session:
+        async with session_factory() as session:
             yield session
 
     app_v1.dependency_overrides[get_session] = override_get_session
+    # Cached responses refer to the previous test's database
+    clear_caches()
 
     async with AsyncClient(transport=ASGITransport(app=app_v1), base_url="http://test") as ac:
         yield ac
 
     app_v1.dependency_overrides.clear()
-    await engine.dispose()
+
+
+@pytest.fixture
+def executed_statements(session_factory: async_sessionmaker[AsyncSession]) -> Generator[list[str]]:
+    """Record the SQL statements executed against the test database."""
+    statements: list[str] = []
+    engine = session_factory.kw["bind"].sync_engine
+
+    def record_statement(conn: Any, cursor: Any, statement: str, *args: Any) -> None:  # noqa: ARG001
+        statements.append(statement)
+
+    event.listen(engine, "before_cursor_execute", record_statement)
+    yield statements
+    event.remove(engine, "before_cursor_execute", record_statement)
 
 
 @pytest.fixture
@@ -0,0 +1,68 @@
+from __future__ import annotations
+
+from typing import TYPE_CHECKING
+
+from wf_catalogue_service.api.common.caching import ResponseCache
+
+if TYPE_CHECKING:
+    import pytest
+
+
+def test_get_returns_cached_value() -> None:
+    cache: ResponseCache[str] = ResponseCache(max_entries=2, ttl=60)
+    cache.set("a", "value", cache.generation)
+
+    assert cache.get("a") == "value"
+    assert cache.get("b") is None
+
+
+def test_evicts_least_recently_used() -> None:
+    cache: ResponseCache[str] = ResponseCache(max_entries=2, ttl=60)
+    cache.set("a", "a", cache.generation)
+    cache.set("b", "b", cache.generation)
+    cache.get("a")
+    cache.set("c", "c", cache.generation)
+
+    assert cache.get("a") == "a"
+    assert cache.get("b") is None
+    assert len(cache) == cache.max_entries
+
+
+def test_entries_expire(monkeypatch: pytest.MonkeyPatch) -> None:
+    now = 1000.0
+    monkeypatch.setattr("wf_catalogue_service.api.common.caching.time.monotonic", lambda: now)
+    cache: ResponseCache[str] = ResponseCache(max_entries=2, ttl=10)
+    cache.set("a", "a", cache.generation)
+
+    now += 10
+
+    assert cache.get("a") is None
+    assert len(cache) == 0
+
+
+def test_invalidate_drops_tagged_entries_only() -> None:
+    cache: ResponseCache[str] = ResponseCache(max_entries=4, ttl=60)
+    cache.set("a1", "a1", cache.generation, tags=["a"])
+    cache.set("b1", "b1", cache.generation, tags=["b"])
+
+    cache.invalidate("a")
+
+    assert cache.get("a1") is None
+    assert cache.get("b1") == "b1"
+
+
+def test_set_ignores_values_computed_before_an_invalidation() -> None:
+    cache: ResponseCache[str] = ResponseCache(max_entries=2, ttl=60)
+    generation = cache.generation
+    cache.invalidate("a")
+
+    cache.set("a1", "stale", generation, tags=["a"])
+
+    assert cache.get("a1") is None
+
+
+def test_disabled_cache_stores_nothing() -> None:
+    cache: ResponseCache[str] = ResponseCache(max_entries=2, ttl=0)
+    cache.set("a", "a", cache.generation)
+
+    assert cache.get("a") is None
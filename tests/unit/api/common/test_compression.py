@@ -0,0 +1,160 @@
+from __future__ import annotations
+
+import gzip
+import json
+from typing import TYPE_CHECKING
+
+import pytest
+from httpx import ASGITransport, AsyncClient
+from starlette.applications import Starlette
+from starlette.middleware import Middleware
+from starlette.requests import Request
+from starlette.responses import JSONResponse, PlainTextResponse, Response, StreamingResponse
+from starlette.routing import Route
+
+from wf_catalogue_service.api.common.compression import (
+    AVAILABLE_ENCODINGS,
+    CompressionMiddleware,
+    compress,
+    compression_metrics,
+    negotiate_encoding,
+)
+
+if TYPE_CHECKING:
+    from collections.abc import Iterator
+
+ETAG = '"document"'
+DOCUMENT = {"items": [{"id": f"record-{i}", "title": "NDVI Calculation"} for i in range(100)]}
+
+
+def _large(_request: Request) -> Response:
+    return JSONResponse(DOCUMENT, headers={"ETag": ETAG})
+
+
+def _small(_request: Request) -> Response:
+    return JSONResponse({"id": "a"})
+
+
+def _precompressed(_request: Request) -> Response:
+    return Response(
+        gzip.compress(json.dumps(DOCUMENT).encode()),
+        media_type="application/json",
+        headers={"Content-Encoding": "gzip"},
+    )
+
+
+def _stream(_request: Request) -> Response:
+    def lines() -> Iterator[bytes]:
+        for item in DOCUMENT["items"]:
+            yield json.dumps(item).encode() + b"\n"
+
+    return StreamingResponse(lines(), media_type="application/x-ndjson")
+
+
+def _binary(_request: Request) -> Response:
+    return Response(b"\0" * 4096, media_type="image/png")
+
+
+def _text(_request: Request) -> Response:
+    return PlainTextResponse("text " * 1000)
+
+
+@pytest.fixture
+def client() -> AsyncClient:
+    app = Starlette(
+        routes=[
+            Route(f"/{endpoint.__name__.lstrip('_')}", endpoint)
+            for endpoint in (_large, _small, _precompressed, _stream, _binary, _text)
+        ],
+        middleware=[Middleware(CompressionMiddleware)],
+    )
+    return AsyncClient(transport=ASGITransport(app=app), base_url="http://test", headers={"Accept-Encoding": "gzip"})
+
+
+@pytest.mark.parametrize(
+    ("header", "expected"),
+    [
+        (None, None),
+        ("", None),
+        ("gzip", "gzip"),
+        ("GZIP;q=0.5", "gzip"),
+        ("gzip;q=0", None),
+        ("identity", None),
+        ("deflate, gzip;q=0.8", "gzip"),
+        ("*", AVAILABLE_ENCODINGS[0]),
+        ("*, gzip;q=0", AVAILABLE_ENCODINGS[0] if AVAILABLE_ENCODINGS[0] != "gzip" else None),
+    ],
+)
+def test_negotiate_encoding(header: str | None, expected: str | None) -> None:
+    assert negotiate_encoding(header) == expected
+
+
+def test_negotiate_encoding_prefers_higher_quality() -> None:
+    for encoding in AVAILABLE_ENCODINGS:
+        others = ", ".join(f"{other};q=0.5" for other in AVAILABLE_ENCODINGS if other != encoding)
+        assert negotiate_encoding(f"{others}, {encoding};q=0.9") == encoding
+
+
+@pytest.mark.parametrize("encoding", AVAILABLE_ENCODINGS)
+def test_compress_shrinks_repetitive_json(encoding: str) -> None:
+    body = json.dumps(DOCUMENT).encode()
+
+    assert len(compress(body, encoding)) < len(body) // 4
+
+
+async def test_middleware_compresses_large_json(client: AsyncClient) -> None:
+    bytes_in = compression_metrics.bytes_in
+
+    response = await client.get("/large")
+
+    assert response.headers["content-encoding"] == "gzip"
+    assert response.headers["vary"] == "Accept-Encoding"
+    assert int(response.headers["content-length"]) < len(json.dumps(DOCUMENT))
+    assert response.json() == DOCUMENT
+    assert compression_metrics.bytes_in > bytes_in
+    assert 0 < compression_metrics.saved_ratio < 1
+
+
+async def test_middleware_sets_etag_of_encoding(client: AsyncClient) -> None:
+    compressed = await client.get("/large")
+    identity = await client.get("/large", headers={"Accept-Encoding": "identity"})
+
+    assert compressed.headers["etag"] == '"document-gzip"'
+    assert identity.headers["etag"] == ETAG
+
+
+async def test_middleware_skips_small_bodies(client: AsyncClient) -> None:
+    response = await client.get("/small")
+
+    assert "content-encoding" not in response.headers
+    assert response.headers["vary"] == "Accept-Encoding"
+    assert response.json() == {"id": "a"}
+
+
+async def test_middleware_skips_clients_without_accepted_encoding(client: AsyncClient) -> None:
+    response = await client.get("/large", headers={"Accept-Encoding": "identity"})
+
+    assert "content-encoding" not in response.headers
+    assert response.json() == DOCUMENT
+
+
+async def test_middleware_passes_precompressed_bodies_through(client: AsyncClient) -> None:
+    response = await client.get("/precompressed")
+
+    assert response.headers["content-encoding"] == "gzip"
+    assert response.json() == DOCUMENT
+
+
+async def test_middleware_compresses_streams(client: AsyncClient) -> None:
+    response = await client.get("/stream")
+
+    assert response.headers["content-encoding"] == "gzip"
+    assert "content-length" not in response.headers
+    assert [json.loads(line) for line in response.content.splitlines()] == DOCUMENT["items"]
+
+
+@pytest.mark.parametrize(("path", "encoded"), [("/binary", False), ("/text", True)])
+async def test_middleware_compresses_text_only(client: AsyncClient, path: str, *, encoded: bool) -> None:
+    response = await client.get(path)
+
+    assert ("content-encoding" in response.headers) is encoded
@@ -0,0 +1,94 @@
+from __future__ import annotations
+
+from datetime import UTC, datetime
+
+import pytest
+from fastapi import HTTPException
+from starlette import status
+from starlette.requests import Request
+
+from wf_catalogue_service.api.common.conditional import (
+    check_not_modified,
+    encoded_etag,
+    is_not_modified,
+    strong_etag,
+    validator_headers,
+)
+
+MODIFIED = datetime(2024, 6, 1, 12, 30, 15, 250000, tzinfo=UTC)
+
+
+def _request(**headers: str) -> Request:
+    return Request({
+        "type": "http",
+        "headers": [(name.replace("_", "-").encode(), value.encode()) for name, value in headers.items()],
+    })
+
+
+def test_strong_etag_depends_on_parts() -> None:
+    assert strong_etag("item", "a", 1) == strong_etag("item", "a", 1)
+    assert strong_etag("item", "a", 1) != strong_etag("item", "a", 2)
+    assert strong_etag("item").startswith('"')
+
+
+def test_encoded_etag_differs_per_encoding() -> None:
+    assert encoded_etag('"abc"', "gzip") == '"abc-gzip"'
+    assert encoded_etag('"abc"', "gzip") != encoded_etag('"abc"', "br")
+
+
+@pytest.mark.parametrize(
+    ("header", "expected"),
+    [
+        ('"abc"', True),
+        ('"x", "abc"', True),
+        ('W/"abc"', True),
+        ("*", True),
+        ('"x"', False),
+        ('"abc-gzip"', True),
+        ('W/"abc-br"', True),
+        ('"abcd"', False),
+        ('"x-gzip"', False),
+    ],
+)
+def test_if_none_match(header: str, *, expected: bool) -> None:
+    assert is_not_modified(_request(if_none_match=header), '"abc"', MODIFIED) is expected
+
+
+@pytest.mark.parametrize(
+    ("header", "expected"),
+    [
+        ("Sat, 01 Jun 2024 12:30:15 GMT", True),
+        ("Sat, 01 Jun 2024 13:00:00 GMT", True),
+        ("Sat, 01 Jun 2024 12:30:14 GMT", False),
+        ("not a date", False),
+    ],
+)
+def test_if_modified_since(header: str, *, expected: bool) -> None:
+    assert is_not_modified(_request(if_modified_since=header), '"abc"', MODIFIED) is expected
+
+
+def test_if_none_match_takes_precedence() -> None:
+    request = _request(if_none_match='"x"', if_modified_since="Sat, 01 Jun 2024 13:00:00 GMT")
+
+    assert not is_not_modified(request, '"abc"', MODIFIED)
+
+
+def test_unconditional_request_is_modified() -> None:
+    assert not is_not_modified(_request(), '"abc"', MODIFIED)
+
+
+def test_check_not_modified_raises_304_with_validators() -> None:
+    with pytest.raises(HTTPException) as exc_info:
+        check_not_modified(_request(if_none_match='"abc"'), '"abc"', MODIFIED)
+
+    assert exc_info.value.status_code == status.HTTP_304_NOT_MODIFIED
+    assert exc_info.value.headers == validator_headers('"abc"', MODIFIED)
+    assert exc_info.value.headers["Last-Modified"] == "Sat, 01 Jun 2024 12:30:15 GMT"
+
+
+def test_check_not_modified_returns_encoded_etag_of_client_copy() -> None:
+    with pytest.raises(HTTPException) as exc_info:
+        check_not_modified(_request(if_none_match='"x", "abc-gzip"'), '"abc"', MODIFIED)
+
+    assert exc_info.value.status_code == status.HTTP_304_NOT_MODIFIED
+    assert exc_info.value.headers["ETag"] == '"abc-gzip"'
@@ -0,0 +1,24 @@
+from __future__ import annotations
+
+from wf_catalogue_service.api.v1.workflows.applicability import collection_key, record_collection_rows
+
+COLLECTION_URL = "https://example.com/stac/collections/sentinel2_ard"
+
+
+def test_collection_key_ignores_whitespace_and_trailing_slashes() -> None:
+    assert collection_key(f" {COLLECTION_URL}/ \n") == collection_key(COLLECTION_URL)
+
+
+def test_collection_key_is_case_sensitive() -> None:
+    assert collection_key(COLLECTION_URL.upper()) != collection_key(COLLECTION_URL)
+
+
+def test_collection_key_blank() -> None:
+    assert collection_key(" / ") is None
+
+
+def test_record_collection_rows_deduplicates_keys() -> None:
+    rows = record_collection_rows("record", [COLLECTION_URL, f"{COLLECTION_URL}/", "", "sentinel1_grd"])
+
+    assert [row.collection_key for row in rows] == [collection_key(COLLECTION_URL), collection_key("sentinel1_grd")]
+    assert {row.record_id for row in rows} == {"record"}
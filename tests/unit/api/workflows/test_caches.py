@@ -0,0 +1,83 @@
+from __future__ import annotations
+
+import asyncio
+import json
+from typing import TYPE_CHECKING, Any
+
+from wf_catalogue_service.api.v1.workflows import caches
+
+if TYPE_CHECKING:
+    import pytest
+
+
+def _fill_caches() -> None:
+    caches.listing_cache.set(("a", ()), "a", caches.listing_cache.generation, tags=["a"])
+    caches.listing_cache.set(("b", ()), "b", caches.listing_cache.generation, tags=["b"])
+    caches.catalogue_cache.set("a", "a", caches.catalogue_cache.generation, tags=["a"])
+
+
+def test_notification_invalidates_catalogue_listings() -> None:
+    _fill_caches()
+
+    caches.handle_notification(
+        None, 1, caches.INVALIDATION_CHANNEL, json.dumps({"catalogue_id": "a", "record_id": "r"})
+    )
+
+    assert caches.listing_cache.get(("a", ())) is None
+    assert caches.listing_cache.get(("b", ())) == "b"
+    assert caches.catalogue_cache.get("a") == "a"
+
+
+def test_malformed_notification_flushes_caches() -> None:
+    _fill_caches()
+
+    caches.handle_notification(None, 1, caches.INVALIDATION_CHANNEL, "not json")
+
+    assert len(caches.listing_cache) == 0
+    assert len(caches.catalogue_cache) == 0
+
+
+class _FakeConnection:
+    def __init__(self) -> None:
+        self.listeners: dict[str, Any] = {}
+        self.closed = False
+
+    async def add_listener(self, channel: str, callback: Any) -> None:
+        self.listeners[channel] = callback
+
+    def is_closed(self) -> bool:
+        return self.closed
+
+    async def execute(self, *_args: Any, **_kwargs: Any) -> None:
+        self.closed = True
+        raise OSError
+
+    def terminate(self) -> None:
+        self.closed = True
+
+
+async def test_listener_reconnects_and_flushes(monkeypatch: pytest.MonkeyPatch) -> None:
+    connections: list[_FakeConnection] = []
+    reconnected = asyncio.Event()
+
+    async def connect(_dsn: str) -> _FakeConnection:
+        await asyncio.sleep(0)
+        if not connections:
+            connections.append(_FakeConnection())
+            return connections[-1]
+        _fill_caches()
+        connections.append(_FakeConnection())
+        reconnected.set()
+        return connections[-1]
+
+    monkeypatch.setattr(caches.asyncpg, "connect", connect)
+    listener = caches.InvalidationListener("postgresql://test", reconnect_delay=0, keepalive=0)
+    listener.start()
+    await asyncio.wait_for(reconnected.wait(), timeout=1)
+    await asyncio.sleep(0)
+    await listener.stop()
+
+    assert len(connections) > 1
+    assert all(caches.INVALIDATION_CHANNEL in connection.listeners for connection in connections)
+    assert connections[0].closed
+    assert len(caches.listing_cache) == 0
@@ -0,0 +1,125 @@
+from __future__ import annotations
+
+from typing import Any
+
+import pytest
+from fastapi import HTTPException
+
+from wf_catalogue_service.api.v1.workflows.cql2 import compile_filter, parse_filter, queryables_schema
+
+
+@pytest.mark.parametrize(
+    ("text", "expected"),
+    [
+        ("type = 'workflow'", {"op": "=", "args": [{"property": "type"}, "workflow"]}),
+        (
+            "type='workflow' AND a_contains(keywords, ('ndvi')) AND \"application:language\"='CWL'",
+            {
+                "op": "and",
+                "args": [
+                    {"op": "=", "args": [{"property": "type"}, "workflow"]},
+                    {"op": "a_contains", "args": [{"property": "keywords"}, ["ndvi"]]},
+                    {"op": "=", "args": [{"property": "application:language"}, "CWL"]},
+                ],
+            },
+        ),
+        (
+            "title LIKE 'NDVI%' or NOT (id = 'a')",
+            {
+                "op": "or",
+                "args": [
+                    {"op": "like", "args": [{"property": "title"}, "NDVI%"]},
+                    {"op": "not", "args": [{"op": "=", "args": [{"property": "id"}, "a"]}]},
+                ],
+            },
+        ),
+        (
+            "created BETWEEN TIMESTAMP('2024-01-01T00:00:00Z') AND DATE('2025-01-01')",
+            {
+                "op": "between",
+                "args": [{"property": "created"}, {"timestamp": "2024-01-01T00:00:00Z"}, {"date": "2025-01-01"}],
+            },
+        ),
+        ("id NOT IN ('a', 'b')", {"op": "not", "args": [{"op": "in", "args": [{"property": "id"}, ["a", "b"]]}]}),
+        ("license IS NOT NULL", {"op": "not", "args": [{"op": "isNull", "args": [{"property": "license"}]}]}),
+        (
+            "S_INTERSECTS(geometry, BBOX(-10, 40.5, 30, 60))",
+            {"op": "s_intersects", "args": [{"property": "geometry"}, {"bbox": [-10, 40.5, 30, 60]}]},
+        ),
+        (
+            "T_INTERSECTS(datetime, INTERVAL('2024-01-01', '..'))",
+            {"op": "t_intersects", "args": [{"property": "datetime"}, {"interval": ["2024-01-01", ".."]}]},
+        ),
+        ("title = 'Bob''s workflow'", {"op": "=", "args": [{"property": "title"}, "Bob's workflow"]}),
+    ],
+)
+def test_parse_cql2_text(text: str, expected: Any) -> None:
+    assert parse_filter(text) == expected
+
+
+def test_parse_cql2_json() -> None:
+    value = '{"op": "a_overlaps", "args": [{"property": "keywords"}, ["ndvi", "sar"]]}'
+    assert parse_filter(value) == {"op": "a_overlaps", "args": [{"property": "keywords"}, ["ndvi", "sar"]]}
+
+
+@pytest.mark.parametrize(
+    "text",
+    [
+        "type =",
+        "type = 'workflow' AND",
+        "(type = 'workflow'",
+        "type = 'workflow' $",
+        "unknown = 'x'",
+        "type = 'pipeline'",
+        "keywords = 'ndvi'",
+        "a_contains(title, ('x'))",
+        "s_intersects(title, BBOX(0, 0, 1, 1))",
+        "frobnicate(keywords, ('x'))",
+        "NOT " * 100 + "type = 'workflow'",
+        "{not json",
+    ],
+)
+def test_invalid_filters_are_rejected(text: str) -> None:
+    with pytest.raises(HTTPException) as exc_info:
+        compile_filter(text, allow_full_scan=True)
+    assert exc_info.value.status_code == 400  # noqa: PLR2004
+    assert exc_info.value.detail.startswith("Invalid filter")
+
+
+@pytest.mark.parametrize(
+    "text",
+    [
+        "type = 'workflow' AND application:language = 'CWL'",
+        "a_contains(keywords, ('ndvi')) OR title LIKE '%ndvi%'",
+        "created > TIMESTAMP('2024-01-01T00:00:00Z')",
+        "s_intersects(geometry, BBOX(0, 0, 1, 1)) AND description = 'x'",
+    ],
+)
+def test_indexed_filters_are_accepted(text: str) -> None:
+    compile_filter(text)
+
+
+@pytest.mark.parametrize(
+    "text",
+    [
+        "application:language = 'CWL'",
+        "type <> 'workflow'",
+        "a_contains(keywords, ('ndvi')) OR description LIKE '%ndvi%'",
+        "NOT a_contains(keywords, ('ndvi'))",
+        "language IS NULL AND license = 'MIT'",
+    ],
+)
+def test_full_scan_filters_are_rejected_unless_allowed(text: str) -> None:
+    with pytest.raises(HTTPException) as exc_info:
+        compile_filter(text)
+    assert "index" in exc_info.value.detail
+
+    compile_filter(text, allow_full_scan=True)
+
+
+def test_queryables_schema_lists_indexed_operators() -> None:
+    schema = queryables_schema("http://testserver/collections/x/queryables")
+
+    assert schema["$id"] == "http://testserver/collections/x/queryables"
+    assert "a_contains" in schema["properties"]["keywords"]["x-indexed-operators"]
+    assert schema["properties"]["application:language"]["x-indexed-operators"] == []
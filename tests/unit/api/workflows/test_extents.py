@@ -0,0 +1,94 @@
+from __future__ import annotations
+
+from datetime import UTC, datetime
+
+import pytest
+from sqlalchemy.dialects.postgresql import Range
+
+from wf_catalogue_service.api.v1.workflows.extents import (
+    bbox_columns,
+    normalize_bbox,
+    normalize_interval,
+    parse_instant,
+    record_bbox,
+    record_interval,
+)
+
+
+def test_record_bbox_from_polygon() -> None:
+    geometry = {"type": "Polygon", "coordinates": [[[0, 0], [2, 0], [2, 3], [0, 0]]]}
+    assert record_bbox(geometry, None) == (0.0, 0.0, 2.0, 3.0)
+
+
+def test_record_bbox_from_geometry_collection() -> None:
+    geometry = {
+        "type": "GeometryCollection",
+        "geometries": [{"type": "Point", "coordinates": [1, 2, 100]}, {"type": "Point", "coordinates": [-1, 5]}],
+    }
+    assert record_bbox(geometry, None) == (-1.0, 2.0, 1.0, 5.0)
+
+
+def test_record_bbox_unions_geometry_and_extent() -> None:
+    geometry = {"type": "Point", "coordinates": [10, 10]}
+    extent = {"spatial": {"bbox": [[-5, -5, 0, 0], [0, 0, -1, 1, 1, 1]]}}
+    assert record_bbox(geometry, extent) == (-5.0, -5.0, 10.0, 10.0)
+
+
+def test_record_bbox_widens_antimeridian_extent() -> None:
+    extent = {"spatial": {"bbox": [[170, -10, -170, 10]]}}
+    assert record_bbox(None, extent) == (-180.0, -10.0, 180.0, 10.0)
+
+
+def test_record_bbox_ignores_malformed_values() -> None:
+    geometry = {"type": "Point", "coordinates": []}
+    extent = {"spatial": {"bbox": [[1, 2], "invalid"]}}
+    assert record_bbox(geometry, extent) is None
+
+
+def test_bbox_columns_without_spatial_information() -> None:
+    assert bbox_columns(None, {"temporal": {}}) == {
+        "bbox_minx": None,
+        "bbox_miny": None,
+        "bbox_maxx": None,
+        "bbox_maxy": None,
+    }
+
+
+@pytest.mark.parametrize("values", [["1", "2", "3"], [0, 5, 1, 0], ["a", "b", "c", "d"]])
+def test_normalize_bbox_rejects_invalid_boxes(values: list[str]) -> None:
+    with pytest.raises(ValueError):  # noqa: PT011
+        normalize_bbox(values)
+
+
+def test_record_interval_covers_all_intervals() -> None:
+    extent = {
+        "temporal": {"interval": [["2020-01-01T00:00:00Z", "2020-06-01T00:00:00Z"], ["2019-01-01", "2019-02-01"]]}
+    }
+    assert record_interval(extent) == Range(
+        datetime(2019, 1, 1, tzinfo=UTC), datetime(2020, 6, 1, tzinfo=UTC), bounds="[]"
+    )
+
+
+def test_record_interval_keeps_open_ends() -> None:
+    extent = {"temporal": {"interval": [["2020-01-01T00:00:00Z", None], ["2019-01-01T00:00:00Z", "2019-02-01"]]}}
+    assert record_interval(extent) == Range(datetime(2019, 1, 1, tzinfo=UTC), None, bounds="[]")
+
+
+def test_record_interval_ignores_malformed_intervals() -> None:
+    extent = {"temporal": {"interval": [["2020-01-01"], ["not a date", None], ["2021-01-01", "2020-01-01"]]}}
+    assert record_interval(extent) is None
+    assert record_interval({"spatial": {}}) is None
+
+
+@pytest.mark.parametrize("value", [None, "", ".."])
+def test_parse_instant_open_end(value: str | None) -> None:
+    assert parse_instant(value) is None
+
+
+def test_parse_instant_assumes_utc() -> None:
+    assert parse_instant("2024-03-01T12:00:00") == datetime(2024, 3, 1, 12, tzinfo=UTC)
+
+
+def test_normalize_interval_rejects_reversed_interval() -> None:
+    with pytest.raises(ValueError):  # noqa: PT011
+        normalize_interval("2024-12-31", "2024-01-01")